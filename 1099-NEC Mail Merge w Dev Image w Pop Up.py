@@ -3,19 +3,22 @@
 Uses JSON master template with exact field positions
 Toggle USE_BACKGROUND_IMAGE for development vs production
 Compatible with IRS Publication 1220 CSV format
+reportlab and tkinter are imported only when they are first needed
+
+Run with no arguments for the dialogs, or headless:
+    python "1099-NEC Mail Merge w Dev Image w Pop Up.py" --csv data.csv --layout fields.json --output out.pdf
 """
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 import json
 import csv
+import hashlib
 import os
+import sys
+import time
+from collections import namedtuple
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
+from operator import attrgetter, itemgetter
+from sys import intern
 
 # ============================================================================
 # CONFIGURATION
@@ -39,18 +42,90 @@ BACKGROUND_IMAGE_Y_OFFSET = -15.5    # Move background down (-) or up (+)
 BACKGROUND_IMAGE_WIDTH_STRETCH = 22.5     # Add/subtract width 
 BACKGROUND_IMAGE_HEIGHT_STRETCH = 31    # Add/subtract height
 
+# Page size in points (letter)
+PAGE_SIZE = (612.0, 792.0)
+
+# Background proof: the background is embedded as a downsampled, opaque grayscale JPEG
+# sized for this DPI, built once and cached (keyed by the image's SHA-256 and the
+# settings above). 0 = embed the full-resolution image as is.
+BACKGROUND_PROOF_DPI = 150
+BACKGROUND_PROOF_QUALITY = 80
+BACKGROUND_PROOF_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "1099-background-proofs")
+
+# Seconds between progress lines (page counts only - no recipient data is printed)
+PROGRESS_INTERVAL = 0.5
+
+# Field positions can also come straight from a fillable PDF, through the extractor's layout cache
+EXTRACTOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Extract Form Field Coordinates.py")
+
 # Right-aligned fields (numbers/amounts)
 RIGHT_ALIGNED_FIELDS = {
     'BOX 1', 'BOX 3', 'BOX 4',
     'BOX 5', 'BOX 5a', 'BOX 6', 'BOX 6a', 'BOX 7', 'BOX 7a'
 }
 
+# IRS Publication 1220 CSV columns the form uses (record field -> CSV column, picked by position)
+RECIPIENT_COLUMNS = {
+    'payer_business_name': 'Payer Business or Entity Name Line 1',
+    'payer_first_name': 'Payer First Name',
+    'payer_middle_name': 'Payer Middle Name',
+    'payer_last_name': 'Payer Last Name (Surname)',
+    'payer_suffix': 'Payer Suffix',
+    'payer_address': 'Payer Address Line 1',
+    'payer_city': 'Payer City/Town',
+    'payer_state': 'Payer State/Province/Territory',
+    'payer_zip': 'Payer ZIP/Postal Code',
+    'payer_tin': 'Payer Taxpayer ID Number',
+    'recipient_business_name': 'Recipient Business or Entity Name Line 1',
+    'recipient_first_name': 'Recipient First Name',
+    'recipient_middle_name': 'Recipient Middle Name',
+    'recipient_last_name': 'Recipient Last Name (Surname)',
+    'recipient_suffix': 'Recipient Suffix',
+    'recipient_address': 'Recipient Address Line 1',
+    'recipient_city': 'Recipient City/Town',
+    'recipient_state': 'Recipient State/Province/Territory',
+    'recipient_zip': 'Recipient ZIP/Postal Code',
+    'recipient_tin': 'Recipient Taxpayer ID Number',
+    'account_number': 'Form Account Number',
+    'tax_year': 'Tax Year',
+    'box_1': 'Box 1 - Nonemployee Compensation',
+    'box_2': 'Box 2 - Payer made direct sales totaling $5,000 or more of consumer products to a recipient for resale',
+    'box_3': 'Box 3 - Excess golden parachute payments',
+    'box_4': 'Box 4 - Federal income tax withheld',
+    'state_1': 'State 1',
+    'state_1_tax_withheld': 'State 1 - State tax withheld',
+    'state_1_payer_state_no': 'State 1 - State/Payer state number',
+    'state_1_income': 'State 1 - State income',
+    'state_2': 'State 2',
+    'state_2_tax_withheld': 'State 2 - State tax withheld',
+    'state_2_payer_state_no': 'State 2 - State/Payer state number',
+    'state_2_income': 'State 2 - State income',
+}
+
+# One recipient: only the columns above, as a tuple (no per-row dict)
+Recipient1099NEC = namedtuple('Recipient1099NEC', tuple(RECIPIENT_COLUMNS))
+
+# Values repeated on every row of a file - interned so all rows share one copy
+INTERNED_FIELDS = (
+    'payer_business_name', 'payer_first_name', 'payer_middle_name', 'payer_last_name', 'payer_suffix',
+    'payer_address', 'payer_city', 'payer_state', 'payer_zip', 'payer_tin',
+    'tax_year', 'state_1', 'state_1_payer_state_no', 'state_2', 'state_2_payer_state_no',
+)
+
+# Payer block (name, address, TIN): the same on every row of a payer, so it is drawn
+# once per payer as a form XObject and placed in each section with a translation
+PAYER_FIELDS = tuple(field for field in RECIPIENT_COLUMNS if field.startswith('payer_'))
+payer_key = attrgetter(*PAYER_FIELDS)
+
 # ============================================================================
 # FILE SELECTION FUNCTIONS
 # ============================================================================
 
 def show_large_message(title, message):
     """Show a large, readable message box"""
+    import tkinter as tk
+    from tkinter import messagebox
+    
     root = tk.Tk()
     root.withdraw()  # Hide the main window
     
@@ -60,6 +135,9 @@ def show_large_message(title, message):
 
 def select_csv_file():
     """Prompt user to select CSV input file"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
     show_large_message(
         "Step 1: Select CSV Data File",
         "📄 SELECT YOUR CSV INPUT FILE\n\n"
@@ -91,10 +169,14 @@ def select_csv_file():
 
 def select_json_file():
     """Prompt user to select JSON field positions file"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
     show_large_message(
         "Step 2: Select JSON Field Positions",
         "📐 SELECT YOUR JSON FIELD POSITIONS FILE\n\n"
-        "This file contains the X/Y coordinates for all form fields.\n\n"
+        "This file contains the X/Y coordinates for all form fields.\n"
+        "(A fillable PDF works too - its coordinates are extracted once and cached.)\n\n"
         "Example: JSON Sourced - 2025 1099-NEC w Section 1 Fillable_fields.json\n\n"
         "Click OK to browse for your JSON file..."
     )
@@ -106,6 +188,7 @@ def select_json_file():
         title="Select JSON Field Positions File",
         filetypes=[
             ("JSON files", "*.json"),
+            ("Fillable PDF", "*.pdf"),
             ("All files", "*.*")
         ],
         initialdir=os.path.expanduser("~")
@@ -121,6 +204,9 @@ def select_json_file():
 
 def select_background_image():
     """Prompt user to select background image (only in dev mode)"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
     show_large_message(
         "Step 3: Select Background Image",
         "🖼️ SELECT YOUR BACKGROUND IMAGE FILE\n\n"
@@ -153,6 +239,9 @@ def select_background_image():
 
 def select_output_location(mode):
     """Prompt user to select output PDF location"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
     if mode == "DEV":
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"1099_NEC_Forms_DEV_{timestamp}.pdf"
@@ -224,15 +313,15 @@ def format_tin(tin):
 def get_recipient_name(recipient):
     """Get recipient name from IRS CSV format (handles both business and individual)"""
     # Check for business name first
-    business_name = recipient.get('Recipient Business or Entity Name Line 1', '').strip()
+    business_name = recipient.recipient_business_name.strip()
     if business_name:
         return business_name
     
     # Otherwise construct from first/last name
-    first_name = recipient.get('Recipient First Name', '').strip()
-    middle_name = recipient.get('Recipient Middle Name', '').strip()
-    last_name = recipient.get('Recipient Last Name (Surname)', '').strip()
-    suffix = recipient.get('Recipient Suffix', '').strip()
+    first_name = recipient.recipient_first_name.strip()
+    middle_name = recipient.recipient_middle_name.strip()
+    last_name = recipient.recipient_last_name.strip()
+    suffix = recipient.recipient_suffix.strip()
     
     name_parts = [first_name, middle_name, last_name, suffix]
     return ' '.join([part for part in name_parts if part])
@@ -240,19 +329,47 @@ def get_recipient_name(recipient):
 def get_payer_name(recipient):
     """Get payer name from IRS CSV format (handles both business and individual)"""
     # Check for business name first
-    business_name = recipient.get('Payer Business or Entity Name Line 1', '').strip()
+    business_name = recipient.payer_business_name.strip()
     if business_name:  
         return business_name
     
     # Otherwise construct from first/last name
-    first_name = recipient.get('Payer First Name', '').strip()
-    middle_name = recipient.get('Payer Middle Name', '').strip()
-    last_name = recipient.get('Payer Last Name (Surname)', '').strip()
-    suffix = recipient.get('Payer Suffix', '').strip()
+    first_name = recipient.payer_first_name.strip()
+    middle_name = recipient.payer_middle_name.strip()
+    last_name = recipient.payer_last_name.strip()
+    suffix = recipient.payer_suffix.strip()
     
     name_parts = [first_name, middle_name, last_name, suffix]
     return ' '.join([part for part in name_parts if part])
 
+def read_recipients(csv_file):
+    """Read every CSV row into a Recipient1099NEC (columns picked by position)"""
+    with open(csv_file, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        
+        # Columns missing from the file read as '' (Tax Year defaults to this year)
+        width = len(header)
+        positions = {name: i for i, name in enumerate(header)}
+        positions.setdefault('Tax Year', width + 1)
+        padding = ['', str(datetime.now().year)]
+        pick = itemgetter(*[positions.get(column, width) for column in RECIPIENT_COLUMNS.values()])
+        interned = [Recipient1099NEC._fields.index(field) for field in INTERNED_FIELDS]
+        
+        recipients = []
+        for fields in reader:
+            if not fields:
+                continue  # Skip blank lines (same as csv.DictReader)
+            if len(fields) != width:
+                fields = fields[:width] + [''] * (width - len(fields))
+            values = list(pick(fields + padding))
+            for i in interned:
+                values[i] = intern(values[i])
+            recipients.append(Recipient1099NEC._make(values))
+        return recipients
+
 def draw_text(c, field_name, text, y_offset=0):
     """Draw text at field position with proper alignment"""
     if field_name not in MASTER_FIELDS:
@@ -309,17 +426,95 @@ def format_address_lines(name, address, city, state, zip_code):
     
     return lines
 
+def define_payer_form(c, form_name, recipient):
+    """
+    Draw a recipient's payer block (name, address and TIN at the unshifted field
+    positions) into a reusable form XObject
+    """
+    c.beginForm(form_name)
+    c.setFont(FONT_NAME, FONT_SIZE)
+    
+    # PAYER INFORMATION
+    payer_name = get_payer_name(recipient)
+    payer_lines = format_address_lines(
+        payer_name,
+        recipient.payer_address,
+        recipient.payer_city,
+        recipient.payer_state,
+        recipient.payer_zip
+    )
+    draw_multiline_address(c, 'PAYER', payer_lines)
+    
+    # PAYER'S TIN
+    payer_tin = format_tin(recipient.payer_tin)
+    draw_text(c, "PAYER'S TIN", payer_tin)
+    
+    c.endForm()
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def background_proof_path(background_image_path):
+    """Cache file for this background's proof under the current offsets, stretch and DPI"""
+    h = hashlib.sha256(file_digest(background_image_path).encode())
+    h.update(repr((
+        BACKGROUND_IMAGE_X_OFFSET, BACKGROUND_IMAGE_Y_OFFSET,
+        BACKGROUND_IMAGE_WIDTH_STRETCH, BACKGROUND_IMAGE_HEIGHT_STRETCH,
+        PAGE_SIZE, BACKGROUND_PROOF_DPI, BACKGROUND_PROOF_QUALITY,
+    )).encode())
+    return os.path.join(BACKGROUND_PROOF_CACHE_DIR, h.hexdigest() + ".jpg")
+
+def background_proof(background_image_path):
+    """
+    Proof copy of the background: flattened onto white, grayscale, scaled down to
+    BACKGROUND_PROOF_DPI at its drawn size and saved as JPEG (embedded as is, no
+    alpha mask); built on the first run, read from the cache after that
+    """
+    proof_path = background_proof_path(background_image_path)
+    if os.path.exists(proof_path):
+        return proof_path
+    
+    from PIL import Image
+    import tempfile
+    
+    width = round((PAGE_SIZE[0] + BACKGROUND_IMAGE_WIDTH_STRETCH) / 72 * BACKGROUND_PROOF_DPI)
+    height = round((PAGE_SIZE[1] + BACKGROUND_IMAGE_HEIGHT_STRETCH) / 72 * BACKGROUND_PROOF_DPI)
+    with Image.open(background_image_path) as image:
+        if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+            image = image.convert('RGBA')
+            flattened = Image.new('RGBA', image.size, 'white')
+            flattened.alpha_composite(image)
+            image = flattened
+        proof = image.convert('L')
+    if proof.width > width or proof.height > height:  # (never scaled up)
+        proof = proof.resize((min(width, proof.width), min(height, proof.height)), Image.LANCZOS)
+    
+    os.makedirs(BACKGROUND_PROOF_CACHE_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=BACKGROUND_PROOF_CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            proof.save(out, 'JPEG', quality=BACKGROUND_PROOF_QUALITY, dpi=(BACKGROUND_PROOF_DPI,) * 2)
+        os.replace(temp_path, proof_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return proof_path
+
 # ============================================================================
 # MAIN FORM FILLING FUNCTION
 # ============================================================================
 
 def fill_1099_nec_form(csv_file, output_pdf, background_image_path=None):
     """Fill 1099-NEC forms from CSV data"""
+    from reportlab.pdfgen import canvas
     
     # Read CSV data
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
-        recipients = list(reader)
+    recipients = read_recipients(csv_file)
     
     if not recipients:
         print("No data found in CSV!")
@@ -332,14 +527,27 @@ def fill_1099_nec_form(csv_file, output_pdf, background_image_path=None):
     print(f"Mode:      {mode}")
     print(f"{'='*80}\n")
     
+    # Dev background: the cached proof (opaque JPEG) unless BACKGROUND_PROOF_DPI is 0
+    background_mask = 'auto'
+    if USE_BACKGROUND_IMAGE and BACKGROUND_PROOF_DPI and background_image_path and os.path.exists(background_image_path):
+        background_image_path = background_proof(background_image_path)
+        background_mask = None
+    
     # Create PDF
-    c = canvas.Canvas(output_pdf, pagesize=letter)
+    c = canvas.Canvas(output_pdf, pagesize=PAGE_SIZE)
 
+    total_pages = (len(recipients) + 2) // 3
+    last_progress = time.perf_counter()
+    payer_forms = {}  # payer_key -> form name (one form per distinct payer)
+    
     # Process each recipient (3 per page)
     for page_num, i in enumerate(range(0, len(recipients), 3)):
         page_recipients = recipients[i:i+3]
-    
-        print(f"Page {page_num + 1}:      Processing {len(page_recipients)} sections")
+        
+        now = time.perf_counter()
+        if now - last_progress >= PROGRESS_INTERVAL:
+            print(f"Page {page_num + 1}/{total_pages} ({page_num / total_pages:.0%})")
+            last_progress = now
     
         # Set font for THIS page (must be done after showPage())
         c.setFont(FONT_NAME, FONT_SIZE)
@@ -349,97 +557,92 @@ def fill_1099_nec_form(csv_file, output_pdf, background_image_path=None):
             c.drawImage(background_image_path, 
                        BACKGROUND_IMAGE_X_OFFSET, 
                        BACKGROUND_IMAGE_Y_OFFSET, 
-                       width=letter[0] + BACKGROUND_IMAGE_WIDTH_STRETCH, 
-                       height=letter[1] + BACKGROUND_IMAGE_HEIGHT_STRETCH, 
+                       width=PAGE_SIZE[0] + BACKGROUND_IMAGE_WIDTH_STRETCH, 
+                       height=PAGE_SIZE[1] + BACKGROUND_IMAGE_HEIGHT_STRETCH, 
                        preserveAspectRatio=False, 
-                       mask='auto')
+                       mask=background_mask)
         
         # Fill each section
         for section_num, recipient in enumerate(page_recipients):
             y_offset = [SECTION_1_Y_OFFSET, SECTION_2_Y_OFFSET, SECTION_3_Y_OFFSET][section_num]
             
             recipient_name = get_recipient_name(recipient)
-            print(f"  Section {section_num + 1}:  {recipient_name}")
-            
-            # PAYER INFORMATION
-            payer_name = get_payer_name(recipient)
-            payer_lines = format_address_lines(
-                payer_name,
-                recipient.get('Payer Address Line 1', ''),
-                recipient.get('Payer City/Town', ''),
-                recipient.get('Payer State/Province/Territory', ''),
-                recipient.get('Payer ZIP/Postal Code', '')
-            )
-            draw_multiline_address(c, 'PAYER', payer_lines, y_offset)
             
-            # PAYER'S TIN
-            payer_tin = format_tin(recipient.get('Payer Taxpayer ID Number', ''))
-            draw_text(c, "PAYER'S TIN", payer_tin, y_offset)
+            # PAYER INFORMATION and PAYER'S TIN (composed and drawn once per payer)
+            payer = payer_key(recipient)
+            form_name = payer_forms.get(payer)
+            if form_name is None:
+                form_name = payer_forms[payer] = f"Payer{len(payer_forms) + 1}"
+                define_payer_form(c, form_name, recipient)
+            c.saveState()
+            c.translate(0, y_offset)
+            c.doForm(form_name)
+            c.restoreState()
             
             # RECIPIENT INFORMATION
             recipient_lines = format_address_lines(
                 recipient_name,
-                recipient.get('Recipient Address Line 1', ''),
-                recipient.get('Recipient City/Town', ''),
-                recipient.get('Recipient State/Province/Territory', ''),
-                recipient.get('Recipient ZIP/Postal Code', '')
+                recipient.recipient_address,
+                recipient.recipient_city,
+                recipient.recipient_state,
+                recipient.recipient_zip
             )
             draw_multiline_address(c, 'RECIPIENT', recipient_lines, y_offset)
             
             # RECIPIENT'S TIN
-            recipient_tin = format_tin(recipient.get('Recipient Taxpayer ID Number', ''))
+            recipient_tin = format_tin(recipient.recipient_tin)
             draw_text(c, "RECIPIENT'S TIN", recipient_tin, y_offset)
             
             # ACCOUNT NUMBER
-            account_num = recipient.get('Form Account Number', '')
+            account_num = recipient.account_number
             draw_text(c, 'ACCOUNT NUMBER', account_num, y_offset)
             
             # YEAR
-            year = recipient.get('Tax Year', str(datetime.now().year))
+            year = recipient.tax_year
             draw_text(c, 'YEAR', year, y_offset)
             
             # BOX 1 - Nonemployee compensation
-            box1 = format_currency(recipient.get('Box 1 - Nonemployee Compensation', ''))
+            box1 = format_currency(recipient.box_1)
             draw_text(c, 'BOX 1', box1, y_offset)
             
             # BOX 2 - Direct sales checkbox
-            box2_value = recipient.get('Box 2 - Payer made direct sales totaling $5,000 or more of consumer products to a recipient for resale', '')
+            box2_value = recipient.box_2
             if box2_value and str(box2_value).strip().upper() in ['YES', 'Y', 'X', 'TRUE', '1']: 
                 draw_text(c, 'BOX 2', 'X', y_offset)
             
             # BOX 3 - Other income
-            box3 = format_currency(recipient.get('Box 3 - Excess golden parachute payments', ''))
+            box3 = format_currency(recipient.box_3)
             draw_text(c, 'BOX 3', box3, y_offset)
             
             # BOX 4 - Federal income tax withheld
-            box4 = format_currency(recipient.get('Box 4 - Federal income tax withheld', ''))
+            box4 = format_currency(recipient.box_4)
             draw_text(c, 'BOX 4', box4, y_offset)
             
             # BOX 5/5a - State tax withheld
-            box5 = format_currency(recipient.get('State 1 - State tax withheld', ''))
+            box5 = format_currency(recipient.state_1_tax_withheld)
             draw_text(c, 'BOX 5', box5, y_offset)
             
-            box5a = format_currency(recipient.get('State 2 - State tax withheld', ''))
+            box5a = format_currency(recipient.state_2_tax_withheld)
             draw_text(c, 'BOX 5a', box5a, y_offset)
             
             # BOX 6/6a - State/Payer's state no.     
-            state1 = recipient.get('State 1', '')
-            payer_state_no1 = recipient.get('State 1 - State/Payer state number', '')
+            state1 = recipient.state_1
+            payer_state_no1 = recipient.state_1_payer_state_no
             if state1 or payer_state_no1:
                 box6_value = f"{state1}/{payer_state_no1}" if state1 and payer_state_no1 else (state1 or payer_state_no1)
                 draw_text(c, 'BOX 6', box6_value, y_offset)
             
-            state2 = recipient.get('State 2', '')
-            payer_state_no2 = recipient.get('State 2 - State/Payer state number', '')
+            state2 = recipient.state_2
+            payer_state_no2 = recipient.state_2_payer_state_no
             if state2 or payer_state_no2:
                 box6a_value = f"{state2}/{payer_state_no2}" if state2 and payer_state_no2 else (state2 or payer_state_no2)
                 draw_text(c, 'BOX 6a', box6a_value, y_offset)
             
             # BOX 7/7a - State income
-            box7 = format_currency(recipient.get('State 1 - State income', ''))
+            box7 = format_currency(recipient.state_1_income)
             draw_text(c, 'BOX 7', box7, y_offset)
             
-            box7a = format_currency(recipient.get('State 2 - State income', ''))
+            box7a = format_currency(recipient.state_2_income)
             draw_text(c, 'BOX 7a', box7a, y_offset)
         
         # Finish page
@@ -452,22 +655,63 @@ def fill_1099_nec_form(csv_file, output_pdf, background_image_path=None):
     print(f"✓ Total pages:      {(len(recipients) + 2) // 3}")
     print(f"{'='*80}\n")
     
-    # Show completion message
+    return len(recipients), (len(recipients) + 2) // 3, mode
+
+def show_success(output_pdf, total_recipients, total_pages, mode):
+    """Show the completion message"""
+    from tkinter import messagebox
+    
     messagebox.showinfo(
         "Success!",
         f"✅ PDF CREATED SUCCESSFULLY!\n\n"
         f"File:  {os.path.basename(output_pdf)}\n"
         f"Location: {os.path.dirname(output_pdf)}\n\n"
-        f"Recipients processed: {len(recipients)}\n"
-        f"Total pages: {(len(recipients) + 2) // 3}\n\n"
+        f"Recipients processed: {total_recipients}\n"
+        f"Total pages: {total_pages}\n\n"
         f"Mode: {mode}"
     )
 
+def form_field_extractor():
+    """The "Extract Form Field Coordinates.py" module (loaded by path - its name has spaces)"""
+    import importlib.util
+    
+    spec = importlib.util.spec_from_file_location("extract_form_field_coordinates", EXTRACTOR_SCRIPT)
+    extractor = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(extractor)
+    return extractor
+
+def read_layout_file(path):
+    """
+    Parsed layout from a field positions JSON, or from a fillable PDF via the
+    extractor's layout cache (keyed by the PDF's SHA-256; extracted once on a miss)
+    """
+    if path.lower().endswith('.pdf'):
+        return form_field_extractor().cached_layout(path)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def load_master_fields(json_file):
+    """Load JSON field positions (or a fillable PDF's) and calculate the 5a, 6a, 7a positions"""
+    field_positions = read_layout_file(json_file)
+    master_fields = field_positions['fields']
+    
+    HALF_LINE_OFFSET = 13.5
+    for box in ('BOX 5', 'BOX 6', 'BOX 7'):
+        if box in master_fields:
+            master_fields[box + 'a'] = {
+                'x': master_fields[box]['x'],
+                'y': master_fields[box]['y'] - HALF_LINE_OFFSET
+            }
+    return master_fields
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-if __name__ == "__main__":
+def run_interactive():
+    """Walk the user through the dialogs, then fill the forms"""
+    global MASTER_FIELDS
+    
     # Welcome message
     show_large_message(
         "1099-NEC Form Filler",
@@ -489,28 +733,8 @@ if __name__ == "__main__":
     JSON_FILE = select_json_file()
     print(f"✓ JSON file selected: {JSON_FILE}")
     
-    # Load JSON field positions
-    with open(JSON_FILE, 'r') as f:
-        FIELD_POSITIONS = json.load(f)
-    MASTER_FIELDS = FIELD_POSITIONS['fields']
-    
-    # Calculate 5a, 6a, 7a positions
-    HALF_LINE_OFFSET = 13.5
-    if 'BOX 5' in MASTER_FIELDS:  
-        MASTER_FIELDS['BOX 5a'] = {
-            'x': MASTER_FIELDS['BOX 5']['x'],
-            'y': MASTER_FIELDS['BOX 5']['y'] - HALF_LINE_OFFSET
-        }
-    if 'BOX 6' in MASTER_FIELDS:   
-        MASTER_FIELDS['BOX 6a'] = {
-            'x': MASTER_FIELDS['BOX 6']['x'],
-            'y':  MASTER_FIELDS['BOX 6']['y'] - HALF_LINE_OFFSET
-        }
-    if 'BOX 7' in MASTER_FIELDS:   
-        MASTER_FIELDS['BOX 7a'] = {
-            'x': MASTER_FIELDS['BOX 7']['x'],
-            'y':  MASTER_FIELDS['BOX 7']['y'] - HALF_LINE_OFFSET
-        }
+    # Load JSON field positions (5a, 6a, 7a are derived from 5, 6, 7)
+    MASTER_FIELDS = load_master_fields(JSON_FILE)
     
     # Step 3: Select background image (only in dev mode)
     BACKGROUND_IMAGE_PATH = None
@@ -525,4 +749,28 @@ if __name__ == "__main__":
     print(f"✓ Output location selected: {OUTPUT_PDF}")
     
     # Process the forms
-    fill_1099_nec_form(CSV_FILE, OUTPUT_PDF, BACKGROUND_IMAGE_PATH)
\ No newline at end of file
+    result = fill_1099_nec_form(CSV_FILE, OUTPUT_PDF, BACKGROUND_IMAGE_PATH)
+    if result:
+        show_success(OUTPUT_PDF, *result)
+
+def run_headless(argv=None):
+    """Fill the forms from command line arguments (no dialogs)"""
+    import argparse
+    global USE_BACKGROUND_IMAGE, MASTER_FIELDS
+    
+    parser = argparse.ArgumentParser(description="Fill 1099-NEC forms from an IRS Publication 1220 CSV.")
+    parser.add_argument('--csv', required=True, help="Publication 1220 CSV data file")
+    parser.add_argument('--layout', required=True, help="JSON field positions file (or the fillable PDF)")
+    parser.add_argument('--output', required=True, help="Output PDF path")
+    parser.add_argument('--background', help="Background image (development mode)")
+    args = parser.parse_args(argv)
+    
+    USE_BACKGROUND_IMAGE = bool(args.background)
+    MASTER_FIELDS = load_master_fields(args.layout)
+    result = fill_1099_nec_form(args.csv, args.output, args.background)
+    return 0 if result else 1
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_headless())
+    run_interactive()
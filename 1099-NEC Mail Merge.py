@@ -2,436 +2,395 @@
 1099-NEC Form Printer - Optimized for Pre-printed Forms
 Prints data from CSV onto pre-printed 1099-NEC forms (3 per page)
 Updated:  2026-01-10 - All alignment adjustments + right-aligned currency
+
+Prompts for any paths not given on the command line:
+    python "1099-NEC Mail Merge.py" --json coords.json --csv data.csv --output out.pdf
+    python "1099-NEC Mail Merge.py" --json coords.json --csv data.csv --check
+--json also takes the fillable PDF itself (its coordinates come from the layout cache).
+reportlab is only imported once there is a PDF to draw.
 """
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
 import json
 import csv
 import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from sys import intern
 
-# Prompt for file paths
-print("=" * 60)
-print("1099-NEC Form Printer")
-print("=" * 60)
+# Field positions can also come straight from a fillable PDF, through the extractor's layout cache
+EXTRACTOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Extract Form Field Coordinates.py")
 
-# Get JSON coordinates file
-json_file = input("\nEnter path to JSON coordinates file: ").strip().strip('"')
-if not os.path.exists(json_file):
-    print(f"ERROR: File not found: {json_file}")
-    exit(1)
+# IRS Publication 1220 CSV columns the form uses (picked by position, in this order)
+RECIPIENT_COLUMNS = (
+    'Payer Business or Entity Name Line 1', 'Payer Business or Entity Name Line 2',
+    'Payer First Name', 'Payer Middle Name', 'Payer Last Name (Surname)', 'Payer Suffix',
+    'Payer Address Line 1', 'Payer Address Line 2',
+    'Payer City/Town', 'Payer State/Province/Territory', 'Payer ZIP/Postal Code',
+    'Payer Taxpayer ID Number',
+    'Recipient Business or Entity Name Line 1', 'Recipient Business or Entity Name Line 2',
+    'Recipient First Name', 'Recipient Middle Name', 'Recipient Last Name (Surname)', 'Recipient Suffix',
+    'Recipient Address Line 1', 'Recipient Address Line 2',
+    'Recipient City/Town', 'Recipient State/Province/Territory', 'Recipient ZIP/Postal Code',
+    'Recipient Taxpayer ID Number',
+    'Box 1 - Nonemployee Compensation',
+    'Box 2 - Payer made direct sales totaling $5,000 or more of consumer products to a recipient for resale',
+    'Box 3 - Excess golden parachute payments',
+    'Box 4 - Federal income tax withheld',
+    'State 1 - State tax withheld', 'State 2 - State tax withheld',
+    'State 1 - State/Payer state number', 'State 2 - State/Payer state number',
+    'State 1 - State income', 'State 2 - State income',
+    'Form Account Number',
+    'Tax Year',
+)
 
-# Get CSV data file
-csv_file = input("Enter path to CSV data file: ").strip().strip('"')
-if not os.path.exists(csv_file):
-    print(f"ERROR: File not found:  {csv_file}")
-    exit(1)
+# One recipient's form values, in value-slot order (a tuple - no per-row dict)
+Recipient1099NEC = namedtuple('Recipient1099NEC', (
+    'payer_name payer_address payer_city_state_zip payer_tin '
+    'recipient_name recipient_address recipient_city_state_zip recipient_tin '
+    'box_1 box_2 box_3 box_4 box_5 box_5a box_6 box_6a box_7 box_7a '
+    'account_number tax_year'
+))
 
-# Get output PDF path
-output_pdf = input("Enter output PDF filename (or full path): ").strip().strip('"')
-if not output_pdf.lower().endswith('.pdf'):
-    output_pdf += '.pdf'
+def join_name(business_1, business_2, first_name, middle_name, last_name, suffix):
+    """Business name (both lines), or the individual's name parts"""
+    business_1 = business_1.strip()
+    if business_1:
+        business_2 = business_2.strip()
+        return f"{business_1} {business_2}" if business_2 else business_1
+    return ' '.join(part.strip() for part in (first_name, middle_name, last_name, suffix) if part.strip())
 
-print("\nLoading data...")
+def map_csv_row(fields):
+    """
+    Map one row's RECIPIENT_COLUMNS values to a Recipient1099NEC
+    Payer values are interned: every row of a file shares one copy of each payer string
+    """
+    (payer_business_1, payer_business_2, payer_first, payer_middle, payer_last, payer_suffix,
+     payer_address_1, payer_address_2, payer_city, payer_state, payer_zip, payer_tin,
+     recipient_business_1, recipient_business_2,
+     recipient_first, recipient_middle, recipient_last, recipient_suffix,
+     recipient_address_1, recipient_address_2, recipient_city, recipient_state, recipient_zip,
+     recipient_tin,
+     box_1, box_2, box_3, box_4, box_5, box_5a, box_6, box_6a, box_7, box_7a,
+     account_number, tax_year) = fields
+    
+    # Payer Name and Address (business or individual)
+    payer_name = join_name(payer_business_1, payer_business_2,
+                           payer_first, payer_middle, payer_last, payer_suffix)
+    payer_address = payer_address_1.strip()
+    if payer_address_2.strip():
+        payer_address += ' ' + payer_address_2.strip()
+    payer_city_state_zip = f"{payer_city.strip()}, {payer_state.strip()} {payer_zip.strip()}"
+    
+    # Recipient Name and Address (business or individual)
+    recipient_name = join_name(recipient_business_1, recipient_business_2,
+                               recipient_first, recipient_middle, recipient_last, recipient_suffix)
+    recipient_address = recipient_address_1.strip()
+    if recipient_address_2.strip():
+        recipient_address += ' ' + recipient_address_2.strip()
+    recipient_city_state_zip = f"{recipient_city.strip()}, {recipient_state.strip()} {recipient_zip.strip()}"
+    
+    return Recipient1099NEC(
+        intern(payer_name), intern(payer_address), intern(payer_city_state_zip), intern(payer_tin),
+        recipient_name, recipient_address, recipient_city_state_zip, recipient_tin,
+        box_1, box_2, box_3, box_4, box_5, box_5a, box_6, box_6a, box_7, box_7a,
+        account_number, intern(tax_year),
+    )
 
-# Load field coordinates from JSON
-with open(json_file, 'r') as f:
-    field_coords_raw = json.load(f)
+# Value slots: one per printed line/box, in drawing order
+(SLOT_PAYER_NAME, SLOT_PAYER_ADDRESS, SLOT_PAYER_CITY_STATE_ZIP, SLOT_PAYER_TIN,
+ SLOT_RECIPIENT_NAME, SLOT_RECIPIENT_ADDRESS, SLOT_RECIPIENT_CITY_STATE_ZIP, SLOT_RECIPIENT_TIN,
+ SLOT_BOX_1, SLOT_BOX_2, SLOT_BOX_3, SLOT_BOX_4,
+ SLOT_BOX_5, SLOT_BOX_5A, SLOT_BOX_6, SLOT_BOX_6A, SLOT_BOX_7, SLOT_BOX_7A,
+ SLOT_ACCOUNT_NUMBER, SLOT_TAX_YEAR) = range(20)
 
-# Extract fields dictionary
-field_coords = field_coords_raw.get('fields', field_coords_raw)
+FONT_NAME = "Helvetica"
+ADDRESS_LINE_HEIGHT = 10
 
-# Read CSV data
-with open(csv_file, 'r') as f:
-    reader = csv.DictReader(f)
-    recipients_raw = list(reader)
+# Cached text widths for right-aligned amounts (distinct strings kept)
+TEXT_WIDTH_CACHE_SIZE = 4096
 
-# Map IRS CSV columns to simplified format
-def map_csv_row(row):
-    """Map IRS CSV format to internal format"""
-    
-    # Payer Name (business or individual)
-    if row.get('Payer Business or Entity Name Line 1', '').strip():
-        payer_name = row['Payer Business or Entity Name Line 1'].strip()
-        if row.get('Payer Business or Entity Name Line 2', '').strip():
-            payer_name += ' ' + row['Payer Business or Entity Name Line 2'].strip()
-    else:
-        # Individual name
-        name_parts = []
-        if row.get('Payer First Name', '').strip():
-            name_parts.append(row['Payer First Name'].strip())
-        if row.get('Payer Middle Name', '').strip():
-            name_parts.append(row['Payer Middle Name'].strip())
-        if row.get('Payer Last Name (Surname)', '').strip():
-            name_parts.append(row['Payer Last Name (Surname)'].strip())
-        if row.get('Payer Suffix', '').strip():
-            name_parts.append(row['Payer Suffix'].strip())
-        payer_name = ' '.join(name_parts)
-    
-    # Recipient Name (business or individual)
-    if row.get('Recipient Business or Entity Name Line 1', '').strip():
-        recipient_name = row['Recipient Business or Entity Name Line 1'].strip()
-        if row.get('Recipient Business or Entity Name Line 2', '').strip():
-            recipient_name += ' ' + row['Recipient Business or Entity Name Line 2'].strip()
-    else:
-        # Individual name
-        name_parts = []
-        if row.get('Recipient First Name', '').strip():
-            name_parts.append(row['Recipient First Name'].strip())
-        if row.get('Recipient Middle Name', '').strip():
-            name_parts.append(row['Recipient Middle Name'].strip())
-        if row.get('Recipient Last Name (Surname)', '').strip():
-            name_parts.append(row['Recipient Last Name (Surname)'].strip())
-        if row.get('Recipient Suffix', '').strip():
-            name_parts.append(row['Recipient Suffix'].strip())
-        recipient_name = ' '.join(name_parts)
-    
-    # Payer Address
-    payer_address = row.get('Payer Address Line 1', '').strip()
-    if row.get('Payer Address Line 2', '').strip():
-        payer_address += ' ' + row['Payer Address Line 2'].strip()
-    
-    payer_city_state_zip = f"{row.get('Payer City/Town', '').strip()}, {row.get('Payer State/Province/Territory', '').strip()} {row.get('Payer ZIP/Postal Code', '').strip()}"
-    
-    # Recipient Address
-    recipient_address = row.get('Recipient Address Line 1', '').strip()
-    if row.get('Recipient Address Line 2', '').strip():
-        recipient_address += ' ' + row['Recipient Address Line 2'].strip()
-    
-    recipient_city_state_zip = f"{row.get('Recipient City/Town', '').strip()}, {row.get('Recipient State/Province/Territory', '').strip()} {row.get('Recipient ZIP/Postal Code', '').strip()}"
+# Per-section alignment rules (all adjustments in points)
+#   field:      JSON field name, {s} = section number (note the odd spacing/spelling in the JSON!)
+#   slots:      value slots printed at this field (more than one = multi-line block)
+#   y_field:    take Y from this field instead (None = the field itself)
+#   section1_x: use the Section 1 X for every section (only "BOX  1 -  1" matches the
+#               double-spaced Section 1 lookup, so Box 2-4 keep their own X)
+#   dx:         X nudge
+#   dy:         Y nudge for sections 1, 2, 3
+#   align:      'L' = left-aligned at X, 'R' = right-aligned at the right edge of the field
+LayoutRule = namedtuple('LayoutRule', 'field slots y_field section1_x dx dy align size')
+
+LAYOUT_RULES = (
+    # PAYER'S NAME AND ADDRESS - Section 3 DOWN 16.5 points
+    LayoutRule("PAYER {s}", (SLOT_PAYER_NAME, SLOT_PAYER_ADDRESS, SLOT_PAYER_CITY_STATE_ZIP),
+               None, False, 0, (0, 0, -16.5), 'L', 9),
+    # PAYER'S TIN (JSON has "PAYERS TIN" with S!)
+    LayoutRule("PAYERS TIN {s}", (SLOT_PAYER_TIN,), None, False, 0, (12, 2, -1.5), 'L', 9),
+    # RECIPIENT'S NAME AND ADDRESS (JSON has combined field!)
+    LayoutRule("RECIPIENT NAME ADDRESS BLOCK {s}",
+               (SLOT_RECIPIENT_NAME, SLOT_RECIPIENT_ADDRESS, SLOT_RECIPIENT_CITY_STATE_ZIP),
+               None, False, 0, (0, 0, -16.5), 'L', 9),
+    # RECIPIENT'S TIN (JSON has "RECIPIENT'S TIN" with apostrophe-S!)
+    LayoutRule("RECIPIENT'S TIN {s}", (SLOT_RECIPIENT_TIN,), None, False, 0, (12, 2, -1.5), 'L', 9),
+    # BOX 1 - Nonemployee compensation (JSON has "BOX  1 -  1" with DOUBLE spaces!)
+    LayoutRule("BOX  1 -  {s}", (SLOT_BOX_1,), None, True, 0, (9, 2, -1.5), 'R', 10),
+    # BOX 2 - Payer made direct sales checkbox
+    LayoutRule("BOX 2 - {s}", (SLOT_BOX_2,), None, False, 0, (12, 8.5, -13.5), 'L', 10),
+    # BOX 3 - Excess golden parachute
+    LayoutRule("BOX 3 - {s}", (SLOT_BOX_3,), None, False, 0, (12, 3.5, 7.5), 'R', 10),
+    # BOX 4 - Federal income tax withheld
+    LayoutRule("BOX 4 - {s}", (SLOT_BOX_4,), None, False, 0, (12, 0, -4), 'R', 10),
+    # BOX 5 - State 1 tax withheld (X + 36pts)
+    LayoutRule("BOX 5 - {s}", (SLOT_BOX_5,), None, False, 36, (0, -2.25, -0.25), 'R', 9),
+    # BOX 5a - State 2 tax withheld (X + 36pts, uses Box 6a Y)
+    LayoutRule("BOX 5a - {s}", (SLOT_BOX_5A,), "BOX 6a - {s}", False, 36, (0, -2.25, -0.25), 'R', 9),
+    # BOX 6 - State 1 number (X + 36pts)
+    LayoutRule("BOX 6 - {s}", (SLOT_BOX_6,), None, False, 36, (0, -2.25, -0.25), 'L', 9),
+    # BOX 6a - State 2 number (X + 36pts)
+    LayoutRule("BOX 6a - {s}", (SLOT_BOX_6A,), None, False, 36, (0, -2.25, -0.25), 'L', 9),
+    # BOX 7 - State 1 income (X + 36pts)
+    LayoutRule("BOX 7 - {s}", (SLOT_BOX_7,), None, False, 36, (0, -2.25, -0.25), 'R', 9),
+    # BOX 7a - State 2 income (X + 36pts)
+    LayoutRule("BOX 7a - {s}", (SLOT_BOX_7A,), None, False, 36, (0, -2.25, -0.25), 'R', 9),
+    # ACCOUNT NUMBER
+    LayoutRule("ACCT NUMBER {s}", (SLOT_ACCOUNT_NUMBER,), None, False, 0, (7.5, 4.5, 2.5), 'L', 9),
+    # YEAR (X + 18pts)
+    LayoutRule("YEAR {s}", (SLOT_TAX_YEAR,), None, False, 18, (13.5, 6, -6), 'L', 10),
+)
+
+# One compiled field position: absolute page coordinates for one section
+FieldPlacement = namedtuple('FieldPlacement', 'slot x y align font size')
+
+def compile_layout(field_coords, sections=3):
+    """
+    Compile the JSON coordinates plus the per-section adjustments into a flat,
+    immutable plan (built once per run): one tuple of FieldPlacement per section
+    Right-aligned X is the anchor at the right edge of the field
+    """
+    layout_plan = []
+    for section in range(sections):
+        suffix = str(section + 1)
+        section_plan = []
+        for rule in LAYOUT_RULES:
+            field = rule.field.format(s=suffix)
+            y_field = rule.y_field.format(s=suffix) if rule.y_field else field
+            if field not in field_coords or y_field not in field_coords:
+                continue
+            coord = field_coords[field]
+            
+            x = coord['x']
+            if rule.section1_x:
+                x = field_coords.get(rule.field.format(s='1'), coord)['x']
+            x = x + rule.dx
+            if rule.align == 'R':
+                # Anchor at RIGHT edge (x + width - small padding for margin)
+                x = x + coord['width'] - 2
+            y = field_coords[y_field]['y'] + rule.dy[section]
+            
+            for line_num, slot in enumerate(rule.slots):
+                section_plan.append(FieldPlacement(
+                    slot, x, y - (line_num * ADDRESS_LINE_HEIGHT), rule.align, FONT_NAME, rule.size
+                ))
+        layout_plan.append(tuple(section_plan))
     
-    return {
-        'Payer Name':  payer_name,
-        'Payer Address': payer_address,
-        'Payer City State Zip': payer_city_state_zip,
-        'Payer TIN': row.get('Payer Taxpayer ID Number', ''),
-        'Recipient Name': recipient_name,
-        'Recipient Address': recipient_address,
-        'Recipient City State Zip':  recipient_city_state_zip,
-        'Recipient TIN':  row.get('Recipient Taxpayer ID Number', ''),
-        'Box 1': row.get('Box 1 - Nonemployee Compensation', ''),
-        'Box 2': row.get('Box 2 - Payer made direct sales totaling $5,000 or more of consumer products to a recipient for resale', ''),
-        'Box 3': row.get('Box 3 - Excess golden parachute payments', ''),
-        'Box 4': row.get('Box 4 - Federal income tax withheld', ''),
-        'Box 5': row.get('State 1 - State tax withheld', ''),
-        'Box 5a': row.get('State 2 - State tax withheld', ''),
-        'Box 6': row.get('State 1 - State/Payer state number', ''),
-        'Box 6a': row.get('State 2 - State/Payer state number', ''),
-        'Box 7': row.get('State 1 - State income', ''),
-        'Box 7a': row.get('State 2 - State income', ''),
-        'Account Number': row.get('Form Account Number', ''),
-        'Tax Year': row.get('Tax Year', ''),
-    }
+    return tuple(layout_plan)
 
-# Map all recipients
-recipients = [map_csv_row(row) for row in recipients_raw]
+def row_values(recipient):
+    """Build the printable values for one recipient, indexed by value slot"""
+    box2 = recipient.box_2.strip().upper()
+    box2 = ('N' if box2 == 'N' else 'X') if box2 in ['Y', 'YES', 'X', 'N'] else ''
+    
+    return recipient[:SLOT_BOX_2] + (box2,) + recipient[SLOT_BOX_2 + 1:]
 
-# Create PDF
-c = canvas.Canvas(output_pdf, pagesize=letter)
-page_width, page_height = letter
+# Per-glyph advance widths (1000 units per em) for each font, built on first use
+GLYPH_ADVANCES = {}
 
-# Store Section 1 X coordinates for Box 1, 2, 3, 4 (MASTER X coordinates)
-section1_box_x = {}
-for box_num in ['1', '2', '3', '4']:
-    # Note: JSON has "BOX  1 -  1" with DOUBLE spaces!
-    box_field = f"BOX  {box_num} -  1"
-    if box_field in field_coords:
-        section1_box_x[box_num] = field_coords[box_field]['x']
+def glyph_advances(font_name):
+    """Return the advance-width table for printable ASCII in font_name"""
+    advances = GLYPH_ADVANCES.get(font_name)
+    if advances is None:
+        from reportlab.pdfbase import pdfmetrics
+        advances = {chr(code): pdfmetrics.stringWidth(chr(code), font_name, 1000)
+                    for code in range(32, 127)}
+        GLYPH_ADVANCES[font_name] = advances
+    return advances
 
-def draw_text_field(c, text, x, y, font_size=9):
-    """Draw text at specified position (LEFT-ALIGNED)"""
-    if text: 
-        c.setFont("Helvetica", font_size)
-        c.drawString(x, y, str(text))
+@lru_cache(maxsize=TEXT_WIDTH_CACHE_SIZE)
+def text_width(text, font_name, font_size):
+    """Width of text in points (same result as canvas.stringWidth, cached per string)"""
+    advances = glyph_advances(font_name)
+    try:
+        return sum([advances[ch] for ch in text]) * 0.001 * font_size
+    except KeyError:
+        # Character outside the table (e.g. accented names) - let reportlab measure it
+        from reportlab.pdfbase import pdfmetrics
+        return pdfmetrics.stringWidth(text, font_name, font_size)
 
-def draw_text_field_right_aligned(c, text, x, width, y, font_size=9):
-    """Draw text RIGHT-ALIGNED at right edge of field"""
-    if text: 
-        c.setFont("Helvetica", font_size)
-        # Anchor at RIGHT edge (x + width - small padding for margin)
-        c.drawRightString(x + width - 2, y, str(text))
+def draw_form_section(c, section_plan, values):
+    """Draw one 1099-NEC form section from its compiled plan"""
+    current_font = None
+    for slot, x, y, align, font, size in section_plan:
+        text = values[slot]
+        if not text:
+            continue
+        if (font, size) != current_font:
+            c.setFont(font, size)
+            current_font = (font, size)
+        text = str(text)
+        if align == 'R':
+            x = x - text_width(text, font, size)
+        c.drawString(x, y, text)
 
-def draw_multiline_text(c, text, x, y, font_size=9, line_height=10):
-    """Draw multi-line text (LEFT-ALIGNED)"""
-    if text:
-        c.setFont("Helvetica", font_size)
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            c.drawString(x, y - (i * line_height), line)
+def prompt_path(prompt):
+    """Ask for a path on the console (quotes from drag-and-drop are stripped)"""
+    return input(prompt).strip().strip('"')
 
-def draw_form_section(c, row, suffix):
-    """Draw one 1099-NEC form section with proper alignment"""
+def form_field_extractor():
+    """The "Extract Form Field Coordinates.py" module (loaded by path - its name has spaces)"""
+    import importlib.util
     
-    # PAYER'S NAME AND ADDRESS
-    payer_field = f"PAYER {suffix}"
-    if payer_field in field_coords:
-        coord = field_coords[payer_field]
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change
-        elif suffix == "2":
-            adjusted_y = coord['y']  # No change
-        else:   # Section 3
-            adjusted_y = coord['y'] - 16.5  # DOWN 12 points
-        
-        payer_address = f"{row['Payer Name']}\n{row['Payer Address']}\n{row['Payer City State Zip']}"
-        draw_multiline_text(c, payer_address, coord['x'], adjusted_y, font_size=9, line_height=10)
-    
-    # PAYER'S TIN (Note: JSON has "PAYERS TIN" with S!)
-    payer_tin_field = f"PAYERS TIN {suffix}"
-    if payer_tin_field in field_coords:
-        coord = field_coords[payer_tin_field]
-        if suffix == "1": 
-            adjusted_y = coord['y'] + 12  # UP 3 points (from +9 to +12)
-        elif suffix == "2":
-            adjusted_y = coord['y'] + 2  # UP 2 points
-        else:  # Section 3
-            adjusted_y = coord['y'] - 1.5  # UP 3 points (from -4.5 to -1.5)
-        
-        draw_text_field(c, row['Payer TIN'], coord['x'], adjusted_y, font_size=9)
+    spec = importlib.util.spec_from_file_location("extract_form_field_coordinates", EXTRACTOR_SCRIPT)
+    extractor = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(extractor)
+    return extractor
+
+def read_layout_file(path):
+    """
+    Parsed layout from a field positions JSON, or from a fillable PDF via the
+    extractor's layout cache (keyed by the PDF's SHA-256; extracted once on a miss)
+    """
+    if path.lower().endswith('.pdf'):
+        return form_field_extractor().cached_layout(path)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def load_field_coords(json_file):
+    """Load the field coordinates dictionary from the JSON file (or fillable PDF)"""
+    field_coords_raw = read_layout_file(json_file)
     
-    # RECIPIENT'S NAME AND ADDRESS (JSON has combined field!)
-    recipient_field = f"RECIPIENT NAME ADDRESS BLOCK {suffix}"
-    if recipient_field in field_coords:
-        coord = field_coords[recipient_field]
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change
-        elif suffix == "2":
-            adjusted_y = coord['y']  # No change
-        else:  # Section 3
-            adjusted_y = coord['y'] - 16.5  # DOWN 12 points
+    # Extract fields dictionary
+    return field_coords_raw.get('fields', field_coords_raw)
+
+def read_recipients(csv_file):
+    """Read the CSV and map every row to a Recipient1099NEC (columns picked by position)"""
+    with open(csv_file, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
         
-        recipient_address = f"{row['Recipient Name']}\n{row['Recipient Address']}\n{row['Recipient City State Zip']}"
-        draw_multiline_text(c, recipient_address, coord['x'], adjusted_y, font_size=9, line_height=10)
-    
-    # RECIPIENT'S TIN (Note: JSON has "RECIPIENT'S TIN" with apostrophe-S!)
-    recipient_tin_field = f"RECIPIENT'S TIN {suffix}"
-    if recipient_tin_field in field_coords:
-        coord = field_coords[recipient_tin_field]
-        if suffix == "1": 
-            adjusted_y = coord['y'] + 12  # UP 3 points (from +9 to +12)
-        elif suffix == "2":
-            adjusted_y = coord['y'] + 2  # UP 2 points
-        else:  # Section 3
-            adjusted_y = coord['y'] - 1.5  # UP 3 points (from -4.5 to -1.5)
+        # Columns missing from the file point one past the end, which reads as ''
+        width = len(header)
+        positions = {name: i for i, name in enumerate(header)}
+        pick = itemgetter(*[positions.get(name, width) for name in RECIPIENT_COLUMNS])
         
-        draw_text_field(c, row['Recipient TIN'], coord['x'], adjusted_y, font_size=9)
+        recipients = []
+        for fields in reader:
+            if not fields:
+                continue  # Skip blank lines (same as csv.DictReader)
+            if len(fields) != width:
+                fields = fields[:width] + [''] * (width - len(fields))
+            fields.append('')
+            recipients.append(map_csv_row(pick(fields)))
+        return recipients
+
+def render_forms(recipients, output_pdf, layout_plan):
+    """Print the forms - 3 per page"""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
     
-    # BOX 1 - Nonemployee compensation (RIGHT-ALIGNED, using Section 1 X)
-    # Note: JSON has "BOX  1 -  1" with DOUBLE spaces!
-    box1_field = f"BOX  1 -  {suffix}"
-    if box1_field in field_coords:
-        coord = field_coords[box1_field]
-        
-        # Use Section 1 X for all sections
-        if suffix == "1":
-            adjusted_x = coord['x']  # Use Section 1 X (master)
-            adjusted_y = coord['y'] + 9  # No change
-        else: 
-            adjusted_x = section1_box_x.get('1', coord['x'])  # Use Section 1 X
-            if suffix == "2":
-                adjusted_y = coord['y'] + 2  # UP 2 points
-            else:  # Section 3
-                adjusted_y = coord['y'] - 1.5  # UP 16.5 points (from -18 to -1.5)
-        
-        draw_text_field_right_aligned(c, row['Box 1'], adjusted_x, coord['width'], adjusted_y, font_size=10)
+    # Create PDF
+    c = canvas.Canvas(output_pdf, pagesize=letter)
     
-    # BOX 2 - Payer made direct sales checkbox (LEFT-ALIGNED, using Section 1 X)
-    box2_field = f"BOX 2 - {suffix}"
-    if box2_field in field_coords: 
-        coord = field_coords[box2_field]
+    print(f"Generating forms for {len(recipients)} recipients...")
+    for i in range(0, len(recipients), 3):
+        page_recipients = recipients[i:i+3]
         
-        # Use Section 1 X for all sections
-        if suffix == "1":
-            adjusted_x = coord['x']  # Use Section 1 X (master)
-            adjusted_y = coord['y'] + 12  # UP 3 points (from +9 to +12)
-        else:
-            adjusted_x = section1_box_x.get('2', coord['x'])  # Use Section 1 X
-            if suffix == "2":
-                adjusted_y = coord['y'] + 8.5  # UP 22 points (from -13.5 to +8.5)
-            else:  # Section 3
-                adjusted_y = coord['y'] - 13.5  # No change
+        # Draw each section
+        for idx, recipient in enumerate(page_recipients):
+            draw_form_section(c, layout_plan[idx], row_values(recipient))
         
-        if row['Box 2'].strip().upper() in ['Y', 'YES', 'X', 'N']: 
-            draw_text_field(c, 'N' if row['Box 2'].strip().upper() == 'N' else 'X', adjusted_x, adjusted_y, font_size=10)
+        # Start new page if more recipients remain
+        if i + 3 < len(recipients):
+            c.showPage()
     
-    # BOX 3 - Excess golden parachute (RIGHT-ALIGNED, using Section 1 X)
-    box3_field = f"BOX 3 - {suffix}"
-    if box3_field in field_coords:
-        coord = field_coords[box3_field]
-        
-        # Use Section 1 X for all sections
-        if suffix == "1":
-            adjusted_x = coord['x']  # Use Section 1 X (master)
-            adjusted_y = coord['y'] + 12  # UP 3 points (from +9 to +12)
-        else:
-            adjusted_x = section1_box_x.get('3', coord['x'])  # Use Section 1 X
-            if suffix == "2":
-                adjusted_y = coord['y'] + 3.5  # DOWN 1 point (from +4.5 to +3.5)
-            else:  # Section 3
-                adjusted_y = coord['y'] + 7.5  # UP 3 points (from +4.5 to +7.5)
-        
-        draw_text_field_right_aligned(c, row['Box 3'], adjusted_x, coord['width'], adjusted_y, font_size=10)
+    # Save PDF
+    c.save()
+
+def parse_args(argv=None):
+    """Command line (paths left out are prompted for)"""
+    import argparse
     
-    # BOX 4 - Federal income tax withheld (RIGHT-ALIGNED, using Section 1 X)
-    box4_field = f"BOX 4 - {suffix}"
-    if box4_field in field_coords:
-        coord = field_coords[box4_field]
-        
-        # Use Section 1 X for all sections
-        if suffix == "1":
-            adjusted_x = coord['x']  # Use Section 1 X (master)
-            adjusted_y = coord['y'] + 12  # UP 3 points (from +9 to +12)
-        else:
-            adjusted_x = section1_box_x.get('4', coord['x'])  # Use Section 1 X
-            if suffix == "2":
-                adjusted_y = coord['y']  # No change (0)
-            else:  # Section 3
-                adjusted_y = coord['y'] - 4  # DOWN 4 points (from 0 to -4)
-        
-        draw_text_field_right_aligned(c, row['Box 4'], adjusted_x, coord['width'], adjusted_y, font_size=10)
+    parser = argparse.ArgumentParser(
+        description="Print 1099-NEC data from an IRS Publication 1220 CSV onto pre-printed forms."
+    )
+    parser.add_argument('--json', help="JSON coordinates file (or the fillable PDF)")
+    parser.add_argument('--csv', help="CSV data file")
+    parser.add_argument('--output', help="Output PDF filename (or full path)")
+    parser.add_argument('--check', action='store_true',
+                        help="Validate the JSON and CSV, then exit without writing a PDF")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     
-    # BOX 5 - State 1 tax withheld (RIGHT-ALIGNED, X + 36pts)
-    box5_field = f"BOX 5 - {suffix}"
-    if box5_field in field_coords: 
-        coord = field_coords[box5_field]
-        adjusted_x = coord['x'] + 36  # Move right 36 points
-        
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change from original
-        elif suffix == "2": 
-            adjusted_y = coord['y'] - 2.25  # Keep current adjustment
-        else:  # Section 3
-            adjusted_y = coord['y'] - 0.25  # UP 2 points (from -2.25 to -0.25)
-        
-        draw_text_field_right_aligned(c, row['Box 5'], adjusted_x, coord['width'], adjusted_y, font_size=9)
+    # Prompt for file paths
+    print("=" * 60)
+    print("1099-NEC Form Printer")
+    print("=" * 60)
     
-    # BOX 5a - State 2 tax withheld (RIGHT-ALIGNED, X + 36pts, uses Box 6a Y)
-    box5a_field = f"BOX 5a - {suffix}"
-    box6a_field = f"BOX 6a - {suffix}"
-    if box5a_field in field_coords and box6a_field in field_coords:
-        coord = field_coords[box5a_field]
-        coord_6a = field_coords[box6a_field]
-        adjusted_x = coord['x'] + 36  # Move right 36 points
-        
-        if suffix == "1": 
-            adjusted_y = coord_6a['y']  # Use Box 6a Y
-        elif suffix == "2":
-            adjusted_y = coord_6a['y'] - 2.25  # Use Box 6a Y with adjustment
-        else:  # Section 3
-            adjusted_y = coord_6a['y'] - 0.25  # Use Box 6a Y, UP 2 points
-        
-        draw_text_field_right_aligned(c, row.get('Box 5a', ''), adjusted_x, coord['width'], adjusted_y, font_size=9)
+    # Get JSON coordinates file
+    json_file = args.json or prompt_path("\nEnter path to JSON coordinates file: ")
+    if not os.path.exists(json_file):
+        print(f"ERROR: File not found: {json_file}")
+        return 1
     
-    # BOX 6 - State 1 number (LEFT-ALIGNED, X + 36pts)
-    box6_field = f"BOX 6 - {suffix}"
-    if box6_field in field_coords:
-        coord = field_coords[box6_field]
-        adjusted_x = coord['x'] + 36  # Move right 36 points
-        
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change from original
-        elif suffix == "2":
-            adjusted_y = coord['y'] - 2.25  # Keep current adjustment
-        else:  # Section 3
-            adjusted_y = coord['y'] - 0.25  # UP 2 points (from -2.25 to -0.25)
-        
-        draw_text_field(c, row['Box 6'], adjusted_x, adjusted_y, font_size=9)
+    # Get CSV data file
+    csv_file = args.csv or prompt_path("Enter path to CSV data file: ")
+    if not os.path.exists(csv_file):
+        print(f"ERROR: File not found:  {csv_file}")
+        return 1
     
-    # BOX 6a - State 2 number (LEFT-ALIGNED, X + 36pts)
-    box6a_field = f"BOX 6a - {suffix}"
-    if box6a_field in field_coords: 
-        coord = field_coords[box6a_field]
-        adjusted_x = coord['x'] + 36  # Move right 36 points
-        
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change from original
-        elif suffix == "2":
-            adjusted_y = coord['y'] - 2.25  # Keep current adjustment
-        else:  # Section 3
-            adjusted_y = coord['y'] - 0.25  # UP 2 points (from -2.25 to -0.25)
-        
-        draw_text_field(c, row.get('Box 6a', ''), adjusted_x, adjusted_y, font_size=9)
+    # Get output PDF path
+    output_pdf = None
+    if not args.check:
+        output_pdf = args.output or prompt_path("Enter output PDF filename (or full path): ")
+        if not output_pdf.lower().endswith('.pdf'):
+            output_pdf += '.pdf'
     
-    # BOX 7 - State 1 income (RIGHT-ALIGNED, X + 36pts)
-    box7_field = f"BOX 7 - {suffix}"
-    if box7_field in field_coords: 
-        coord = field_coords[box7_field]
-        adjusted_x = coord['x'] + 36  # Move right 36 points
-        
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change from original
-        elif suffix == "2":
-            adjusted_y = coord['y'] - 2.25  # Keep current adjustment
-        else:  # Section 3
-            adjusted_y = coord['y'] - 0.25  # UP 2 points (from -2.25 to -0.25)
-        
-        draw_text_field_right_aligned(c, row['Box 7'], adjusted_x, coord['width'], adjusted_y, font_size=9)
+    print("\nLoading data...")
     
-    # BOX 7a - State 2 income (RIGHT-ALIGNED, X + 36pts)
-    box7a_field = f"BOX 7a - {suffix}"
-    if box7a_field in field_coords: 
-        coord = field_coords[box7a_field]
-        adjusted_x = coord['x'] + 36  # Move right 36 points
-        
-        if suffix == "1":
-            adjusted_y = coord['y']  # No change from original
-        elif suffix == "2":
-            adjusted_y = coord['y'] - 2.25  # Keep current adjustment
-        else:  # Section 3
-            adjusted_y = coord['y'] - 0.25  # UP 2 points (from -2.25 to -0.25)
-        
-        draw_text_field_right_aligned(c, row.get('Box 7a', ''), adjusted_x, coord['width'], adjusted_y, font_size=9)
+    # Load field coordinates and compile the layout once for the whole run
+    layout_plan = compile_layout(load_field_coords(json_file))
     
-    # ACCOUNT NUMBER
-    acct_field = f"ACCT NUMBER {suffix}"
-    if acct_field in field_coords:
-        coord = field_coords[acct_field]
-        if suffix == "1":
-            adjusted_y = coord['y'] + 7.5  # UP 3 points (from +4.5 to +7.5)
-        elif suffix == "2": 
-            adjusted_y = coord['y'] + 4.5  # Keep current
-        else:  # Section 3
-            adjusted_y = coord['y'] + 2.5  # DOWN 2 points (from +4.5 to +2.5)
-        
-        draw_text_field(c, row['Account Number'], coord['x'], adjusted_y, font_size=9)
+    # Read and map the CSV data
+    recipients = read_recipients(csv_file)
     
-    # YEAR
-    year_field = f"YEAR {suffix}"
-    if year_field in field_coords: 
-        coord = field_coords[year_field]
-        adjusted_x = coord['x'] + 18  # Keep X adjustment
-        
-        if suffix == "1":
-            adjusted_y = coord['y'] + 13.5  # No change
-        elif suffix == "2":
-            adjusted_y = coord['y'] + 6  # DOWN 3 points (from +9 to +6)
-        else:  # Section 3
-            adjusted_y = coord['y'] - 6  # UP 12 points (from -18 to -6)
-        
-        draw_text_field(c, row.get('Tax Year', ''), adjusted_x, adjusted_y, font_size=10)
-
-# Print forms - 3 per page
-print(f"Generating forms for {len(recipients)} recipients...")
-for i in range(0, len(recipients), 3):
-    page_recipients = recipients[i:i+3]
+    if args.check:
+        placed = sum(len(section_plan) for section_plan in layout_plan)
+        empty = [str(section + 1) for section, section_plan in enumerate(layout_plan) if not section_plan]
+        if not placed or empty:
+            print(f"❌ Layout error: no field positions in section(s) {', '.join(empty) or '-'} - "
+                  f"the JSON's field names don't match the form ({json_file})", file=sys.stderr)
+            return 1
+        print(f"✅ Layout OK: {placed} field positions in {len(layout_plan)} sections")
+        print(f"✅ CSV OK: {len(recipients)} recipients ({(len(recipients) + 2) // 3} pages)")
+        return 0
     
-    # Draw each section
-    for idx, recipient in enumerate(page_recipients):
-        section_suffix = str(idx + 1)
-        draw_form_section(c, recipient, section_suffix)
+    render_forms(recipients, output_pdf, layout_plan)
     
-    # Start new page if more recipients remain
-    if i + 3 < len(recipients):
-        c.showPage()
+    print("\n" + "=" * 60)
+    print(f"✅ PDF created: {output_pdf}")
+    print(f"✅ Processed {len(recipients)} recipients")
+    print(f"✅ All adjustments applied:")
+    print(f"   - Currency boxes RIGHT-ALIGNED (Box 1,3,4,5,5a,7,7a)")
+    print(f"   - Box 1,2,3,4 use consistent X across all sections")
+    print(f"   - State columns moved right 36 points")
+    print(f"   - All Y adjustments per specifications")
+    print("=" * 60)
+    return 0
 
-# Save PDF
-c.save()
-print("\n" + "=" * 60)
-print(f"✅ PDF created: {output_pdf}")
-print(f"✅ Processed {len(recipients)} recipients")
-print(f"✅ All adjustments applied:")
-print(f"   - Currency boxes RIGHT-ALIGNED (Box 1,3,4,5,5a,7,7a)")
-print(f"   - Box 1,2,3,4 use consistent X across all sections")
-print(f"   - State columns moved right 36 points")
-print(f"   - All Y adjustments per specifications")
-print("=" * 60)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
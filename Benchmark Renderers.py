@@ -0,0 +1,493 @@
+"""
+Benchmark Renderers
+Generates synthetic IRS Publication 1220 CSVs (header taken from the real CPS
+upload file) and runs each mail-merge renderer headless on them, reporting
+rows/sec, pages/sec, peak RSS and output size.
+
+Save a run as a baseline, then gate later runs against it:
+    python "Benchmark Renderers.py" --sizes 1000,10000 --save results.json
+    python "Benchmark Renderers.py" --sizes 1000,10000 --baseline results.json --max-slowdown 1.25
+
+Check that the selector speeds up with more render processes (1 = one canvas):
+    python "Benchmark Renderers.py" --sizes 60000 --renderers selector --workers 1,2,4
+
+Check that the selector's --pipeline threads beat drawing and saving on one thread:
+    python "Benchmark Renderers.py" --sizes 10000,60000 --renderers selector --pipeline
+
+Check that the selector's split output keeps every file within --chunk-mb:
+    python "Benchmark Renderers.py" --sizes 10000 --renderers selector --chunk-mb 0.05
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The real upload file supplies the column header
+REFERENCE_CSV = os.path.join(SCRIPT_DIR, "CPS 2025 1099 IRS Upload 2026.01.12.csv")
+
+SELECTOR_LAYOUT = os.path.join(SCRIPT_DIR, "2025 1099-NEC Section 1 Master mapping.json")
+MAIL_MERGE_COORDS = os.path.join(SCRIPT_DIR, "2025 Blank 1099-NEC 3 Entity Fillable_fields.json")
+
+# Renderer name -> (script, extra arguments); every script takes --csv and --output
+RENDERERS = {
+    'selector': ("1099-NEC Mail Merge w Dev w Selector.py", ['--layout', SELECTOR_LAYOUT]),
+    'popup': ("1099-NEC Mail Merge w Dev Image w Pop Up.py", ['--layout', SELECTOR_LAYOUT]),
+    'mail_merge': ("1099-NEC Mail Merge.py", ['--json', MAIL_MERGE_COORDS]),
+}
+
+# Row counts to benchmark
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Selector render process counts for --workers scaling runs (1 renders on one canvas)
+WORKER_COUNTS = (1, 2, 4)
+
+# Regression gate: fail when a run takes longer than baseline seconds x this factor
+MAX_SLOWDOWN = 1.25
+
+RANDOM_SEED = 1099
+
+# Synthetic data mix
+BUSINESS_RECIPIENT_SHARE = 0.55   # Rest are individuals
+STATE_1_SHARE = 0.35              # Rows with State 1 boxes (5, 6, 7)
+STATE_2_SHARE = 0.08              # Rows that also have State 2 boxes (5a, 6a, 7a)
+ROWS_PER_PAYER = 2_500            # Payers appear in contiguous blocks, as in real uploads
+
+BUSINESS_WORDS = ("Summit", "Harbor", "Pioneer", "Blue Ridge", "Keystone", "Atlas", "Cedar",
+                  "Liberty", "Granite", "Coastal", "Evergreen", "Redwood", "Meridian", "Union")
+BUSINESS_TRADES = ("Logistics", "Dealer Services", "Consulting", "Construction", "Auto Group",
+                   "Marketing", "Holdings", "Medical Partners", "Software", "Roofing")
+BUSINESS_SUFFIXES = ("Inc", "LLC", "Corp", "Co", "LP", "Group Inc")
+FIRST_NAMES = ("James", "Mary", "Robert", "Patricia", "Michael", "Linda", "David", "Barbara",
+               "William", "Elizabeth", "Jose", "Maria", "Wei", "Aisha", "Thanh", "Olga")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Nguyen", "Patel", "O'Brien", "Van der Berg", "Kowalski")
+NAME_SUFFIXES = ("Jr", "Sr", "II", "III")
+STREETS = ("Main St", "Oak Ave", "Trade Center Dr", "Park Blvd", "Center Dr Ste 270",
+           "Industrial Pkwy", "Maple Ln", "Commerce Way Unit 4B", "Lakeview Rd")
+CITIES = (("Charlotte", "NC", "28217"), ("Evans", "GA", "30809"), ("Columbia", "SC", "29201"),
+          ("Richmond", "VA", "23219"), ("Austin", "TX", "78701"), ("Denver", "CO", "80202"),
+          ("Portland", "OR", "97201"), ("Albany", "NY", "12207"), ("Tampa", "FL", "33602"))
+
+# ============================================================================
+# SYNTHETIC DATA FUNCTIONS
+# ============================================================================
+
+def read_header(reference_csv=REFERENCE_CSV):
+    """Column header of the real Publication 1220 upload file"""
+    with open(reference_csv, 'r', newline='') as f:
+        return next(csv.reader(f))
+
+def amount(rng, low, high):
+    """Random dollar amount as the upload file writes it (e.g. 83232.95)"""
+    return f"{rng.uniform(low, high):.2f}"
+
+def tin(rng, tin_type):
+    """Random EIN (12-3456789) or SSN (123-45-6789)"""
+    digits = f"{rng.randrange(10**9):09d}"
+    if tin_type == 'EIN':
+        return f"{digits[:2]}-{digits[2:]}"
+    return f"{digits[:3]}-{digits[3:5]}-{digits[5:]}"
+
+def business_name(rng):
+    return f"{rng.choice(BUSINESS_WORDS)} {rng.choice(BUSINESS_TRADES)} {rng.choice(BUSINESS_SUFFIXES)}"
+
+def party_fields(rng, prefix, business):
+    """Name, TIN and address columns for a payer or recipient"""
+    city, state, zip_code = rng.choice(CITIES)
+    fields = {
+        f'{prefix} Country': 'US',
+        f'{prefix} Address Line 1': f"{rng.randrange(1, 9999)} {rng.choice(STREETS)}",
+        f'{prefix} City/Town': city,
+        f'{prefix} State/Province/Territory': state,
+        f'{prefix} ZIP/Postal Code': zip_code,
+    }
+    if business:
+        fields.update({
+            f'{prefix} TIN Type': 'EIN',
+            f'{prefix} Taxpayer ID Number': tin(rng, 'EIN'),
+            f'{prefix} Name Type': 'B',
+            f'{prefix} Business or Entity Name Line 1': business_name(rng),
+        })
+        if rng.random() < 0.05:
+            fields[f'{prefix} Business or Entity Name Line 2'] = "DBA " + business_name(rng)
+    else:
+        fields.update({
+            f'{prefix} TIN Type': 'SSN',
+            f'{prefix} Taxpayer ID Number': tin(rng, 'SSN'),
+            f'{prefix} Name Type': 'I',
+            f'{prefix} First Name': rng.choice(FIRST_NAMES),
+            f'{prefix} Middle Name': rng.choice("ABCDEFGHJKLMNPRSTW") if rng.random() < 0.4 else '',
+            f'{prefix} Last Name (Surname)': rng.choice(LAST_NAMES),
+            f'{prefix} Suffix': rng.choice(NAME_SUFFIXES) if rng.random() < 0.05 else '',
+        })
+    if rng.random() < 0.1:
+        fields[f'{prefix} Address Line 2'] = f"Apt {rng.randrange(1, 400)}"
+    return fields
+
+def state_fields(rng, number, payer_state):
+    """State tax columns for State 1 or State 2"""
+    state = payer_state if number == 1 else rng.choice(CITIES)[1]
+    return {
+        f'State {number}': state,
+        f'State {number} - State tax withheld': amount(rng, 10, 2500),
+        f'State {number} - State/Payer state number': f"{state} {rng.randrange(10**8):08d}",
+        f'State {number} - State income': amount(rng, 600, 90000),
+    }
+
+def synthetic_rows(rows, seed=RANDOM_SEED):
+    """Yield dicts of Publication 1220 columns"""
+    rng = random.Random(seed)
+    payer = None
+    for row_num in range(rows):
+        if row_num % ROWS_PER_PAYER == 0:
+            payer = party_fields(rng, 'Payer', business=rng.random() < 0.9)
+        record = {'Form Type': '1099-NEC', 'Tax Year': '2025', '2nd TIN Notice': 'N'}
+        record.update(payer)
+        record.update(party_fields(rng, 'Recipient', business=rng.random() < BUSINESS_RECIPIENT_SHARE))
+        record['Form Account Number'] = f"ACCT{row_num:07d}" if rng.random() < 0.3 else ''
+        record['Box 1 - Nonemployee Compensation'] = amount(rng, 600, 250000)
+        record['Box 2 - Payer made direct sales totaling $5,000 or more of consumer products '
+               'to a recipient for resale'] = 'Y' if rng.random() < 0.03 else 'N'
+        if rng.random() < 0.01:
+            record['Box 3 - Excess golden parachute payments'] = amount(rng, 1000, 50000)
+        if rng.random() < 0.05:
+            record['Box 4 - Federal income tax withheld'] = amount(rng, 50, 20000)
+        if rng.random() < STATE_1_SHARE:
+            record.update(state_fields(rng, 1, payer['Payer State/Province/Territory']))
+            if rng.random() < STATE_2_SHARE / STATE_1_SHARE:
+                record.update(state_fields(rng, 2, payer['Payer State/Province/Territory']))
+        yield record
+
+def generate_csv(path, rows, header, seed=RANDOM_SEED):
+    """Write a synthetic CSV (kept between runs - same rows and seed give the same file)"""
+    if os.path.exists(path):
+        return path
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=header, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(synthetic_rows(rows, seed))
+    os.replace(temp_path, path)
+    return path
+
+# ============================================================================
+# MEASUREMENT FUNCTIONS
+# ============================================================================
+
+def run_measured(command):
+    """
+    Run a command with its output discarded
+    Returns (exit code, seconds, peak RSS in MB or None where the OS can't tell us)
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not hasattr(os, 'wait4'):
+        returncode = proc.wait()
+        return returncode, time.perf_counter() - start, None
+
+    _, status, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak_rss = rusage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return proc.returncode, elapsed, peak_rss
+
+def benchmark(renderer, csv_file, rows, work_dir, keep_pdfs=False, variant_args=(), label=None):
+    """
+    Run one renderer on one CSV and return its measurements
+    variant_args are appended to the renderer's arguments; label names that variant in the results
+    """
+    script, extra_args = RENDERERS[renderer]
+    label = label or renderer
+    output_pdf = os.path.join(work_dir, f"{label}_{rows}.pdf")
+    command = [sys.executable, os.path.join(SCRIPT_DIR, script),
+               '--csv', csv_file, '--output', output_pdf] + extra_args + list(variant_args)
+
+    returncode, seconds, peak_rss = run_measured(command)
+    pages = (rows + 2) // 3
+    output_bytes = os.path.getsize(output_pdf) if os.path.exists(output_pdf) else 0
+    if not keep_pdfs and os.path.exists(output_pdf):
+        os.remove(output_pdf)
+
+    return {
+        'renderer': label,
+        'rows': rows,
+        'pages': pages,
+        'ok': returncode == 0,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(rows / seconds, 1),
+        'pages_per_sec': round(pages / seconds, 1),
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'output_bytes': output_bytes,
+    }
+
+def check_regressions(results, baseline_results, max_slowdown=MAX_SLOWDOWN):
+    """Return a message for every run slower than its baseline x max_slowdown (or failed)"""
+    baseline = {(r['renderer'], r['rows']): r for r in baseline_results}
+    problems = []
+    for result in results:
+        if not result['ok']:
+            problems.append(f"{result['renderer']} @ {result['rows']:,} rows failed")
+            continue
+        before = baseline.get((result['renderer'], result['rows']))
+        if before is None or not before['ok']:
+            continue
+        slowdown = result['seconds'] / before['seconds']
+        if slowdown > max_slowdown:
+            problems.append(f"{result['renderer']} @ {result['rows']:,} rows: "
+                            f"{before['seconds']:.2f}s -> {result['seconds']:.2f}s "
+                            f"({slowdown:.2f}x, limit {max_slowdown:.2f}x)")
+    return problems
+
+def worker_scaling(csv_file, rows, work_dir, worker_counts, keep_pdfs=False):
+    """Run the selector once per render process count"""
+    results = []
+    for workers in worker_counts:
+        print(f"  Running selector with {workers} worker(s)...")
+        result = benchmark('selector', csv_file, rows, work_dir, keep_pdfs,
+                           ['--workers', str(workers)], f"selector_w{workers}")
+        result['workers'] = workers
+        results.append(result)
+    return results
+
+def check_scaling(results, cpus=os.cpu_count() or 1):
+    """
+    Return a message for every worker count that is not faster than the next
+    smaller one (counts above the CPU count aren't expected to scale)
+    """
+    problems = []
+    for rows in sorted({r['rows'] for r in results if 'workers' in r}):
+        runs = sorted((r for r in results if r.get('workers') and r['rows'] == rows),
+                      key=lambda r: r['workers'])
+        for before, after in zip(runs, runs[1:]):
+            if after['workers'] > cpus or not (before['ok'] and after['ok']):
+                continue
+            if after['seconds'] >= before['seconds']:
+                problems.append(f"selector @ {rows:,} rows: {before['workers']} -> {after['workers']} "
+                                f"workers went {before['seconds']:.2f}s -> {after['seconds']:.2f}s")
+    return problems
+
+def print_scaling(results):
+    """Speedup of each worker count over the smallest one run"""
+    print(f"{'Rows':>10} {'Workers':>8} {'Seconds':>9} {'Speedup':>8}")
+    for rows in sorted({r['rows'] for r in results if 'workers' in r}):
+        runs = sorted((r for r in results if r.get('workers') and r['rows'] == rows),
+                      key=lambda r: r['workers'])
+        for r in runs:
+            print(f"{rows:>10,} {r['workers']:>8} {r['seconds']:>9.2f} "
+                  f"{runs[0]['seconds'] / r['seconds']:>7.2f}x")
+
+def pipeline_comparison(csv_file, rows, work_dir, keep_pdfs=False):
+    """Run the selector on one thread, then with --pipeline"""
+    results = []
+    for pipelined in (False, True):
+        label = "selector_pipeline" if pipelined else "selector_one_thread"
+        print(f"  Running {label}...")
+        result = benchmark('selector', csv_file, rows, work_dir, keep_pdfs,
+                           ['--pipeline'] if pipelined else [], label)
+        result['pipelined'] = pipelined
+        results.append(result)
+    return results
+
+def check_pipeline(results, cpus=os.cpu_count() or 1):
+    """
+    Return a message for every size where --pipeline is not faster than one thread
+    (compression and writes only overlap drawing with a second CPU)
+    """
+    problems = []
+    runs = {(r['rows'], r['pipelined']): r for r in results if 'pipelined' in r}
+    for rows in sorted({rows for rows, _ in runs}):
+        one_thread, pipelined = runs[(rows, False)], runs[(rows, True)]
+        if cpus < 2 or not (one_thread['ok'] and pipelined['ok']):
+            continue
+        if pipelined['seconds'] >= one_thread['seconds']:
+            problems.append(f"selector @ {rows:,} rows: --pipeline took {pipelined['seconds']:.2f}s, "
+                            f"one thread {one_thread['seconds']:.2f}s")
+    return problems
+
+def print_pipeline(results):
+    """Speedup of --pipeline over one thread"""
+    print(f"{'Rows':>10} {'One thread':>11} {'Pipelined':>10} {'Speedup':>8}")
+    runs = {(r['rows'], r['pipelined']): r for r in results if 'pipelined' in r}
+    for rows in sorted({rows for rows, _ in runs}):
+        one_thread, pipelined = runs[(rows, False)]['seconds'], runs[(rows, True)]['seconds']
+        print(f"{rows:>10,} {one_thread:>11.2f} {pipelined:>10.2f} {one_thread / pipelined:>7.2f}x")
+
+def chunk_limit_check(csv_file, rows, work_dir, chunk_mb, keep_pdfs=False):
+    """
+    Run the selector split into files of at most chunk_mb and check every chunk
+    on disk against the limit; returns (measurements, problem messages)
+    """
+    print(f"  Running selector split at {chunk_mb} MB...")
+    label = "selector_chunked"
+    result = benchmark('selector', csv_file, rows, work_dir, keep_pdfs, ['--chunk-mb', str(chunk_mb)], label)
+    manifest_path = os.path.join(work_dir, f"{label}_{rows}.chunks.json")
+    if not result['ok'] or not os.path.exists(manifest_path):
+        return result, [f"selector @ {rows:,} rows split at {chunk_mb} MB failed"]
+
+    max_bytes = chunk_mb * 1024 * 1024
+    problems = []
+    with open(manifest_path, 'r') as f:
+        chunks = json.load(f)['chunks']
+    for chunk in chunks:
+        chunk_pdf = os.path.join(work_dir, chunk['file'])
+        chunk_bytes = os.path.getsize(chunk_pdf)
+        result['output_bytes'] += chunk_bytes
+        if chunk_bytes > max_bytes:
+            problems.append(f"{chunk['file']}: {chunk_bytes:,} bytes, over the {chunk_mb} MB limit "
+                            f"({max_bytes:,.0f} bytes)")
+        if not keep_pdfs:
+            os.remove(chunk_pdf)
+    if not keep_pdfs:
+        os.remove(manifest_path)
+    result['chunks'] = len(chunks)
+    return result, problems
+
+def print_results(results):
+    print(f"{'Renderer':<19} {'Rows':>10} {'Seconds':>9} {'Rows/s':>10} {'Pages/s':>9} "
+          f"{'Peak RSS':>10} {'Output':>12}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f} MB" if r['peak_rss_mb'] is not None else "n/a"
+        status = "" if r['ok'] else "  FAILED"
+        print(f"{r['renderer']:<19} {r['rows']:>10,} {r['seconds']:>9.2f} {r['rows_per_sec']:>10,.0f} "
+              f"{r['pages_per_sec']:>9,.0f} {rss:>10} {r['output_bytes']:>12,}{status}")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the 1099-NEC renderers on synthetic data.")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in SIZES),
+                        help="Comma-separated row counts (default: %(default)s)")
+    parser.add_argument('--renderers', default=','.join(RENDERERS),
+                        help="Comma-separated renderers (default: %(default)s)")
+    parser.add_argument('--work-dir', default=os.path.join(tempfile.gettempdir(), "1099_benchmark"),
+                        help="Where synthetic CSVs and PDFs are written (CSVs are reused)")
+    parser.add_argument('--seed', type=int, default=RANDOM_SEED)
+    parser.add_argument('--workers', nargs='?', const=','.join(str(n) for n in WORKER_COUNTS),
+                        help="Also run the selector at these render process counts and check the "
+                             "speedup grows with them (default counts: %(const)s)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Also run the selector on one thread and with --pipeline and check "
+                             "the pipeline is faster (needs 2+ CPUs)")
+    parser.add_argument('--chunk-mb', type=float,
+                        help="Also run the selector split into files of at most this many MB "
+                             "and check every file is within the limit")
+    parser.add_argument('--keep-pdfs', action='store_true', help="Keep the rendered PDFs")
+    parser.add_argument('--save', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Results JSON from an earlier run to gate against")
+    parser.add_argument('--max-slowdown', type=float, default=MAX_SLOWDOWN,
+                        help="Allowed slowdown vs the baseline (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    renderers = args.renderers.split(',')
+    for renderer in renderers:
+        if renderer not in RENDERERS:
+            parser.error(f"Unknown renderer '{renderer}' (choose from {', '.join(RENDERERS)})")
+    worker_counts = sorted({int(n) for n in args.workers.split(',')}) if args.workers else []
+    if any(n < 1 for n in worker_counts):
+        parser.error("--workers counts must be at least 1")
+    if args.chunk_mb is not None and args.chunk_mb <= 0:
+        parser.error("--chunk-mb must be positive")
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    header = read_header()
+
+    results = []
+    chunk_problems = []
+    for rows in sizes:
+        csv_file = os.path.join(args.work_dir, f"synthetic_1099nec_{rows}_seed{args.seed}.csv")
+        print(f"Preparing {rows:,} rows: {csv_file}")
+        generate_csv(csv_file, rows, header, args.seed)
+        for renderer in renderers:
+            print(f"  Running {renderer}...")
+            results.append(benchmark(renderer, csv_file, rows, args.work_dir, args.keep_pdfs))
+        if worker_counts:
+            results += worker_scaling(csv_file, rows, args.work_dir, worker_counts, args.keep_pdfs)
+        if args.pipeline:
+            results += pipeline_comparison(csv_file, rows, args.work_dir, args.keep_pdfs)
+        if args.chunk_mb:
+            result, problems = chunk_limit_check(csv_file, rows, args.work_dir, args.chunk_mb, args.keep_pdfs)
+            results.append(result)
+            chunk_problems += problems
+
+    print("\n" + "=" * 80)
+    print_results(results)
+    print("=" * 80)
+
+    if worker_counts:
+        print_scaling(results)
+        problems = check_scaling(results)
+        if problems:
+            print("❌ NOT SCALING:")
+            for problem in problems:
+                print(f"   - {problem}")
+        elif (os.cpu_count() or 1) < 2:
+            print("Only 1 CPU: extra workers can't run at the same time here, so they aren't gated")
+        else:
+            print(f"✓ Faster with every worker count up to {os.cpu_count()} CPUs")
+        print("=" * 80)
+
+    if args.pipeline:
+        print_pipeline(results)
+        problems = check_pipeline(results)
+        if problems:
+            print("❌ PIPELINE NOT FASTER:")
+            for problem in problems:
+                print(f"   - {problem}")
+        elif (os.cpu_count() or 1) < 2:
+            print("Only 1 CPU: the pipeline can't overlap work here, so it isn't gated")
+        else:
+            print("✓ --pipeline faster than one thread at every size")
+        print("=" * 80)
+
+    if args.chunk_mb:
+        if chunk_problems:
+            print(f"❌ CHUNKS OVER {args.chunk_mb} MB:")
+            for problem in chunk_problems:
+                print(f"   - {problem}")
+        else:
+            chunk_counts = ', '.join(f"{r['chunks']} at {r['rows']:,} rows" for r in results if 'chunks' in r)
+            print(f"✓ Every chunk within {args.chunk_mb} MB ({chunk_counts})")
+        print("=" * 80)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+        print(f"✓ Results saved: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline_results = json.load(f)['results']
+        problems = check_regressions(results, baseline_results, args.max_slowdown)
+        if problems:
+            print("❌ REGRESSIONS:")
+            for problem in problems:
+                print(f"   - {problem}")
+            return 1
+        print(f"✓ No run slower than {args.max_slowdown:.2f}x the baseline")
+
+    if worker_counts and check_scaling(results):
+        return 1
+    if args.pipeline and check_pipeline(results):
+        return 1
+    if chunk_problems:
+        return 1
+    return 0 if all(r['ok'] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Startup Time Check
+Runs the mail-merge entry points with --help (and a --check validation run when
+a CSV is given) several times and reports the median wall time of each call
+against the startup budget.
+
+The bare interpreter (python -c pass) is timed too and subtracted, so the budget
+covers what the scripts themselves import and do before any rendering.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Budget for a --help / validation-only call, in milliseconds (beyond the interpreter)
+STARTUP_BUDGET_MS = 100
+
+# Runs per command (the median is reported)
+RUNS = 7
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SELECTOR_SCRIPT = os.path.join(SCRIPT_DIR, "1099-NEC Mail Merge w Dev w Selector.py")
+MAIL_MERGE_SCRIPT = os.path.join(SCRIPT_DIR, "1099-NEC Mail Merge.py")
+SELECTOR_LAYOUT = os.path.join(SCRIPT_DIR, "2025 1099-NEC Section 1 Master mapping.json")
+MAIL_MERGE_COORDS = os.path.join(SCRIPT_DIR, "2025 Blank 1099-NEC 3 Entity Fillable_fields.json")
+
+# ============================================================================
+# TIMING FUNCTIONS
+# ============================================================================
+
+def time_command(command, runs=RUNS):
+    """Median wall time of a command in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def startup_commands(csv_file=None):
+    """(label, command) pairs to time"""
+    python = sys.executable
+    commands = [
+        ("Selector --help", [python, SELECTOR_SCRIPT, "--help"]),
+        ("Mail Merge --help", [python, MAIL_MERGE_SCRIPT, "--help"]),
+    ]
+    if csv_file:
+        commands.append(("Selector --check", [python, SELECTOR_SCRIPT, "--csv", csv_file,
+                                              "--layout", SELECTOR_LAYOUT, "--check"]))
+        commands.append(("Mail Merge --check", [python, MAIL_MERGE_SCRIPT, "--csv", csv_file,
+                                                "--json", MAIL_MERGE_COORDS, "--check"]))
+    return commands
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure mail-merge startup time against a budget.")
+    parser.add_argument('--csv', help="Publication 1220 CSV for the --check runs (skipped if omitted)")
+    parser.add_argument('--runs', type=int, default=RUNS, help="Runs per command")
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help="Allowed milliseconds beyond the bare interpreter")
+    args = parser.parse_args(argv)
+
+    baseline = time_command([sys.executable, "-c", "pass"], args.runs)
+
+    print("=" * 60)
+    print(f"Startup budget: {args.budget_ms:.0f} ms beyond the interpreter")
+    print(f"Interpreter (python -c pass): {baseline:.1f} ms")
+    print("=" * 60)
+
+    over_budget = 0
+    for label, command in startup_commands(args.csv):
+        elapsed = time_command(command, args.runs)
+        overhead = elapsed - baseline
+        status = "OK" if overhead <= args.budget_ms else "OVER BUDGET"
+        if overhead > args.budget_ms:
+            over_budget += 1
+        print(f"{label:<22} {elapsed:7.1f} ms  (+{overhead:6.1f} ms)  {status}")
+
+    print("=" * 60)
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
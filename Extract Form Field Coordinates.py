@@ -1,8 +1,97 @@
-"""Extract Form Field Coordinates from PDF - With Kids Support"""
-import PyPDF2
+"""
+Extract Form Field Coordinates from PDF - With Kids Support
+One pass over every page's /Annots indexes each widget by its fully qualified
+field name (/T joined up the /Parent chain), so every field is a dictionary
+lookup instead of a scan of all annotations. Every widget of a field is kept.
+
+    python "Extract Form Field Coordinates.py"                        (prompts for a PDF)
+    python "Extract Form Field Coordinates.py" form.pdf other.pdf
+    python "Extract Form Field Coordinates.py" --dir "Fillable Forms" --workers 4
+
+Each PDF gets <name>_fields.json next to it: x, y, width and height of the
+field's first widget, plus every widget (page and rect) under 'widgets'.
+
+The layout is also stored in the layout cache, keyed by the SHA-256 of the PDF
+plus EXTRACTOR_VERSION. The renderers accept a fillable PDF wherever they take
+a layout JSON and read it from the cache (extracting and storing it on a miss),
+so a new blank form is only parsed once.
+"""
+import hashlib
 import json
+import os
+import sys
+import tempfile
+
+# Worker processes for a directory of PDFs (None = one per CPU)
+EXTRACT_WORKERS = None
+
+# Bump whenever the layout JSON changes shape or content (old cache entries stop matching)
+EXTRACTOR_VERSION = 2
+
+# Extracted layouts, one <sha256>-v<EXTRACTOR_VERSION>.json per source PDF
+LAYOUT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "1099-form-layouts")
+
+# Deepest field hierarchy followed when building qualified names
+MAX_FIELD_DEPTH = 32
 
-def extract_field_info(pdf_path):
+def qualified_name(obj):
+    """Fully qualified field name: the /T of the object and its parents, joined with '.'"""
+    parts = []
+    for _ in range(MAX_FIELD_DEPTH):  # (a malformed /Parent loop stops here)
+        if '/T' in obj:
+            parts.append(str(obj['/T']))
+        parent = obj.get('/Parent')
+        if parent is None:
+            break
+        obj = parent.get_object()
+    return '.'.join(reversed(parts))
+
+def widget_rect(rect):
+    """(x, y, width, height) of a /Rect, whichever corners it lists"""
+    x1, y1, x2, y2 = [float(v) for v in rect]
+    return min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1)
+
+def index_widgets(reader):
+    """
+    One pass over all pages: fully qualified field name -> list of
+    (page number, (x, y, width, height)) for each of its widgets, in page order
+    """
+    index = {}
+    for page_num, page in enumerate(reader.pages):
+        annots = page.get('/Annots')
+        if annots is None:
+            continue
+        for annot in annots.get_object():
+            annot_obj = annot.get_object()
+            if annot_obj.get('/Subtype') != '/Widget' or '/Rect' not in annot_obj:
+                continue
+            name = qualified_name(annot_obj)
+            if name:
+                index.setdefault(name, []).append((page_num, widget_rect(annot_obj['/Rect'])))
+    return index
+
+def field_entry(widgets):
+    """JSON entry for one field: the first widget's box plus every widget"""
+    _, (x, y, width, height) = widgets[0]
+    return {
+        'x': round(x, 2),
+        'y': round(y, 2),
+        'width': round(width, 2),
+        'height': round(height, 2),
+        'widgets': [
+            {'page': page_num, 'x': round(wx, 2), 'y': round(wy, 2),
+             'width': round(ww, 2), 'height': round(wh, 2)}
+            for page_num, (wx, wy, ww, wh) in widgets
+        ],
+    }
+
+def extract_layout(pdf_path):
+    """
+    Read a fillable PDF's field positions
+    Returns (layout dict as saved to JSON, number of form fields in the PDF)
+    """
+    import PyPDF2
+    
     with open(pdf_path, 'rb') as f:
         reader = PyPDF2.PdfReader(f)
         
@@ -11,107 +100,153 @@ def extract_field_info(pdf_path):
         page_width = float(page.mediabox.width)
         page_height = float(page.mediabox.height)
         
-        print(f"Page size: {page_width} × {page_height} points")
-        print(f"Page size: {page_width/72:.2f}\" × {page_height/72:.2f}\"\n")
-        
-        # Get form fields
-        fields = reader. get_fields()
-        
-        if not fields:
-            print("No form fields found!")
-            return
-        
-        print(f"Found {len(fields)} form fields:\n")
-        print("="*100)
+        # Get form fields (only terminal fields have widgets of their own)
+        fields = reader.get_fields() or {}
+        index = index_widgets(reader)
         
-        field_data = {}
-        
-        for field_name, field_info in fields.items():
-            print(f"\nField: {field_name}")
-            
-            # Check if field has /Kids (child widgets)
-            if '/Kids' in field_info: 
-                print(f"  Has {len(field_info['/Kids'])} child widgets")
-                # Get first child widget
-                try: 
-                    kid = field_info['/Kids'][0].get_object()
-                    if '/Rect' in kid: 
-                        rect = kid['/Rect']
-                        x = float(rect[0])
-                        y = float(rect[1])
-                        
-                        # ONLY x and y - no width/height
-                        field_data[field_name] = {
-                            'x': round(x, 2),
-                            'y': round(y, 2)
-                        }
-                        
-                        print(f"  ✓ Position from child widget:  X={x:.2f}, Y={y:.2f}")
-                        print(f"  (X in inches: {x/72:.3f}\", Y in inches:  {y/72:.3f}\")")
-                    else: 
-                        print(f"  ⚠️  Child widget has no /Rect")
-                except Exception as e: 
-                    print(f"  ⚠️  Error accessing child widget: {e}")
-            
-            # Also check direct /Rect
-            elif '/Rect' in field_info:
-                rect = field_info['/Rect']
-                x = float(rect[0])
-                y = float(rect[1])
-                
-                # ONLY x and y - no width/height
-                field_data[field_name] = {
-                    'x': round(x, 2),
-                    'y':  round(y, 2)
-                }
-                
-                print(f"  ✓ Position:  X={x:.2f}, Y={y:.2f}")
-                print(f"  (X in inches: {x/72:.3f}\", Y in inches: {y/72:.3f}\")")
-            
-            # Fallback:  search page annotations
-            else: 
-                print(f"  Searching page annotations...")
-                found = False
-                for page_num, page in enumerate(reader.pages):
-                    if '/Annots' in page:
-                        for annot in page['/Annots']: 
-                            annot_obj = annot.get_object()
-                            if '/T' in annot_obj and annot_obj['/T'] == field_name: 
-                                if '/Rect' in annot_obj: 
-                                    rect = annot_obj['/Rect']
-                                    x = float(rect[0])
-                                    y = float(rect[1])
-                                    
-                                    # ONLY x and y - no width/height
-                                    field_data[field_name] = {
-                                        'x': round(x, 2),
-                                        'y': round(y, 2)
-                                    }
-                                    
-                                    print(f"  ✓ Found in page annotations:")
-                                    print(f"  Position: X={x:.2f}, Y={y:.2f}")
-                                    print(f"  (X in inches: {x/72:.3f}\", Y in inches: {y/72:.3f}\")")
-                                    found = True
-                                    break
-                    if found:
-                        break
-                
-                if not found: 
-                    print(f"  ❌ No coordinates found")
-            
-            print("-"*100)
-        
-        # Save to JSON
-        output_file = pdf_path.replace('.pdf', '_fields.json')
-        with open(output_file, 'w') as out:
-            json.dump({
-                'page_size': {'width':  page_width, 'height':  page_height},
-                'fields': field_data
-            }, out, indent=2)
-        
-        print(f"\n✓ Field data saved to: {output_file}")
-        print(f"✓ Extracted coordinates for {len(field_data)} out of {len(fields)} fields")
+        field_data = {name: field_entry(widgets) for name, widgets in index.items()}
+    
+    layout = {
+        'page_size': {'width': page_width, 'height': page_height},
+        'fields': field_data
+    }
+    return layout, len(fields)
+
+def fields_json_path(pdf_path):
+    """<name>_fields.json next to the PDF"""
+    return os.path.splitext(pdf_path)[0] + '_fields.json'
+
+def pdf_digest(pdf_path):
+    """SHA-256 of the PDF's contents"""
+    h = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def layout_cache_path(digest, cache_dir=LAYOUT_CACHE_DIR):
+    """Cache file for a PDF digest under the current extractor version"""
+    return os.path.join(cache_dir, f"{digest}-v{EXTRACTOR_VERSION}.json")
+
+def store_layout(layout, digest, cache_dir=LAYOUT_CACHE_DIR):
+    """Write a layout to the cache (atomically, so a reader never sees half a file)"""
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+    try:
+        with os.fdopen(fd, 'w') as out:
+            json.dump(layout, out)
+        os.replace(tmp_path, layout_cache_path(digest, cache_dir))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def cached_layout(pdf_path, cache_dir=LAYOUT_CACHE_DIR):
+    """
+    Layout dict for a fillable PDF (same shape as <name>_fields.json)
+    Read from the cache when this PDF was extracted before, otherwise extracted and stored
+    """
+    digest = pdf_digest(pdf_path)
+    try:
+        with open(layout_cache_path(digest, cache_dir), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass  # Miss (or an unreadable entry, which is replaced)
+    
+    layout, _ = extract_layout(pdf_path)
+    store_layout(layout, digest, cache_dir)
+    return layout
+
+def extract_field_info(pdf_path, verbose=False, cache_dir=LAYOUT_CACHE_DIR):
+    """
+    Extract one PDF's field positions, save them to <name>_fields.json and store
+    them in the layout cache
+    Returns a summary dict (paths, page size, field counts)
+    """
+    layout, form_fields = extract_layout(pdf_path)
+    store_layout(layout, pdf_digest(pdf_path), cache_dir)
+    
+    output_file = fields_json_path(pdf_path)
+    with open(output_file, 'w') as out:
+        json.dump(layout, out, indent=2)
+    
+    summary = {
+        'pdf': pdf_path,
+        'output': output_file,
+        'page_size': (layout['page_size']['width'], layout['page_size']['height']),
+        'form_fields': form_fields,
+        'extracted': len(layout['fields']),
+        'widgets': sum(len(entry['widgets']) for entry in layout['fields'].values()),
+    }
+    if verbose:
+        summary['field_lines'] = [
+            f"  {name}: X={entry['x']:.2f}, Y={entry['y']:.2f}, "
+            f"W={entry['width']:.2f}, H={entry['height']:.2f} ({len(entry['widgets'])} widget(s))"
+            for name, entry in layout['fields'].items()
+        ]
+    return summary
+
+def print_summary(summary):
+    """A few lines per PDF (one more per field when verbose)"""
+    width, height = summary['page_size']
+    print(f"\n{os.path.basename(summary['pdf'])}")
+    print(f"  Page size: {width} × {height} points ({width/72:.2f}\" × {height/72:.2f}\")")
+    for line in summary.get('field_lines', ()):
+        print(line)
+    if not summary['form_fields'] and not summary['extracted']:
+        print("  No form fields found!")
+        return
+    print(f"  ✓ Extracted coordinates for {summary['extracted']} out of {summary['form_fields']} fields "
+          f"({summary['widgets']} widgets)")
+    print(f"  ✓ Field data saved to: {summary['output']}")
+
+def extract_many(pdf_paths, workers=EXTRACT_WORKERS, verbose=False):
+    """Extract several PDFs in parallel worker processes; summaries print in the given order"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    if len(pdf_paths) == 1 or workers == 1:
+        summaries = [extract_field_info(pdf_path, verbose) for pdf_path in pdf_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(extract_field_info, pdf_paths, [verbose] * len(pdf_paths)))
+    
+    for summary in summaries:
+        print_summary(summary)
+    return summaries
+
+def parse_args(argv=None):
+    """Command line (with no PDFs or --dir, the path is prompted for)"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract fillable PDF field coordinates to JSON.")
+    parser.add_argument('pdfs', nargs='*', help="Fillable PDF files")
+    parser.add_argument('--dir', help="Extract every PDF in this directory")
+    parser.add_argument('--workers', type=int, default=EXTRACT_WORKERS,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--verbose', action='store_true', help="Print every field's position")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    pdf_paths = list(args.pdfs)
+    if args.dir:
+        pdf_paths += sorted(os.path.join(args.dir, name) for name in os.listdir(args.dir)
+                            if name.lower().endswith('.pdf'))
+    if not pdf_paths and not args.dir:
+        pdf_paths = [input("Enter path to fillable PDF: ").strip().strip('"')]
+    
+    missing = [path for path in pdf_paths if not os.path.isfile(path)]
+    if missing:
+        print(f"ERROR: File not found: {missing[0]}")
+        return 1
+    if not pdf_paths:
+        print("No PDF files found!")
+        return 1
+    
+    summaries = extract_many(pdf_paths, args.workers, args.verbose)
+    if len(summaries) > 1:
+        print(f"\n✓ {len(summaries)} PDFs, {sum(s['extracted'] for s in summaries)} fields extracted")
+    return 0
 
 if __name__ == "__main__":
-    pdf_path = input("Enter path to fillable PDF: ").strip('"')
-    extract_field_info(pdf_path)
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Form Template Preparation
+Batch replacement for "Unrotate a scan pdf.py", "Check PDF Rotation setting.py"
+and "Convert PDF to Image.py": takes any number of blank-form PDFs and pages.
+
+For each PDF:
+    <name>-CORRECTED.pdf   the selected pages with their /Rotate baked into the page
+                           content and boxes (/Rotate 0, upright MediaBox)
+    <name>-p<N>.png        each selected page rasterized at --dpi, upright
+                           (<name>.png for a one-page PDF)
+
+    python "Prepare Form Templates.py" "2025 1099-NEC-5111 Blank.pdf" --dpi 300
+    python "Prepare Form Templates.py" Templates --pages 1,3-4 --png --workers 4
+    python "Prepare Form Templates.py" Templates --check      (print each page's /Rotate)
+
+--turn adds a clockwise quarter turn on top of /Rotate for scans whose content
+is sideways on the page. Pages are rasterized in worker processes, straight from
+the rotated pixmap to PNG (no PIL round-trip).
+"""
+
+import argparse
+import os
+import sys
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Raster resolution for the background images
+DEFAULT_DPI = 300
+
+# Worker processes for rasterizing (None = one per CPU)
+TEMPLATE_WORKERS = None
+
+# Page boxes are rounded to this many decimals after the rotation is moved into the content
+BOX_DECIMALS = 4
+
+# Output names (next to the source PDF unless --out-dir is given)
+CORRECTED_SUFFIX = "-CORRECTED.pdf"
+PAGE_IMAGE_SUFFIX = "-p{page}.png"
+
+# ============================================================================
+# PAGE SELECTION FUNCTIONS
+# ============================================================================
+
+def template_pdfs(paths):
+    """PDF files from the arguments (a directory contributes every PDF in it)"""
+    pdf_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            pdf_paths += sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith('.pdf') and not name.endswith(CORRECTED_SUFFIX))
+        else:
+            pdf_paths.append(path)
+    return pdf_paths
+
+def parse_page_spec(page_string, page_count):
+    """
+    Parse "all" or a page list like "1,3-4" into sorted 0-based page indices
+    Pages past the end of a shorter PDF are skipped
+    Raises ValueError on invalid input
+    """
+    if page_string.strip().lower() == 'all':
+        return list(range(page_count))
+
+    pages = set()
+    for part in page_string.replace(' ', '').split(','):
+        start, _, end = part.partition('-')
+        start = int(start)
+        end = int(end) if end else start
+        if start < 1 or start > end:
+            raise ValueError(f"Invalid page range: {part}")
+        pages.update(range(start - 1, min(end, page_count)))
+    return sorted(pages)
+
+def output_path(pdf_path, out_dir, suffix):
+    """<out_dir or the PDF's folder>/<PDF name><suffix>"""
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(out_dir or os.path.dirname(os.path.abspath(pdf_path)), stem + suffix)
+
+# ============================================================================
+# TEMPLATE FUNCTIONS (run in worker processes)
+# ============================================================================
+
+def unrotate_pdf(pdf_path, page_indices, turn, corrected_pdf):
+    """
+    Write the selected pages with their rotation (/Rotate plus turn) moved into
+    the page content and boxes, so every page is upright with /Rotate 0
+    Returns [(page index, original /Rotate), ...]
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import NameObject, RectangleObject
+
+    reader = PdfReader(pdf_path)
+    writer = PdfWriter()
+    rotations = []
+    for index in page_indices:
+        page = reader.pages[index]
+        rotations.append((index, page.rotation))
+        page.rotation = (page.rotation + turn) % 360
+        if page.rotation:
+            page.transfer_rotation_to_content()
+            for box in ('/MediaBox', '/CropBox', '/BleedBox', '/TrimBox', '/ArtBox'):
+                if box in page:
+                    page[NameObject(box)] = RectangleObject(
+                        [round(float(v), BOX_DECIMALS) for v in page[box]]
+                    )
+        writer.add_page(page)
+
+    temp_pdf = corrected_pdf + ".tmp"
+    with open(temp_pdf, 'wb') as f:
+        writer.write(f)
+    os.replace(temp_pdf, corrected_pdf)
+    return rotations
+
+def rasterize_page(pdf_path, page_index, turn, dpi, png_path):
+    """
+    Render one page upright (/Rotate plus turn) at dpi and save it as PNG
+    straight from the pixmap; returns the image size in pixels
+    """
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf  # PyMuPDF before 1.24.3
+
+    zoom = dpi / 72
+    with pymupdf.open(pdf_path) as doc:
+        # get_pixmap already applies /Rotate; the extra turn goes into the matrix
+        # (device space runs top-down, so a positive angle turns clockwise)
+        matrix = pymupdf.Matrix(zoom, zoom).prerotate(turn)
+        pix = doc[page_index].get_pixmap(matrix=matrix)
+    pix.set_dpi(dpi, dpi)
+    pix.save(png_path)
+    return pix.width, pix.height
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def page_counts(pdf_paths):
+    """{pdf: (page count, [/Rotate per page])} read with PyPDF2 (no page content parsed)"""
+    from PyPDF2 import PdfReader
+
+    counts = {}
+    for pdf_path in pdf_paths:
+        reader = PdfReader(pdf_path)
+        counts[pdf_path] = (len(reader.pages), [page.rotation for page in reader.pages])
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Un-rotate and rasterize blank form templates in bulk.")
+    parser.add_argument('pdfs', nargs='+', help="Template PDFs, or folders of them")
+    parser.add_argument('--pages', default='all', help='Pages to prepare, e.g. "1,3-4" (default: all)')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help="PNG resolution")
+    parser.add_argument('--turn', type=int, default=0, choices=(0, 90, 180, 270),
+                        help="Extra clockwise rotation on top of /Rotate (for sideways scans)")
+    parser.add_argument('--pdf', action='store_true', help="Only write the corrected PDFs")
+    parser.add_argument('--png', action='store_true', help="Only write the PNG images")
+    parser.add_argument('--out-dir', help="Write the outputs here (default: next to each PDF)")
+    parser.add_argument('--workers', type=int, default=TEMPLATE_WORKERS,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--check', action='store_true', help="Print each page's /Rotate and exit")
+    args = parser.parse_args(argv)
+
+    pdf_paths = template_pdfs(args.pdfs)
+    for pdf_path in pdf_paths:
+        if not os.path.isfile(pdf_path):
+            parser.error(f"File not found: {pdf_path}")
+    if not pdf_paths:
+        parser.error("No PDF files found")
+    if args.dpi < 1:
+        parser.error("--dpi must be positive")
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    counts = page_counts(pdf_paths)
+    selected = {}
+    for pdf_path, (page_count, _) in counts.items():
+        try:
+            selected[pdf_path] = parse_page_spec(args.pages, page_count)
+        except ValueError as e:
+            parser.error(f"--pages: {e}")
+
+    if args.check:
+        for pdf_path, (_, rotations) in counts.items():
+            print(f"{os.path.basename(pdf_path)}")
+            for index in selected[pdf_path]:
+                print(f"  Page {index + 1}: PDF Rotation: {rotations[index]} degrees")
+        return 0
+
+    write_pdf = args.pdf or not args.png
+    write_png = args.png or not args.pdf
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    print("=" * 60)
+    print(f"Preparing {sum(map(len, selected.values()))} page(s) from {len(pdf_paths)} PDF(s)")
+    print("=" * 60)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        corrected = {}
+        images = []
+        for pdf_path, page_indices in selected.items():
+            if not page_indices:
+                continue
+            if write_pdf:
+                corrected_pdf = output_path(pdf_path, args.out_dir, CORRECTED_SUFFIX)
+                corrected[corrected_pdf] = pool.submit(unrotate_pdf, pdf_path, page_indices,
+                                                       args.turn, corrected_pdf)
+            if write_png:
+                for index in page_indices:
+                    suffix = ".png" if counts[pdf_path][0] == 1 else PAGE_IMAGE_SUFFIX.format(page=index + 1)
+                    png_path = output_path(pdf_path, args.out_dir, suffix)
+                    images.append((png_path, pool.submit(rasterize_page, pdf_path, index,
+                                                         args.turn, args.dpi, png_path)))
+
+        for corrected_pdf, future in corrected.items():
+            rotations = ', '.join(f"p{index + 1}: {rotation}°" for index, rotation in future.result())
+            print(f"✓ Created: {corrected_pdf}  (original rotation {rotations})")
+        for png_path, future in images:
+            width, height = future.result()
+            print(f"✓ Created: {png_path}  ({width} x {height} pixels at {args.dpi} DPI)")
+
+    if write_png:
+        print("\nOpen the PNGs to verify they're upright before proceeding!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
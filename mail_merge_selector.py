@@ -0,0 +1,3084 @@
+"""
+1099-NEC Form Filler - Direct Coordinate Approach
+Uses JSON master template with exact field positions
+Toggle USE_BACKGROUND_IMAGE for development vs production
+Compatible with IRS Publication 1220 CSV format
+
+Everything behind "1099-NEC Mail Merge w Dev w Selector.py": settings, dialogs,
+layout, rendering, joining, chunking, checkpoints and the command line. The
+script only imports this module, so Python compiles it once into __pycache__
+instead of on every run (a script run as __main__ never gets cached bytecode).
+reportlab, PyPDF2 and tkinter are imported only on the code paths that use them.
+"""
+
+import json
+import csv
+import os
+import re
+import sys
+import hashlib
+import heapq
+import struct
+from datetime import datetime
+from itertools import chain, dropwhile, islice
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from time import perf_counter
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# TOGGLE THIS:  True = show background (development), False = data only (production)
+USE_BACKGROUND_IMAGE = False
+
+# Font settings
+FONT_NAME = "Courier"
+FONT_SIZE = 9
+
+# Page size in points (US Letter, same as reportlab.lib.pagesizes.letter)
+PAGE_SIZE = (612.0, 792.0)
+
+# Field positions can also come straight from a fillable PDF, through the extractor's layout cache
+EXTRACTOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Extract Form Field Coordinates.py")
+
+# Section spacing
+SECTION_1_Y_OFFSET = 22      # Move down (-) or up (+)
+SECTION_2_Y_OFFSET = -253    # Move down (-) or up (+)
+SECTION_3_Y_OFFSET = -528    # Move down (-) or up (+)
+SECTION_Y_OFFSETS = (SECTION_1_Y_OFFSET, SECTION_2_Y_OFFSET, SECTION_3_Y_OFFSET)
+
+# Multi-line address spacing
+LINE_HEIGHT = FONT_SIZE * 1.2  # 120% line spacing
+
+# BOX 5a/6a/7a sit half a line below BOX 5/6/7
+HALF_LINE_OFFSET = 13.5
+
+# Background image offset and scaling (for independent adjustment during development)
+BACKGROUND_IMAGE_X_OFFSET = -3       # Move background left (-) or right (+)
+BACKGROUND_IMAGE_Y_OFFSET = -15.5    # Move background down (-) or up (+)
+BACKGROUND_IMAGE_WIDTH_STRETCH = 22.5     # Add/subtract width 
+BACKGROUND_IMAGE_HEIGHT_STRETCH = 31    # Add/subtract height
+BACKGROUND_FORM_NAME = "Background"     # Form XObject holding the background (one copy per PDF)
+
+# Background proof: the dev background is embedded as a downsampled, opaque grayscale
+# JPEG sized for this DPI at the size it is drawn, built once and cached (keyed by the
+# image's SHA-256 and the settings above). 0 = embed the full-resolution image as is.
+BACKGROUND_PROOF_DPI = 150
+BACKGROUND_PROOF_QUALITY = 80
+BACKGROUND_PROOF_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "1099-background-proofs")
+
+# Vector template overlay: stamp the data onto the blank IRS PDF instead of an image
+# (None = data only). The blank form is placed where the background image would be.
+OVERLAY_TEMPLATE_PDF = None  # e.g. "2025 1099-NEC-5111 Blank Top Top.pdf"
+OVERLAY_TEMPLATE_PAGE = 0    # Page of the blank PDF to use (0 = first page)
+TEMPLATE_FORM_NAME = "/BlankForm"
+
+# Incremental re-run: a manifest of page digests is saved next to every output PDF.
+# When True, a re-run only re-renders pages whose rows or layout changed.
+INCREMENTAL_RERUN = False
+MANIFEST_VERSION = 1
+
+# Cached text widths for right-aligned amounts (distinct strings kept)
+TEXT_WIDTH_CACHE_SIZE = 4096
+
+# Column normalization (rows are formatted a batch at a time, column by column)
+NORMALIZE_BATCH_ROWS = 3000  # Rows per batch (a multiple of 3 keeps batches page-aligned)
+NORMALIZE_CACHE_SIZE = 8192  # Distinct formatted values remembered per column function
+
+# Parallel rendering (1 = single process)
+RENDER_WORKERS = 1           # Number of render processes (e.g. os.cpu_count())
+SHARD_PAGES = 500            # Pages per shard; each shard is rendered by one process
+
+# Compiled layout: LAYOUT_PLAN saved as a header plus one fixed-width record per field
+# position (offsets and BOX 5a/6a/7a already applied). Parallel workers map this file
+# instead of each receiving a pickled copy of the plan.
+COMPILED_LAYOUT_SUFFIX = ".layout"
+COMPILED_LAYOUT_MAGIC = b"1099LAY\0"
+COMPILED_LAYOUT_VERSION = 1
+COMPILED_LAYOUT_HEADER = struct.Struct('<8sHHI')     # magic, version, sections, records
+COMPILED_LAYOUT_RECORD = struct.Struct('<HH?16s5d')  # slot, section, right-aligned, font,
+                                                     # x, y, width, height, font size
+
+# Pipelined rendering: CSV parsing/normalizing, drawing and saving (compressing and
+# writing the PDF bytes) each run on their own thread, connected by bounded queues
+PIPELINED = False
+PIPELINE_QUEUE_PAGES = 200   # Normalized pages the parse thread may run ahead of drawing
+PIPELINE_QUEUE_SEGMENTS = 2  # Drawn segments waiting for the writer before drawing pauses
+PIPELINE_SEGMENT_PAGES = 500 # Pages drawn on one canvas before it is handed to the writer
+
+# Chunked output (all off = one PDF): roll over to a new file every N pages,
+# before a file passes N MB (estimated from the chunks written so far; a chunk
+# that still comes out over is re-split), and/or whenever the payer changes
+# (pages then never mix payers)
+CHUNK_PAGES = None
+CHUNK_MB = None
+CHUNK_BY_PAYER = False
+CHUNK_BYTES_PER_PAGE_ESTIMATE = 1000  # Starting estimate until the first chunk is measured
+CHUNK_FIXED_BYTES_ESTIMATE = 4096     # Per-file overhead (catalog, fonts, xref) before images/templates
+CHUNK_SIZE_MARGIN = 0.05              # Share of the MB limit the estimate leaves free for its own error
+
+# Checkpointing (None = off): commit every N finished pages to a durable segment PDF
+# and record the last committed CSV row, so a killed run resumes where it stopped
+CHECKPOINT_PAGES = None
+
+# Output profiles: how the PDF itself is written
+#   page_compression: Flate-compress page content streams (None = reportlab's rl_config default)
+#   initial_font:     make FONT_NAME the canvas's initial font, so the document carries only the
+#                     font it prints with (every page still selects it - PDF needs that per page)
+#   invariant:        reproducible output - the same input gives byte-identical files
+#   object_streams:   repack the finished PDF into compressed object streams (needs PyMuPDF)
+OUTPUT_PROFILE = 'standard'
+
+# Stage profiling: JSON report path (None = off) and whether to also run cProfile
+# (the cProfile stats are saved next to the report as <report>.prof)
+PROFILE_REPORT = None
+PROFILE_CPROFILE = False
+PROFILE_STAGES = ('csv_parse', 'compose', 'format', 'draw', 'show_page', 'save', 'merge')
+
+# Progress output: 'quiet' (nothing), 'bar' (status lines plus one updating line
+# on stderr) or 'json' (one JSON object per line on stdout, for orchestration)
+PROGRESS_MODE = 'bar'
+PROGRESS_MODES = ('quiet', 'bar', 'json')
+PROGRESS_INTERVAL = 0.5      # Seconds between progress updates
+PROGRESS_BAR_WIDTH = 30
+
+# Right-aligned fields (numbers/amounts)
+RIGHT_ALIGNED_FIELDS = {
+    'BOX 1', 'BOX 3', 'BOX 4',
+    'BOX 5', 'BOX 5a', 'BOX 6', 'BOX 6a', 'BOX 7', 'BOX 7a'
+}
+
+# Value slots: one per printed line/box, in drawing order
+(SLOT_PAYER_1, SLOT_PAYER_2, SLOT_PAYER_3, SLOT_PAYER_TIN,
+ SLOT_RECIPIENT_1, SLOT_RECIPIENT_2, SLOT_RECIPIENT_3, SLOT_RECIPIENT_TIN,
+ SLOT_ACCOUNT_NUMBER, SLOT_YEAR,
+ SLOT_BOX_1, SLOT_BOX_2, SLOT_BOX_3, SLOT_BOX_4,
+ SLOT_BOX_5, SLOT_BOX_5A, SLOT_BOX_6, SLOT_BOX_6A, SLOT_BOX_7, SLOT_BOX_7A) = range(20)
+
+# JSON field name and address line number for each value slot
+LAYOUT_SLOTS = (
+    ('PAYER', 0), ('PAYER', 1), ('PAYER', 2), ("PAYER'S TIN", 0),
+    ('RECIPIENT', 0), ('RECIPIENT', 1), ('RECIPIENT', 2), ("RECIPIENT'S TIN", 0),
+    ('ACCOUNT NUMBER', 0), ('YEAR', 0),
+    ('BOX 1', 0), ('BOX 2', 0), ('BOX 3', 0), ('BOX 4', 0),
+    ('BOX 5', 0), ('BOX 5a', 0), ('BOX 6', 0), ('BOX 6a', 0), ('BOX 7', 0), ('BOX 7a', 0),
+)
+
+# Multi-line fields (all other fields print a single value)
+MULTILINE_FIELDS = {'PAYER', 'RECIPIENT'}
+
+# Payer block: the same on every row of a payer, so it is drawn once per payer as a
+# form XObject and placed in each section with a translation
+PAYER_SLOTS = (SLOT_PAYER_1, SLOT_PAYER_2, SLOT_PAYER_3, SLOT_PAYER_TIN)
+
+# The row number travels with each recipient's values (never printed)
+ROW_NUMBER_SLOT = len(LAYOUT_SLOTS)
+
+# IRS Publication 1220 CSV columns read for each recipient (by position, in this order)
+RECORD_COLUMNS = (
+    'Payer Taxpayer ID Number',
+    'Payer Business or Entity Name Line 1',
+    'Payer First Name', 'Payer Middle Name', 'Payer Last Name (Surname)', 'Payer Suffix',
+    'Payer Address Line 1', 'Payer City/Town', 'Payer State/Province/Territory', 'Payer ZIP/Postal Code',
+    'Recipient Taxpayer ID Number',
+    'Recipient Business or Entity Name Line 1',
+    'Recipient First Name', 'Recipient Middle Name', 'Recipient Last Name (Surname)', 'Recipient Suffix',
+    'Recipient Address Line 1', 'Recipient City/Town', 'Recipient State/Province/Territory', 'Recipient ZIP/Postal Code',
+    'Form Account Number',
+    'Tax Year',
+    'Box 1 - Nonemployee Compensation',
+    'Box 2 - Payer made direct sales totaling $5,000 or more of consumer products to a recipient for resale',
+    'Box 3 - Excess golden parachute payments',
+    'Box 4 - Federal income tax withheld',
+    'State 1', 'State 1 - State tax withheld', 'State 1 - State/Payer state number', 'State 1 - State income',
+    'State 2', 'State 2 - State tax withheld', 'State 2 - State/Payer state number', 'State 2 - State income',
+)
+
+# A batch of normalized recipients stored column by column (columns in value-slot order)
+RecordBatch = namedtuple('RecordBatch', 'row_numbers columns')
+
+# One compiled field position: absolute page coordinates for one section
+FieldPlacement = namedtuple('FieldPlacement', 'slot x y right_aligned font size')
+
+# LAYOUT_PLAN split for payer forms: section 1's payer placements, each section's
+# (dx, dy) from section 1 (None = not a plain translation, draw directly) and the
+# remaining placements per section
+PayerBlockPlan = namedtuple('PayerBlockPlan', 'placements offsets others')
+
+OutputProfile = namedtuple('OutputProfile', 'page_compression initial_font invariant object_streams')
+
+OUTPUT_PROFILES = {
+    'standard': OutputProfile(None, False, None, False),  # reportlab defaults
+    'compact': OutputProfile(1, True, None, False),
+    'archive': OutputProfile(1, True, 1, True),
+}
+
+# ============================================================================
+# FILE SELECTION FUNCTIONS
+# (tkinter is imported inside the dialogs so headless runs never load it)
+# ============================================================================
+
+def show_large_message(title, message):
+    """Show a large, readable message box"""
+    import tkinter as tk
+    from tkinter import messagebox
+    
+    root = tk.Tk()
+    root.withdraw()  # Hide the main window
+    
+    # Configure message box font (larger and bold)
+    messagebox.showinfo(title, message)
+    root.destroy()
+
+def select_csv_file():
+    """Prompt user to select CSV input file"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
+    show_large_message(
+        "Step 1: Select CSV Data File",
+        "📄 SELECT YOUR CSV INPUT FILE\n\n"
+        "This file contains the 1099-NEC data for all recipients.\n\n"
+        "Format: IRS Publication 1220 CSV format\n"
+        "Example: 1099_CAI_pdf_IRS_Test-Data_2025.csv\n\n"
+        "Click OK to browse for your CSV file..."
+    )
+    
+    root = tk.Tk()
+    root.withdraw()
+    
+    file_path = filedialog.askopenfilename(
+        title="Select CSV Data File",
+        filetypes=[
+            ("CSV files", "*.csv"),
+            ("All files", "*.*")
+        ],
+        initialdir=os.path.expanduser("~")
+    )
+    
+    root.destroy()
+    
+    if not file_path: 
+        messagebox.showerror("Error", "No CSV file selected.  Exiting.")
+        exit()
+    
+    return file_path
+
+def select_json_file():
+    """Prompt user to select JSON field positions file"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
+    show_large_message(
+        "Step 3: Select JSON Field Positions",
+        "📐 SELECT YOUR JSON FIELD POSITIONS FILE\n\n"
+        "This file contains the X/Y coordinates for all form fields.\n"
+        "(A fillable PDF works too - its coordinates are extracted once and cached.)\n\n"
+        "Example: JSON Sourced - 2025 1099-NEC w Section 1 Fillable_fields.json\n\n"
+        "Click OK to browse for your JSON file..."
+    )
+    
+    root = tk.Tk()
+    root.withdraw()
+    
+    file_path = filedialog.askopenfilename(
+        title="Select JSON Field Positions File",
+        filetypes=[
+            ("JSON files", "*.json"),
+            ("Fillable PDF", "*.pdf"),
+            ("Compiled layout", "*" + COMPILED_LAYOUT_SUFFIX),
+            ("All files", "*.*")
+        ],
+        initialdir=os.path.expanduser("~")
+    )
+    
+    root.destroy()
+    
+    if not file_path:
+        messagebox.showerror("Error", "No JSON file selected. Exiting.")
+        exit()
+    
+    return file_path
+
+def select_background_image():
+    """Prompt user to select background image (only in dev mode)"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
+    show_large_message(
+        "Step 4: Select Background Image",
+        "🖼️ SELECT YOUR BACKGROUND IMAGE FILE\n\n"
+        "This is the scanned image of a blank 1099-NEC form.\n"
+        "Used for development/alignment purposes.\n\n"
+        "Example: 2025 1099-NEC-5111 Blank Top Top.png\n\n"
+        "Click OK to browse for your image file..."
+    )
+    
+    root = tk.Tk()
+    root.withdraw()
+    
+    file_path = filedialog.askopenfilename(
+        title="Select Background Image File (Dev Mode)",
+        filetypes=[
+            ("PNG files", "*.png"),
+            ("JPEG files", "*.jpg;*.jpeg"),
+            ("All image files", "*.png;*.jpg;*.jpeg;*.gif;*.bmp"),
+            ("All files", "*.*")
+        ],
+        initialdir=os.path.expanduser("~")
+    )
+    
+    root.destroy()
+    
+    if not file_path: 
+        messagebox.showwarning("Warning", "No background image selected. Continuing without image.")
+    
+    return file_path
+
+def select_output_location(mode):
+    """Prompt user to select output PDF location"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    
+    if mode == "DEV":
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        default_filename = f"1099_NEC_Forms_DEV_{timestamp}.pdf"
+        message_text = (
+            "💾 SELECT OUTPUT LOCATION (Development Mode)\n\n"
+            "Choose where to save your TEST PDF file.\n"
+            "This file will include the background image for alignment.\n\n"
+            f"Suggested filename: {default_filename}\n\n"
+            "Click OK to choose location..."
+        )
+    else:
+        default_filename = "1099_NEC_Forms_Filled.pdf"
+        message_text = (
+            "💾 SELECT OUTPUT LOCATION (Production Mode)\n\n"
+            "Choose where to save your FINAL PDF file.\n"
+            "This file will contain ONLY the data (no background).\n"
+            "Print this on pre-printed IRS 1099-NEC forms.\n\n"
+            f"Suggested filename:  {default_filename}\n\n"
+            "Click OK to choose location..."
+        )
+    
+    step_number = "5" if USE_BACKGROUND_IMAGE else "4"
+    show_large_message(
+        f"Step {step_number}: Select Output Location",
+        message_text
+    )
+    
+    root = tk.Tk()
+    root.withdraw()
+    
+    file_path = filedialog.asksaveasfilename(
+        title="Save PDF Output As",
+        defaultextension=".pdf",
+        initialfile=default_filename,
+        filetypes=[
+            ("PDF files", "*.pdf"),
+            ("All files", "*.*")
+        ],
+        initialdir=os.path.expanduser("~")
+    )
+    
+    root.destroy()
+    
+    if not file_path:
+        messagebox.showerror("Error", "No output location selected.Exiting.")
+        exit()
+    
+    return file_path
+
+# ============================================================================
+# ROW SELECTION FUNCTIONS
+# ============================================================================
+
+def select_all_or_some():
+    """Ask user if they want to process all rows or specific rows"""
+    import tkinter as tk
+    from tkinter import messagebox
+    
+    root = tk.Tk()
+    root.withdraw()
+    
+    result = messagebox.askyesno(
+        "Row Selection",
+        "📋 PROCESS ALL RECIPIENTS OR SELECT SPECIFIC ROWS?\n\n"
+        "• Click YES to process ALL rows from the CSV file\n"
+        "• Click NO to select SPECIFIC rows only\n\n"
+        "Example use case for 'NO':\n"
+        "  - You need to reprint forms for specific recipients\n"
+        "  - You want to test with just a few entries\n"
+        "  - You discovered missing data for certain rows\n\n"
+        "Process ALL recipients?"
+    )
+    
+    root.destroy()
+    return result
+
+def get_row_numbers(total_rows):
+    """Prompt user to enter specific row numbers"""
+    import tkinter as tk
+    from tkinter import messagebox
+    
+    # Show instructions first
+    instructions_msg = (
+        f"📋 YOUR CSV FILE HAS {total_rows} DATA ROWS\n\n"
+        "In the next dialog, enter the row numbers you want to process:\n\n"
+        "EXAMPLES:\n"
+        "  • Single rows:          1,3,5,7\n"
+        "  • Range of rows:     1-5\n"
+        "  • Mixed format:      1,3,5-10,15,20-25\n"
+        "  • Just one row:      7\n\n"
+        "NOTES:\n"
+        "  • Row 1 = first data row (after the header)\n"
+        "  • Separate with commas\n"
+        "  • Use hyphens for ranges\n"
+        "  • Spaces are ignored\n\n"
+        "Click OK to continue..."
+    )
+    
+    messagebox.showinfo("Enter Row Numbers", instructions_msg)
+    
+    # Create visible root window for input
+    root = tk.Tk()
+    root.title("Enter Row Numbers")
+    
+    # Center and size the window - MADE LARGER
+    window_width = 600
+    window_height = 300
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+    x = (screen_width // 2) - (window_width // 2)
+    y = (screen_height // 2) - (window_height // 2)
+    root.geometry(f'{window_width}x{window_height}+{x}+{y}')
+    
+    # Make it topmost
+    root.attributes('-topmost', True)
+    root.lift()
+    root.focus_force()
+    
+    # Create frame with more padding
+    main_frame = tk.Frame(root, padx=30, pady=25)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+    
+    # Label
+    label = tk.Label(
+        main_frame,
+        text=f"Enter row numbers to process\n(CSV has {total_rows} rows):",
+        font=("Arial", 12, "bold"),
+        justify=tk.LEFT
+    )
+    label.pack(pady=(0, 15))
+    
+    # Entry
+    entry_var = tk.StringVar()
+    entry = tk.Entry(main_frame, textvariable=entry_var, font=("Arial", 13), width=50)
+    entry.pack(pady=15, fill=tk.X, ipady=5)  # Added ipady for taller entry
+    entry.focus_set()
+    
+    # Example label
+    example_label = tk.Label(
+        main_frame,
+        text="Examples:  1,3,5  or  1-5  or  1,3,5-10,15",
+        font=("Arial", 10),
+        fg="gray"
+    )
+    example_label.pack(pady=(0, 20))
+    
+    # Result storage
+    result = {"value": None, "cancelled": False}
+    
+    def on_ok(event=None):
+        result["value"] = entry_var.get()
+        root.destroy()
+    
+    def on_cancel(event=None):
+        result["cancelled"] = True
+        root.destroy()
+    
+    # Buttons frame with more space
+    button_frame = tk.Frame(main_frame)
+    button_frame.pack(pady=20)
+    
+    # Create OK button using Frame (works better on Windows)
+    ok_frame = tk.Frame(
+        button_frame,
+        bg="#4CAF50",
+        relief=tk.RAISED,
+        borderwidth=3
+    )
+    ok_frame.pack(side=tk.LEFT, padx=25)
+    
+    ok_label = tk.Label(
+        ok_frame,
+        text="OK",
+        font=("Arial", 16, "bold"),
+        bg="#4CAF50",
+        fg="white",
+        width=12,
+        height=3,
+        cursor="hand2"
+    )
+    ok_label.pack(padx=5, pady=5)
+    ok_label.bind("<Button-1>", on_ok)
+    ok_frame.bind("<Button-1>", on_ok)
+    
+    # Create Cancel button using Frame
+    cancel_frame = tk.Frame(
+        button_frame,
+        bg="#E0E0E0",
+        relief=tk.RAISED,
+        borderwidth=3
+    )
+    cancel_frame.pack(side=tk.LEFT, padx=25)
+    
+    cancel_label = tk.Label(
+        cancel_frame,
+        text="Cancel",
+        font=("Arial", 16),
+        bg="#E0E0E0",
+        fg="black",
+        width=12,
+        height=3,
+        cursor="hand2"
+    )
+    cancel_label.pack(padx=5, pady=5)
+    cancel_label.bind("<Button-1>", on_cancel)
+    cancel_frame.bind("<Button-1>", on_cancel)
+    
+    # Bind Enter key
+    entry.bind('<Return>', on_ok)
+    entry.bind('<KP_Enter>', on_ok)  # Numeric keypad Enter
+    
+    # Keep window on top initially
+    root.after(200, lambda: root.attributes('-topmost', False))
+    
+    # Wait for window
+    root.mainloop()
+    
+    if result["cancelled"]:
+        return None
+    
+    return result["value"]
+
+def parse_row_spec(row_string, total_rows):
+    """
+    Parse row number string into a list of row indices
+    Supports:  "1,3,5", "1-5", "1,3,5-10,15"
+    Returns sorted list of 0-based indices (None for an empty string)
+    Raises ValueError on invalid input
+    """
+    if not row_string or not row_string.strip():
+        return None
+    
+    row_indices = set()
+    
+    # Remove spaces
+    row_string = row_string.replace(' ', '')
+    
+    # Split by comma
+    parts = row_string.split(',')
+    
+    for part in parts: 
+        if '-' in part:
+            # Range
+            start, end = part.split('-')
+            start = int(start)
+            end = int(end)
+            
+            if start < 1 or end > total_rows:
+                raise ValueError(f"Row numbers must be between 1 and {total_rows}")
+            if start > end:
+                raise ValueError(f"Invalid range: {part} (start must be <= end)")
+            
+            # Add range (convert to 0-based)
+            for i in range(start - 1, end):
+                row_indices.add(i)
+        else:
+            # Single number
+            num = int(part)
+            if num < 1 or num > total_rows:
+                raise ValueError(f"Row number {num} is out of range (1-{total_rows})")
+            row_indices.add(num - 1)  # Convert to 0-based
+    
+    # Convert to sorted list
+    return sorted(row_indices)
+
+def format_row_spec(row_indices):
+    """
+    Format sorted 0-based row indices as 1-based row numbers in the same
+    syntax parse_row_spec reads, e.g. [0, 1, 2, 4] -> "1-3,5"
+    """
+    parts = []
+    start = previous = None
+    for index in row_indices:
+        if start is not None and index == previous + 1:
+            previous = index
+            continue
+        if start is not None:
+            parts.append(f"{start + 1}-{previous + 1}" if previous > start else f"{start + 1}")
+        start = previous = index
+    if start is not None:
+        parts.append(f"{start + 1}-{previous + 1}" if previous > start else f"{start + 1}")
+    return ','.join(parts)
+
+def parse_row_numbers(row_string, total_rows):
+    """
+    Parse row number string into a list of 0-based row indices
+    Shows an error dialog and returns None on invalid input
+    """
+    try:
+        return parse_row_spec(row_string, total_rows)
+    except ValueError as e:
+        from tkinter import messagebox
+        
+        messagebox.showerror(
+            "Invalid Input",
+            f"❌ ERROR PARSING ROW NUMBERS\n\n{str(e)}\n\nPlease try again."
+        )
+        return None
+
+def confirm_selected_rows(row_indices):
+    """Show which row numbers will be processed"""
+    from tkinter import messagebox
+    
+    row_numbers_display = ', '.join([str(i+1) for i in row_indices[: 10]])
+    if len(row_indices) > 10:
+        row_numbers_display += f", ... ({len(row_indices)} total)"
+    
+    messagebox.showinfo(
+        "Row Selection Confirmed",
+        f"✅ SELECTED ROWS CONFIRMED\n\n"
+        f"Processing {len(row_indices)} recipient(s)\n"
+        f"Row numbers: {row_numbers_display}\n\n"
+        f"Click OK to continue..."
+    )
+
+# ============================================================================
+# RECIPIENT STREAM FUNCTIONS
+# ============================================================================
+
+def count_csv_rows(csv_file):
+    """Count data rows (excluding the header) without keeping them in memory"""
+    with open(csv_file, 'r') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # Skip header
+        return sum(1 for row in reader if row)  # Blank lines are not rows
+
+def read_recipients(csv_file):
+    """
+    Yield (row_index, record) for each data row, one at a time
+    record is a tuple of the RECORD_COLUMNS values, picked by column position
+    """
+    with open(csv_file, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        
+        # Columns missing from the file read as '' (Tax Year defaults to this year)
+        width = len(header)
+        header_positions = {name: i for i, name in enumerate(header)}
+        missing = [name for name in RECORD_COLUMNS if name not in header_positions]
+        for i, name in enumerate(missing):
+            header_positions[name] = width + i
+        padding = [str(datetime.now().year) if name == 'Tax Year' else '' for name in missing]
+        pick = itemgetter(*[header_positions[name] for name in RECORD_COLUMNS])
+        
+        row_index = 0
+        for fields in reader:
+            if not fields:
+                continue  # Skip blank lines (same as csv.DictReader)
+            if len(fields) < width:
+                fields += [''] * (width - len(fields))
+            if padding:
+                fields = fields[:width] + padding
+            yield row_index, pick(fields)
+            row_index += 1
+
+def select_rows(rows, row_indices=None):
+    """Yield only the (row_index, record) rows whose 0-based index is in row_indices"""
+    if row_indices is None:
+        yield from rows
+        return
+    
+    wanted = set(row_indices)
+    if not wanted:
+        return
+    last_index = max(wanted)
+    
+    for row_index, record in rows:
+        if row_index in wanted:
+            yield row_index, record
+        if row_index >= last_index:
+            break  # No need to read the rest of the file
+
+def chunked(items, size):
+    """Yield lists of up to size items"""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+def group_pages(recipients, per_page=3, break_slot=None):
+    """
+    Yield lists of up to per_page recipients (one list per PDF page)
+    With break_slot, a page also ends whenever that value changes between
+    recipients (SLOT_PAYER_TIN keeps each page to a single payer)
+    """
+    if break_slot is None:
+        return chunked(recipients, per_page)
+    return group_pages_by_value(recipients, per_page, break_slot)
+
+def group_pages_by_value(recipients, per_page, slot):
+    page = []
+    for values in recipients:
+        if page and (len(page) == per_page or values[slot] != page[0][slot]):
+            yield page
+            page = []
+        page.append(values)
+    if page:
+        yield page
+
+# ============================================================================
+# MULTI-FILE JOB FUNCTIONS
+# ============================================================================
+
+# Payer, then recipient (name and TIN as printed)
+recipient_sort_key = itemgetter(SLOT_PAYER_1, SLOT_PAYER_TIN, SLOT_RECIPIENT_1, SLOT_RECIPIENT_TIN)
+
+def job_csv_files(path_or_glob):
+    """The Publication 1220 CSVs of a job: every .csv in a directory, or the files matching a glob"""
+    import glob
+    
+    if os.path.isdir(path_or_glob):
+        path_or_glob = os.path.join(path_or_glob, "*.csv")
+    return sorted(path for path in glob.glob(path_or_glob) if os.path.isfile(path))
+
+def sorted_recipients(csv_file, row_indices=None):
+    """One file's normalized recipients in payer, then recipient order (file order for ties)"""
+    recipients = normalize_records(select_rows(read_recipients(csv_file), row_indices))
+    return iter(sorted(recipients, key=recipient_sort_key))
+
+def merge_sorted_recipients(csv_files):
+    """
+    Normalized recipients of several files in one payer, then recipient order
+    Each file is sorted on its own, then the sorted streams are merged
+    """
+    return heapq.merge(*[sorted_recipients(csv_file) for csv_file in csv_files], key=recipient_sort_key)
+
+# ============================================================================
+# TEXT WIDTH FUNCTIONS
+# ============================================================================
+
+# Per-glyph advance widths (1000 units per em) for each font, built on first use
+GLYPH_ADVANCES = {}
+
+def glyph_advances(font_name):
+    """Return the advance-width table for printable ASCII in font_name"""
+    advances = GLYPH_ADVANCES.get(font_name)
+    if advances is None:
+        from reportlab.pdfbase import pdfmetrics
+        advances = {chr(code): pdfmetrics.stringWidth(chr(code), font_name, 1000)
+                    for code in range(32, 127)}
+        GLYPH_ADVANCES[font_name] = advances
+    return advances
+
+@lru_cache(maxsize=TEXT_WIDTH_CACHE_SIZE)
+def text_width(text, font_name, font_size):
+    """Width of text in points (same result as canvas.stringWidth, cached per string)"""
+    advances = glyph_advances(font_name)
+    try:
+        return sum([advances[ch] for ch in text]) * 0.001 * font_size
+    except KeyError:
+        # Character outside the table (e.g. accented names) - let reportlab measure it
+        from reportlab.pdfbase import pdfmetrics
+        return pdfmetrics.stringWidth(text, font_name, font_size)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def format_currency(amount):
+    """Format currency with commas and 2 decimal places"""
+    if not amount or amount == '0' or amount == '0.00': 
+        return ''
+    try:
+        return f"{float(amount):,.2f}"
+    except:
+        return amount
+
+def format_tin(tin):
+    """Format TIN as XX-XXXXXXX"""
+    tin = str(tin).replace('-', '').replace(' ', '')
+    if len(tin) == 9:
+        return f"{tin[: 2]}-{tin[2:]}"
+    return tin
+
+def compose_name(business_name, first_name, middle_name, last_name, suffix):
+    """Compose a payer/recipient name from IRS CSV fields (handles both business and individual)"""
+    # Check for business name first
+    business_name = business_name.strip()
+    if business_name:
+        return business_name
+    
+    # Otherwise construct from first/last name
+    name_parts = [first_name.strip(), middle_name.strip(), last_name.strip(), suffix.strip()]
+    return ' '.join([part for part in name_parts if part])
+
+def form_field_extractor():
+    """The "Extract Form Field Coordinates.py" module (loaded by path - its name has spaces)"""
+    import importlib.util
+    
+    spec = importlib.util.spec_from_file_location("extract_form_field_coordinates", EXTRACTOR_SCRIPT)
+    extractor = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(extractor)
+    return extractor
+
+def read_layout_file(path):
+    """
+    Parsed layout from a field positions JSON, or from a fillable PDF via the
+    extractor's layout cache (keyed by the PDF's SHA-256; extracted once on a miss)
+    """
+    if path.lower().endswith('.pdf'):
+        return form_field_extractor().cached_layout(path)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def load_master_fields(json_file):
+    """Load field positions from JSON (or a fillable PDF) and derive the BOX 5a, 6a, 7a positions"""
+    field_positions = read_layout_file(json_file)
+    master_fields = field_positions['fields']
+    
+    # Calculate 5a, 6a, 7a positions
+    for box in ('BOX 5', 'BOX 6', 'BOX 7'):
+        if box in master_fields:
+            master_fields[box + 'a'] = {
+                'x': master_fields[box]['x'],
+                'y': master_fields[box]['y'] - HALF_LINE_OFFSET
+            }
+    
+    return master_fields
+
+def compile_layout(master_fields):
+    """
+    Compile field positions into a flat, immutable plan (built once per run)
+    Returns one tuple of FieldPlacement per section with the section offset,
+    address line spacing and alignment already applied
+    """
+    for field_name in dict.fromkeys(name for name, _ in LAYOUT_SLOTS):
+        if field_name not in master_fields and field_name not in MULTILINE_FIELDS:
+            print(f"⚠️ Field '{field_name}' not found in master template")
+    
+    layout_plan = []
+    for y_offset in SECTION_Y_OFFSETS:
+        section_plan = []
+        for slot, (field_name, line_num) in enumerate(LAYOUT_SLOTS):
+            if field_name not in master_fields:
+                continue
+            pos = master_fields[field_name]
+            section_plan.append(FieldPlacement(
+                slot,
+                float(pos['x']),
+                float(pos['y'] + y_offset - (line_num * LINE_HEIGHT)),
+                field_name in RIGHT_ALIGNED_FIELDS,
+                FONT_NAME,
+                float(FONT_SIZE)  # (floats throughout, so a compiled layout loads back equal)
+            ))
+        layout_plan.append(tuple(section_plan))
+    
+    return tuple(layout_plan)
+
+def layout_records(layout_plan, master_fields=None):
+    """
+    Compiled layout records, section by section: (slot, section, right_aligned, font,
+    x, y, width, height, size); width and height come from the field (0 if not given)
+    """
+    master_fields = master_fields or {}
+    for section_num, section_plan in enumerate(layout_plan):
+        for placement in section_plan:
+            field = master_fields.get(LAYOUT_SLOTS[placement.slot][0], {})
+            yield (placement.slot, section_num, placement.right_aligned, placement.font.encode('ascii'),
+                   placement.x, placement.y, float(field.get('width', 0)), float(field.get('height', 0)),
+                   placement.size)
+
+def write_compiled_layout(path, layout_plan, master_fields=None):
+    """Save a layout plan as a compiled layout file (replaced atomically)"""
+    records = list(layout_records(layout_plan, master_fields))
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as out:
+        out.write(COMPILED_LAYOUT_HEADER.pack(COMPILED_LAYOUT_MAGIC, COMPILED_LAYOUT_VERSION,
+                                              len(layout_plan), len(records)))
+        for record in records:
+            out.write(COMPILED_LAYOUT_RECORD.pack(*record))
+    os.replace(temp_path, path)
+
+def load_compiled_layout(path):
+    """
+    Read a compiled layout file back into a layout plan
+    The file is memory-mapped and the records unpacked straight from the mapping
+    """
+    import mmap
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            if len(view) < COMPILED_LAYOUT_HEADER.size:
+                raise ValueError(f"Not a compiled layout: {path}")
+            magic, version, sections, count = COMPILED_LAYOUT_HEADER.unpack_from(view)
+            if magic != COMPILED_LAYOUT_MAGIC or version != COMPILED_LAYOUT_VERSION:
+                raise ValueError(f"Not a compiled layout (version {COMPILED_LAYOUT_VERSION}): {path}")
+            end = COMPILED_LAYOUT_HEADER.size + count * COMPILED_LAYOUT_RECORD.size
+            if len(view) < end:
+                raise ValueError(f"Compiled layout is truncated: {path}")
+            
+            layout_plan = [[] for _ in range(sections)]
+            with view[COMPILED_LAYOUT_HEADER.size:end] as records:
+                for slot, section_num, right_aligned, font, x, y, _, _, size in \
+                        COMPILED_LAYOUT_RECORD.iter_unpack(records):
+                    layout_plan[section_num].append(FieldPlacement(
+                        slot, x, y, right_aligned, font.rstrip(b'\0').decode('ascii'), size
+                    ))
+    return tuple(tuple(section_plan) for section_plan in layout_plan)
+
+def load_layout_plan(layout_file):
+    """
+    (master fields, LAYOUT_PLAN) for a layout JSON or fillable PDF, or
+    (None, LAYOUT_PLAN) for a compiled layout file
+    """
+    if layout_file.lower().endswith(COMPILED_LAYOUT_SUFFIX):
+        return None, load_compiled_layout(layout_file)
+    master_fields = load_master_fields(layout_file)
+    return master_fields, compile_layout(master_fields)
+
+def split_payer_block(layout_plan):
+    """Split a layout plan into a PayerBlockPlan"""
+    payer = [tuple(p for p in section_plan if p.slot in PAYER_SLOTS) for section_plan in layout_plan]
+    others = tuple(tuple(p for p in section_plan if p.slot not in PAYER_SLOTS) for section_plan in layout_plan)
+    
+    base = payer[0]
+    offsets = []
+    for section_payer in payer:
+        if not base or len(section_payer) != len(base):
+            return PayerBlockPlan(base, None, others)
+        dx, dy = section_payer[0].x - base[0].x, section_payer[0].y - base[0].y
+        if any(p._replace(x=p.x - dx, y=p.y - dy) != b for p, b in zip(section_payer, base)):
+            return PayerBlockPlan(base, None, others)
+        offsets.append((dx, dy))
+    return PayerBlockPlan(base, tuple(offsets), others)
+
+# (LAYOUT_PLAN the payer block was split from, PayerBlockPlan)
+PAYER_BLOCK = (None, None)
+
+def payer_block_plan():
+    """The PayerBlockPlan for the current LAYOUT_PLAN (split again only when the layout changes)"""
+    global PAYER_BLOCK
+    layout_plan, block = PAYER_BLOCK
+    if layout_plan is not LAYOUT_PLAN:
+        block = split_payer_block(LAYOUT_PLAN)
+        PAYER_BLOCK = (LAYOUT_PLAN, block)
+    return block
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def payer_form_name(payer_values):
+    """Form name for one payer's block (derived from its values, so it is stable across runs)"""
+    return "Payer" + hashlib.sha256(repr(payer_values).encode()).hexdigest()[:16]
+
+def draw_payer_block(c, block, section_num, values):
+    """
+    Place the payer block for section_num, defining the payer's form on this
+    canvas the first time the payer appears
+    """
+    form_name = payer_form_name(tuple(values[slot] for slot in PAYER_SLOTS))
+    if not c.hasForm(form_name):
+        c.beginForm(form_name)
+        c.setFont(FONT_NAME, FONT_SIZE)
+        draw_section(c, block.placements, values)
+        c.endForm()
+    
+    dx, dy = block.offsets[section_num]
+    if dx or dy:
+        c.saveState()
+        c.translate(dx, dy)
+        c.doForm(form_name)
+        c.restoreState()
+    else:
+        c.doForm(form_name)
+
+def draw_section(c, section_plan, values):
+    """Draw one recipient's values using a compiled section plan"""
+    for slot, x, y, right_aligned, font, size in section_plan:
+        text = values[slot]
+        if not text:
+            continue
+        if right_aligned:
+            x = x - text_width(text, font, size)
+        c.drawString(x, y, text)
+
+def format_address_lines(name, address, city, state, zip_code):
+    """Format address into lines"""
+    lines = []
+    if name:
+        lines.append(name)
+    if address:
+        lines.append(address)
+    
+    city_state_zip = []
+    if city:
+        city_state_zip.append(city)
+    if state:
+        city_state_zip.append(state)
+    if zip_code:
+        city_state_zip.append(zip_code)
+    
+    if city_state_zip:
+        lines.append(' '.join(city_state_zip))
+    
+    return lines
+
+def printable(text):
+    """Return text as a string, or '' when there is nothing to print"""
+    if not text or str(text).strip() == '':
+        return ''
+    return str(text)
+
+def padded_lines(lines, count=3):
+    """Strip address lines and pad to a fixed number of lines"""
+    lines = [line.strip() if line else '' for line in lines[:count]]
+    return lines + [''] * (count - len(lines))
+
+# ============================================================================
+# COLUMN NORMALIZATION FUNCTIONS
+# ============================================================================
+
+# Cached per-value formatters: payer fields, amounts and states repeat across
+# rows, so each distinct value is formatted once
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def currency_text(amount):
+    """Printable currency amount"""
+    return printable(format_currency(amount))
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def tin_text(tin):
+    """Printable dashed TIN"""
+    return printable(format_tin(tin))
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def name_text(business_name, first_name, middle_name, last_name, suffix):
+    """Composed payer/recipient name"""
+    return compose_name(business_name, first_name, middle_name, last_name, suffix)
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def address_block(name, address, city, state, zip_code):
+    """Name, address and city/state/ZIP as exactly 3 printable lines"""
+    return tuple(padded_lines(format_address_lines(name, address, city, state, zip_code)))
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def checkbox_text(value):
+    """BOX 2 - 'X' when the direct sales checkbox is set"""
+    return 'X' if value and value.strip().upper() in ['YES', 'Y', 'X', 'TRUE', '1'] else ''
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def state_number_text(state, payer_state_no):
+    """BOX 6/6a - State/Payer's state no."""
+    return printable(f"{state}/{payer_state_no}" if state and payer_state_no else (state or payer_state_no))
+
+def normalize_batch(rows):
+    """
+    Normalize a batch of (row_index, record) rows column by column
+    Each formatter runs once over a whole column; the result is a RecordBatch
+    whose columns line up with the value slots
+    """
+    started = perf_counter()
+    row_numbers, records = zip(*rows)
+    col = dict(zip(RECORD_COLUMNS, zip(*records)))
+    
+    # PAYER INFORMATION
+    payer_names = map(name_text,
+                      col['Payer Business or Entity Name Line 1'], col['Payer First Name'],
+                      col['Payer Middle Name'], col['Payer Last Name (Surname)'], col['Payer Suffix'])
+    payer_lines = zip(*map(address_block, payer_names,
+                           col['Payer Address Line 1'], col['Payer City/Town'],
+                           col['Payer State/Province/Territory'], col['Payer ZIP/Postal Code']))
+    
+    # RECIPIENT INFORMATION
+    recipient_names = map(name_text,
+                          col['Recipient Business or Entity Name Line 1'], col['Recipient First Name'],
+                          col['Recipient Middle Name'], col['Recipient Last Name (Surname)'], col['Recipient Suffix'])
+    recipient_lines = zip(*map(address_block, recipient_names,
+                               col['Recipient Address Line 1'], col['Recipient City/Town'],
+                               col['Recipient State/Province/Territory'], col['Recipient ZIP/Postal Code']))
+    composed = perf_counter()
+    
+    columns = (
+        *payer_lines,
+        tuple(map(tin_text, col['Payer Taxpayer ID Number'])),
+        *recipient_lines,
+        tuple(map(tin_text, col['Recipient Taxpayer ID Number'])),
+        tuple(map(printable, col['Form Account Number'])),
+        tuple(map(printable, col['Tax Year'])),
+        tuple(map(currency_text, col['Box 1 - Nonemployee Compensation'])),
+        tuple(map(checkbox_text, col['Box 2 - Payer made direct sales totaling $5,000 or more of consumer products to a recipient for resale'])),
+        tuple(map(currency_text, col['Box 3 - Excess golden parachute payments'])),
+        tuple(map(currency_text, col['Box 4 - Federal income tax withheld'])),
+        tuple(map(currency_text, col['State 1 - State tax withheld'])),
+        tuple(map(currency_text, col['State 2 - State tax withheld'])),
+        tuple(map(state_number_text, col['State 1'], col['State 1 - State/Payer state number'])),
+        tuple(map(state_number_text, col['State 2'], col['State 2 - State/Payer state number'])),
+        tuple(map(currency_text, col['State 1 - State income'])),
+        tuple(map(currency_text, col['State 2 - State income'])),
+    )
+    
+    if STAGE_SAMPLES is not None:
+        add_stage_sample('compose', composed - started)
+        add_stage_sample('format', perf_counter() - composed)
+    
+    return RecordBatch(row_numbers, columns)
+
+def normalize_records(rows, batch_rows=NORMALIZE_BATCH_ROWS):
+    """
+    Normalize (row_index, record) rows a batch at a time
+    Yields each recipient's printable values in slot order, followed by its row number
+    """
+    started = perf_counter()
+    for batch_rows_list in chunked(rows, batch_rows):
+        if STAGE_SAMPLES is not None:
+            add_stage_sample('csv_parse', perf_counter() - started)
+        batch = normalize_batch(batch_rows_list)
+        yield from zip(*batch.columns, batch.row_numbers)
+        started = perf_counter()
+
+# ============================================================================
+# PAGE RENDERING FUNCTIONS
+# ============================================================================
+
+def new_canvas(pdf_path, profile=OUTPUT_PROFILES['standard']):
+    """Open a letter-size canvas set up for the output profile (reportlab is imported on first use)"""
+    from reportlab.pdfgen import canvas
+    
+    options = {}
+    if profile.page_compression is not None:
+        options['pageCompression'] = profile.page_compression
+    if profile.invariant is not None:
+        options['invariant'] = profile.invariant
+    if profile.initial_font:
+        options['initialFontName'] = FONT_NAME
+        options['initialFontSize'] = FONT_SIZE
+    return canvas.Canvas(pdf_path, pagesize=PAGE_SIZE, **options)
+
+def background_proof_path(background_image_path):
+    """Cache file for this background's proof under the current offsets, stretch and DPI"""
+    h = hashlib.sha256(file_digest(background_image_path).encode())
+    h.update(repr((
+        BACKGROUND_IMAGE_X_OFFSET, BACKGROUND_IMAGE_Y_OFFSET,
+        BACKGROUND_IMAGE_WIDTH_STRETCH, BACKGROUND_IMAGE_HEIGHT_STRETCH,
+        PAGE_SIZE, BACKGROUND_PROOF_DPI, BACKGROUND_PROOF_QUALITY,
+    )).encode())
+    return os.path.join(BACKGROUND_PROOF_CACHE_DIR, h.hexdigest() + ".jpg")
+
+def background_proof(background_image_path):
+    """
+    Proof copy of the dev background: flattened onto white, grayscale, scaled down
+    to BACKGROUND_PROOF_DPI at its drawn size and saved as JPEG (reportlab embeds a
+    JPEG as is, so there is nothing to re-encode and no alpha mask to build)
+    Built on the first run, read from the cache after that; returns its path
+    """
+    proof_path = background_proof_path(background_image_path)
+    if os.path.exists(proof_path):
+        return proof_path
+    
+    from PIL import Image
+    import tempfile
+    
+    width = round((PAGE_SIZE[0] + BACKGROUND_IMAGE_WIDTH_STRETCH) / 72 * BACKGROUND_PROOF_DPI)
+    height = round((PAGE_SIZE[1] + BACKGROUND_IMAGE_HEIGHT_STRETCH) / 72 * BACKGROUND_PROOF_DPI)
+    with Image.open(background_image_path) as image:
+        if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+            image = image.convert('RGBA')
+            flattened = Image.new('RGBA', image.size, 'white')
+            flattened.alpha_composite(image)
+            image = flattened
+        proof = image.convert('L')
+    if proof.width > width or proof.height > height:  # (never scaled up)
+        proof = proof.resize((min(width, proof.width), min(height, proof.height)), Image.LANCZOS)
+    
+    os.makedirs(BACKGROUND_PROOF_CACHE_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=BACKGROUND_PROOF_CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            proof.save(out, 'JPEG', quality=BACKGROUND_PROOF_QUALITY, dpi=(BACKGROUND_PROOF_DPI,) * 2)
+        os.replace(temp_path, proof_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return proof_path
+
+def define_background_form(c, background_image_path=None):
+    """
+    Define the background image once per PDF as a reusable form XObject
+    (dev mode only); every page then references it instead of drawing the image
+    """
+    if not (USE_BACKGROUND_IMAGE and background_image_path and os.path.exists(background_image_path)):
+        return
+    
+    # A JPEG (e.g. the background proof) is opaque - no alpha mask to look for
+    opaque = background_image_path.lower().endswith(('.jpg', '.jpeg'))
+    
+    c.beginForm(BACKGROUND_FORM_NAME)
+    c.drawImage(background_image_path, 
+               BACKGROUND_IMAGE_X_OFFSET, 
+               BACKGROUND_IMAGE_Y_OFFSET, 
+               width=PAGE_SIZE[0] + BACKGROUND_IMAGE_WIDTH_STRETCH, 
+               height=PAGE_SIZE[1] + BACKGROUND_IMAGE_HEIGHT_STRETCH, 
+               preserveAspectRatio=False, 
+               mask=None if opaque else 'auto')
+    c.endForm()
+
+def draw_page(c, page_recipients):
+    """Draw up to 3 recipient sections (one page) on the canvas"""
+    started = perf_counter()
+    
+    # Set font for THIS page (must be done after showPage())
+    c.setFont(FONT_NAME, FONT_SIZE)
+
+    # Draw background FIRST if enabled (defined once per PDF)
+    if c.hasForm(BACKGROUND_FORM_NAME):
+        c.doForm(BACKGROUND_FORM_NAME)
+    
+    # Fill each section (payer block from its form, then the recipient's own fields)
+    block = payer_block_plan()
+    for section_num, values in enumerate(page_recipients):
+        if block.offsets is None:
+            draw_section(c, LAYOUT_PLAN[section_num], values)
+            continue
+        draw_payer_block(c, block, section_num, values)
+        draw_section(c, block.others[section_num], values)
+    
+    if STAGE_SAMPLES is not None:
+        add_stage_sample('draw', perf_counter() - started)
+
+def finish_page(c):
+    """End the current page"""
+    started = perf_counter()
+    c.showPage()
+    if STAGE_SAMPLES is not None:
+        add_stage_sample('show_page', perf_counter() - started)
+
+def save_canvas(c):
+    """Write the canvas out to its PDF"""
+    started = perf_counter()
+    c.save()
+    if STAGE_SAMPLES is not None:
+        add_stage_sample('save', perf_counter() - started)
+
+def render_pages(c, pages, progress=None):
+    """
+    Draw each page of recipients on the canvas, finishing every page with showPage()
+    Returns (recipients drawn, pages drawn)
+    """
+    total_recipients = 0
+    total_pages = 0
+    
+    for page_recipients in pages:
+        draw_page(c, page_recipients)
+        
+        # Finish page
+        finish_page(c)
+        
+        total_recipients += len(page_recipients)
+        total_pages += 1
+        if progress is not None:
+            progress.update(len(page_recipients), 1)
+    
+    return total_recipients, total_pages
+
+# ============================================================================
+# PDF OUTPUT FUNCTIONS
+# ============================================================================
+
+def multiply_matrix(m1, m2):
+    """Combine two PDF matrices (m1 is applied first, then m2)"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + b1 * c2, a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2, c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2, e1 * b2 + f1 * d2 + f2,
+    )
+
+def page_rotation_matrix(page):
+    """
+    Matrix that draws a page's content upright (applies its /Rotate)
+    Returns (matrix, (upright width, upright height))
+    """
+    llx, lly, urx, ury = [float(v) for v in page.mediabox]
+    width, height = urx - llx, ury - lly
+    rotation = int(page.get('/Rotate', 0)) % 360
+    
+    if rotation == 90:
+        matrix, size = (0, -1, 1, 0, 0, width), (height, width)
+    elif rotation == 180:
+        matrix, size = (-1, 0, 0, -1, width, height), (width, height)
+    elif rotation == 270:
+        matrix, size = (0, 1, -1, 0, height, 0), (height, width)
+    else:
+        matrix, size = (1, 0, 0, 1, 0, 0), (width, height)
+    
+    # Move the mediabox origin to (0, 0) first
+    return multiply_matrix((1, 0, 0, 1, -llx, -lly), matrix), size
+
+def add_template_form(writer, template_page):
+    """
+    Copy the blank form page into the output once, as a form XObject
+    Returns the indirect reference every stamped page points to
+    """
+    from PyPDF2.generic import ArrayObject, DecodedStreamObject, FloatObject, NameObject
+    
+    # Place the blank form exactly where the dev background image is drawn
+    rotation_matrix, (width, height) = page_rotation_matrix(template_page)
+    placement = (
+        (PAGE_SIZE[0] + BACKGROUND_IMAGE_WIDTH_STRETCH) / width, 0,
+        0, (PAGE_SIZE[1] + BACKGROUND_IMAGE_HEIGHT_STRETCH) / height,
+        BACKGROUND_IMAGE_X_OFFSET, BACKGROUND_IMAGE_Y_OFFSET,
+    )
+    matrix = multiply_matrix(rotation_matrix, placement)
+    
+    contents = template_page.get_contents()
+    form = DecodedStreamObject()
+    form.set_data(contents.get_data() if contents is not None else b'')
+    form = form.flate_encode()  # (returns a new stream object without the other keys)
+    form.update({
+        NameObject('/Type'): NameObject('/XObject'),
+        NameObject('/Subtype'): NameObject('/Form'),
+        NameObject('/BBox'): ArrayObject([FloatObject(v) for v in template_page.mediabox]),
+        NameObject('/Matrix'): ArrayObject([FloatObject(round(v, 6)) for v in matrix]),
+        NameObject('/Resources'): template_page['/Resources'].clone(writer),
+    })
+    return writer._add_object(form)
+
+def stamp_page(page, template_ref, prefix_ref):
+    """Draw the shared template form underneath a page's own content"""
+    from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject
+    
+    if '/Resources' not in page:
+        page[NameObject('/Resources')] = DictionaryObject()
+    resources = page['/Resources']
+    if '/XObject' not in resources:
+        resources[NameObject('/XObject')] = DictionaryObject()
+    resources['/XObject'][NameObject(TEMPLATE_FORM_NAME)] = template_ref
+    
+    # Prepend the shared "draw template" stream; the data content stays as-is
+    contents = page.raw_get('/Contents') if '/Contents' in page else None
+    if contents is None:
+        streams = []
+    elif isinstance(contents.get_object(), ArrayObject):
+        streams = list(contents.get_object())
+    else:
+        streams = [contents]
+    page[NameObject('/Contents')] = ArrayObject([prefix_ref] + streams)
+
+# PdfJoiner copies PDFs as raw bytes, so it relies on the shape of the files
+# reportlab's canvases (and PdfWriter) save. Each point is checked, and a PDF
+# that breaks one raises ValueError (PdfJoiner.append then rewrites it with
+# PdfWriter and tries again):
+#   1. one classic xref table - no xref or object streams, no /Prev update, no /Encrypt
+#   2. every object has generation 0 and starts where the xref table says
+#   3. every stream has a direct /Length
+#   4. one flat page tree: the catalog's /Pages lists every page in its /Kids
+#   5. stamping only: every page's /Resources (and /XObject, if any) is a direct dictionary
+# Strings and comments are skipped when reading syntax, so their bytes are never
+# taken for keywords or references (stream data is skipped by its /Length).
+PDF_OBJECT_HEADER = re.compile(rb'(\d+) (\d+) obj\s*')
+PDF_KEYWORD = re.compile(rb'(?<=[\s>\])])(?:endobj|stream)\b')
+PDF_LEXEME = re.compile(rb'[(<%]|(?<=[\s>\])])(?:endobj|stream)\b')
+PDF_STRING_LEXEME = re.compile(rb'\\.|[()]', re.DOTALL)
+PDF_EOL = re.compile(rb'[\r\n]')
+PDF_REFERENCE = re.compile(rb'(\d+) (\d+) R\b')
+PDF_STREAM_LENGTH = re.compile(rb'/Length\s+(\d+)(\s+\d+\s+R)?')
+
+def pdf_syntax_scan(data, pos=0, stop=True):
+    """
+    Walk PDF object syntax from pos, skipping literal strings, hex strings and comments
+    Returns (position of the first endobj/stream keyword outside them, [(start, end)
+    of each string and comment before it]); with stop=False all of data is walked
+    and the position is None
+    """
+    if stop:
+        keyword = PDF_KEYWORD.search(data, pos)
+        if keyword is None:
+            raise ValueError("Object has no endobj")
+        end = keyword.start()
+    else:
+        end = len(data)
+    text = data[pos:end]
+    if b'(' not in text and b'%' not in text and text.count(b'<') == 2 * text.count(b'<<'):
+        return (end if stop else None), []  # No strings or comments (the usual case)
+    
+    spans = []
+    while True:
+        lexeme = PDF_LEXEME.search(data, pos)
+        if lexeme is None:
+            if stop:
+                raise ValueError("Object has no endobj")
+            return None, spans
+        start = lexeme.start()
+        token = lexeme.group()
+        if token == b'(':
+            depth = 0
+            for char in PDF_STRING_LEXEME.finditer(data, start):
+                depth += {b'(': 1, b')': -1}.get(char.group(), 0)
+                if depth == 0:
+                    end = char.end()
+                    break
+            else:
+                raise ValueError("Unterminated string")
+        elif token == b'<':
+            if data.startswith(b'<<', start):
+                pos = start + 2
+                continue
+            end = data.find(b'>', start) + 1
+            if not end:
+                raise ValueError("Unterminated hex string")
+        elif token == b'%':
+            newline = PDF_EOL.search(data, start)
+            end = newline.start() if newline else len(data)
+        elif stop:
+            return start, spans
+        else:
+            pos = lexeme.end()
+            continue
+        spans.append((start, end))
+        pos = end
+
+def pdf_syntax_search(pattern, data):
+    """First match of pattern in data that isn't inside a string or comment (or None)"""
+    spans = pdf_syntax_scan(data, stop=False)[1]
+    for match in pattern.finditer(data):
+        if not any(start <= match.start() < end for start, end in spans):
+            return match
+    return None
+
+def read_pdf_objects(pdf_data):
+    """
+    Split a PDF into its objects without parsing them (assumptions 1-3 above)
+    Returns ({object number: (dictionary bytes, stream bytes or None)}, root number,
+    info number or None); raises ValueError for any other kind of PDF
+    """
+    startxref = pdf_data.rfind(b'startxref')
+    if startxref < 0:
+        raise ValueError("No startxref")
+    xref_pos = int(pdf_data[startxref + 9:startxref + 40].split()[0])
+    if not pdf_data.startswith(b'xref', xref_pos):
+        raise ValueError("Only classic xref tables are supported")
+    trailer_pos = pdf_data.find(b'trailer', xref_pos)
+    if trailer_pos < 0:
+        raise ValueError("No trailer")
+    trailer = pdf_data[trailer_pos:startxref]
+    if b'/Prev' in trailer or b'/Encrypt' in trailer:
+        raise ValueError("Incrementally updated and encrypted PDFs are not supported")
+    
+    offsets = {}
+    tokens = pdf_data[xref_pos + 4:trailer_pos].split()
+    i = 0
+    while i < len(tokens):
+        first, count = int(tokens[i]), int(tokens[i + 1])
+        entries = tokens[i + 2:i + 2 + count * 3]
+        if len(entries) != count * 3:
+            raise ValueError("Truncated xref table")
+        for n in range(count):
+            if entries[n * 3 + 2] == b'n':
+                offsets[first + n] = int(entries[n * 3])
+        i += 2 + count * 3
+    
+    objects = {}
+    for number, offset in offsets.items():
+        header = PDF_OBJECT_HEADER.match(pdf_data, offset)
+        if not header or int(header.group(1)) != number or header.group(2) != b'0':
+            raise ValueError(f"Bad xref entry for object {number}")
+        body = header.end()
+        end = pdf_syntax_scan(pdf_data, body)[0]
+        if not pdf_data.startswith(b'stream', end):
+            objects[number] = (pdf_data[body:end], None)
+            continue
+        data_start = PDF_EOL.search(pdf_data, end).start()
+        data_start += 2 if pdf_data.startswith(b'\r\n', data_start) else 1
+        head = pdf_data[body:data_start]
+        length = pdf_syntax_search(PDF_STREAM_LENGTH, head)
+        if length is None or length.group(2):
+            raise ValueError(f"Object {number} has no direct stream /Length")
+        data_end = data_start + int(length.group(1))
+        if not pdf_data[data_end:data_end + 11].lstrip().startswith(b'endstream'):
+            raise ValueError(f"Object {number} stream does not match its /Length")
+        objects[number] = (head, pdf_data[data_start:data_end])
+    
+    root = re.search(rb'/Root (\d+) 0 R', trailer)
+    info = re.search(rb'/Info (\d+) 0 R', trailer)
+    if root is None or int(root.group(1)) not in objects:
+        raise ValueError("No /Root in the trailer")
+    return objects, int(root.group(1)), int(info.group(1)) if info else None
+
+def read_page_tree(objects, root):
+    """(page tree object number, [page object numbers]) of a flat page tree (assumption 4)"""
+    pages = pdf_syntax_search(re.compile(rb'/Pages\s+(\d+)\s+0\s+R'), objects[root][0])
+    kids = pages and pdf_syntax_search(re.compile(rb'/Kids\s*\[([^\]]*)\]'), objects.get(int(pages.group(1)), (b'',))[0])
+    if kids is None:
+        raise ValueError("No page tree")
+    page_numbers = [int(ref.group(1)) for ref in PDF_REFERENCE.finditer(kids.group(1))]
+    page_type = re.compile(rb'/Type\s*/Page\b')
+    if not all(number in objects and pdf_syntax_search(page_type, objects[number][0])
+               for number in page_numbers):
+        raise ValueError("Nested page trees are not supported")
+    return int(pages.group(1)), page_numbers
+
+def rewrite_pdf(pdf_data):
+    """
+    The same pages saved again by PdfWriter, in the shape PdfJoiner reads: one
+    classic xref table, direct stream lengths, a flat page tree and every page's
+    (possibly inherited) resources copied in as a direct dictionary
+    """
+    import io
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import DictionaryObject, NameObject
+    
+    writer = PdfWriter()
+    for page in PdfReader(io.BytesIO(pdf_data)).pages:
+        page = writer.add_page(page)
+        resources = DictionaryObject(page['/Resources'] if '/Resources' in page else {})
+        if '/XObject' in resources:
+            resources[NameObject('/XObject')] = DictionaryObject(resources['/XObject'])
+        page[NameObject('/Resources')] = resources
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+class PdfJoiner:
+    """
+    Write one PDF from whole PDFs appended in order. Every object is copied byte
+    for byte (streams are never decoded or recompressed) with only its object
+    number and references rewritten; the page tree, catalog and xref table are
+    written once by close(). Nothing is re-parsed into PDF objects, so joining
+    costs about as much as copying the files.
+    A PDF outside the assumptions listed above read_pdf_objects (e.g. one saved
+    with object streams) is rewritten with PdfWriter first, at PyPDF2's speed.
+    With template_pdf, every page is stamped onto one shared copy of the blank
+    form (drawn underneath the page's own content, as splice_pages expects).
+    """
+    CATALOG, PAGES, INFO = 1, 2, 3
+    
+    def __init__(self, output_pdf, template_pdf=None):
+        self.file = open(output_pdf, 'wb')
+        self.position = 0
+        self.digest = hashlib.md5()
+        self.offsets = {}
+        self.next_number = self.INFO + 1
+        self.page_numbers = []
+        self.info = None
+        self.template = None
+        self.write(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+        if template_pdf:
+            self.template = self.append_template(template_pdf)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            os.remove(self.file.name)  # Never leave a PDF without its xref table behind
+    
+    def write(self, data):
+        self.file.write(data)
+        self.digest.update(data)
+        self.position += len(data)
+    
+    def write_object(self, number, head, stream=None):
+        self.offsets[number] = self.position
+        self.write(b"%d 0 obj\n" % number + head)
+        if stream is not None:
+            self.write(stream + b"\nendstream")
+        self.write(b"\nendobj\n")
+    
+    def number_objects(self, objects, skip):
+        """Output object numbers for every object except the skip numbers (claimed by write_objects)"""
+        copied = [number for number in objects if number not in skip]
+        return {number: self.next_number + i for i, number in enumerate(copied)}
+    
+    def write_objects(self, writes):
+        """Write planned (number, dictionary, stream) objects and claim their numbers"""
+        for number, head, stream in writes:
+            self.write_object(number, head, stream)
+            self.next_number = max(self.next_number, number + 1)
+    
+    def renumber(self, head, numbers):
+        """Rewrite every reference in head (outside strings and comments) through numbers"""
+        def replace(ref):
+            if int(ref.group(1)) not in numbers:
+                raise ValueError(f"Reference to a missing object {ref.group(1)}")
+            return b"%d 0 R" % numbers[int(ref.group(1))]
+        
+        parts = []
+        pos = 0
+        for start, end in pdf_syntax_scan(head, stop=False)[1] + [(len(head), len(head))]:
+            parts.append(PDF_REFERENCE.sub(replace, head[pos:start]))
+            parts.append(head[start:end])
+            pos = end
+        return b"".join(parts)
+    
+    def append_template(self, template_pdf):
+        """Add the blank form (as a form XObject) and the stream that draws it; returns their numbers"""
+        import io
+        from PyPDF2 import PdfReader, PdfWriter
+        from PyPDF2.generic import DecodedStreamObject
+        
+        writer = PdfWriter()
+        form_ref = add_template_form(writer, PdfReader(template_pdf).pages[OVERLAY_TEMPLATE_PAGE])
+        prefix = DecodedStreamObject()
+        prefix.set_data(f"q {TEMPLATE_FORM_NAME} Do Q\n".encode())
+        prefix_ref = writer._add_object(prefix)
+        carrier = io.BytesIO()
+        writer.write(carrier)
+        
+        objects, root, info = read_pdf_objects(carrier.getvalue())
+        pages = read_page_tree(objects, root)[0]
+        numbers = self.number_objects(objects, {root, info, pages})
+        self.write_objects([(new_number, self.renumber(objects[number][0], numbers), objects[number][1])
+                            for number, new_number in numbers.items()])
+        return numbers[form_ref.idnum], numbers[prefix_ref.idnum]
+    
+    def stamp(self, head):
+        """Page dictionary drawing the template first, then its own content (assumption 5)"""
+        form_number, prefix_number = self.template
+        contents = pdf_syntax_search(re.compile(rb'/Contents\s*(\[[^\]]*\]|\d+\s+0\s+R)'), head)
+        if contents is not None:
+            streams = contents.group(1).strip(b'[] ')
+            head = b"%s/Contents [ %d 0 R %s ]%s" % (head[:contents.start()], prefix_number, streams,
+                                                     head[contents.end():])
+        else:
+            opening = head.index(b'<<') + 2
+            head = b"%s\n/Contents [ %d 0 R ]%s" % (head[:opening], prefix_number, head[opening:])
+        
+        entry = b"%s %d 0 R" % (TEMPLATE_FORM_NAME.encode(), form_number)
+        xobjects = pdf_syntax_search(re.compile(rb'/XObject\b\s*(<<)?'), head)
+        if xobjects is not None:
+            if not xobjects.group(1):
+                raise ValueError("Page /XObject resources are not a direct dictionary")
+            return head[:xobjects.end()] + b"\n" + entry + head[xobjects.end():]
+        resources = pdf_syntax_search(re.compile(rb'/Resources\s*(<<)?'), head)
+        if resources is None or not resources.group(1):
+            raise ValueError("Page /Resources are not a direct dictionary")
+        return head[:resources.end()] + b"\n/XObject << " + entry + b" >>" + head[resources.end():]
+    
+    def plan_append(self, pdf_data):
+        """
+        Check one PDF and work out everything append writes, without writing
+        anything. Returns ([(number, dictionary, stream)], page numbers, info dictionary)
+        """
+        objects, root, info = read_pdf_objects(pdf_data)
+        pages, kids = read_page_tree(objects, root)
+        numbers = self.number_objects(objects, {root, info, pages})
+        numbers[pages] = self.PAGES  # Pages now hang off the joined page tree
+        
+        kid_numbers = set(kids)
+        writes = []
+        for number, new_number in numbers.items():
+            if number == pages:
+                continue
+            head, stream = objects[number]
+            head = self.renumber(head, numbers)
+            if number in kid_numbers and self.template is not None:
+                head = self.stamp(head)
+            writes.append((new_number, head, stream))
+        info_head = self.renumber(objects[info][0], numbers) if info in objects else None
+        return writes, [numbers[kid] for kid in kids], info_head
+    
+    def append(self, pdf_data):
+        """Append every page of one PDF (its bytes)"""
+        try:
+            writes, page_numbers, info = self.plan_append(pdf_data)
+        except ValueError:
+            writes, page_numbers, info = self.plan_append(rewrite_pdf(pdf_data))
+        self.write_objects(writes)
+        self.page_numbers += page_numbers
+        if self.info is None:
+            self.info = info
+    
+    def close(self):
+        """Write the page tree, catalog, info, xref table and trailer"""
+        self.write_object(self.CATALOG, b"<<\n/PageMode /UseNone /Pages %d 0 R /Type /Catalog\n>>" % self.PAGES)
+        kids = b" ".join(b"%d 0 R" % number for number in self.page_numbers)
+        self.write_object(self.PAGES, b"<<\n/Count %d /Kids [ %s ] /Type /Pages\n>>" % (len(self.page_numbers), kids))
+        self.write_object(self.INFO, self.info or b"<<\n>>")
+        
+        document_id = self.digest.hexdigest().encode()
+        xref_pos = self.position
+        size = self.next_number
+        self.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        self.write(b"".join(b"%010d 00000 n \n" % self.offsets[number] for number in range(1, size)))
+        self.write(b"trailer\n<<\n/ID [<%s><%s>] /Info %d 0 R /Root %d 0 R /Size %d\n>>\n"
+                   b"startxref\n%d\n%%%%EOF\n" % (document_id, document_id, self.INFO, self.CATALOG,
+                                                  size, xref_pos))
+        self.file.close()
+
+def join_pdfs(pdf_paths, output_pdf, template_pdf=None):
+    """
+    Join PDFs into one output, keeping the given order (see PdfJoiner)
+    With template_pdf, every page is stamped onto one shared copy of the blank
+    form (vector overlay, no rasterizing; the template is stored once)
+    """
+    with PdfJoiner(output_pdf, template_pdf) as joiner:
+        for pdf_path in pdf_paths:
+            with open(pdf_path, 'rb') as f:
+                joiner.append(f.read())
+
+def repack_object_streams(pdf_path):
+    """
+    Rewrite a finished PDF with compressed object streams (page and font
+    dictionaries packed together); returns False when PyMuPDF isn't installed
+    """
+    try:
+        import pymupdf
+    except ImportError:
+        try:
+            import fitz as pymupdf  # PyMuPDF before 1.24.3
+        except ImportError:
+            return False
+    
+    temp_pdf = pdf_path + ".objstm.tmp"
+    with pymupdf.open(pdf_path) as doc:
+        doc.save(temp_pdf, garbage=1, deflate=True, use_objstms=1, no_new_id=True)
+    os.replace(temp_pdf, pdf_path)
+    return True
+
+# ============================================================================
+# PARALLEL RENDERING FUNCTIONS
+# ============================================================================
+
+def group_shards(pages, pages_per_shard):
+    """Yield lists of pages; every shard starts on a page boundary"""
+    return chunked(pages, pages_per_shard)
+
+def init_render_worker(layout_file, use_background_image, profiling=False):
+    """Give each worker process the layout plan (from the compiled layout file) and mode chosen by the main process"""
+    global LAYOUT_PLAN, USE_BACKGROUND_IMAGE
+    LAYOUT_PLAN = load_compiled_layout(layout_file)
+    USE_BACKGROUND_IMAGE = use_background_image
+    if profiling:
+        start_profiling()
+
+def render_shard(shard_pages, shard_pdf, background_image_path, profile):
+    """
+    Render one shard of pages to its own PDF (runs in a worker process)
+    Returns (recipients, pages, stage samples or None)
+    """
+    c = new_canvas(shard_pdf, profile)
+    define_background_form(c, background_image_path)
+    recipients, pages = render_pages(c, shard_pages)
+    save_canvas(c)
+    return recipients, pages, take_stage_samples()
+
+def render_pages_parallel(pages, output_pdf, background_image_path=None,
+                          workers=RENDER_WORKERS, pages_per_shard=SHARD_PAGES, template_pdf=None,
+                          progress=None, profile=OUTPUT_PROFILES['standard']):
+    """
+    Split the page stream into shards and render each shard in a worker process;
+    finished shards are appended to the output in their original order while
+    later shards are still rendering (stamped on template_pdf if given)
+    Returns (recipients drawn, pages drawn)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+    import tempfile
+    
+    total_recipients = 0
+    total_pages = 0
+    
+    output_dir = os.path.dirname(os.path.abspath(output_pdf))
+    with tempfile.TemporaryDirectory(prefix="1099_shards_", dir=output_dir) as shard_dir:
+        pending = deque()
+        layout_file = os.path.join(shard_dir, "layout" + COMPILED_LAYOUT_SUFFIX)
+        write_compiled_layout(layout_file, LAYOUT_PLAN)
+        
+        def join_next_shard(joiner):
+            nonlocal total_recipients, total_pages
+            shard_pdf, future = pending.popleft()
+            recipients, shard_pages, samples = future.result()
+            merge_stage_samples(samples)
+            started = perf_counter()
+            with open(shard_pdf, 'rb') as f:
+                joiner.append(f.read())
+            os.remove(shard_pdf)
+            if STAGE_SAMPLES is not None:
+                add_stage_sample('merge', perf_counter() - started)
+            total_recipients += recipients
+            total_pages += shard_pages
+            if progress is not None:
+                progress.update(recipients, shard_pages)
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=init_render_worker,
+                                 initargs=(layout_file, USE_BACKGROUND_IMAGE,
+                                           STAGE_SAMPLES is not None)) as pool, \
+             PdfJoiner(output_pdf, template_pdf) as joiner:
+            for shard_num, shard in enumerate(group_shards(pages, pages_per_shard)):
+                shard_pdf = os.path.join(shard_dir, f"shard_{shard_num:06d}.pdf")
+                pending.append((shard_pdf, pool.submit(render_shard, shard, shard_pdf,
+                                                       background_image_path, profile)))
+                
+                # Keep only a few shards in flight so memory and temp space stay bounded
+                while len(pending) >= workers * 2:
+                    join_next_shard(joiner)
+            
+            while pending:
+                join_next_shard(joiner)
+    
+    return total_recipients, total_pages
+
+# ============================================================================
+# PIPELINED RENDERING FUNCTIONS
+# ============================================================================
+
+class StageFailed:
+    """Carries an exception from a pipeline thread to the thread consuming its queue"""
+    def __init__(self, error):
+        self.error = error
+
+def threaded_stage(items, maxsize):
+    """
+    Iterate items on a background thread, yielding them here through a bounded
+    queue (the thread blocks once it is maxsize items ahead - backpressure)
+    """
+    import queue
+    import threading
+    
+    done = object()
+    handoff = queue.Queue(maxsize)
+    
+    def produce():
+        try:
+            for item in items:
+                handoff.put(item)
+        except BaseException as e:
+            handoff.put(StageFailed(e))
+        else:
+            handoff.put(done)
+    
+    threading.Thread(target=produce, name="1099-parse", daemon=True).start()
+    while True:
+        item = handoff.get()
+        if item is done:
+            return
+        if isinstance(item, StageFailed):
+            raise item.error
+        yield item
+
+def save_segments(handoff, joiner, failures):
+    """Writer thread: save each drawn canvas from the queue and append it to the output until None arrives"""
+    while True:
+        item = handoff.get()
+        if item is None:
+            return
+        if failures:
+            continue  # Drain the queue so drawing never blocks on a dead writer
+        c, buffer = item
+        try:
+            save_canvas(c)
+            started = perf_counter()
+            joiner.append(buffer.getvalue())
+            if STAGE_SAMPLES is not None:
+                add_stage_sample('merge', perf_counter() - started)
+        except BaseException as e:
+            failures.append(e)
+
+def render_pages_pipelined(pages, output_pdf, background_image_path=None, template_pdf=None,
+                           progress=None, profile=OUTPUT_PROFILES['standard']):
+    """
+    Overlap the three stages of a run on separate threads:
+    parse thread  - reads and normalizes rows, grouped into pages (PIPELINE_QUEUE_PAGES ahead)
+    this thread   - draws PIPELINE_SEGMENT_PAGES pages per canvas
+    writer thread - saves finished canvases (compression) and appends them to the
+                    one output file (stamped on template_pdf if given)
+    Segments never touch the disk on their own and there is no merge pass at the
+    end: the writer copies each saved segment into the output as it goes.
+    Returns (recipients drawn, pages drawn)
+    """
+    import io
+    import queue
+    import threading
+    
+    total_recipients = 0
+    total_pages = 0
+    
+    with PdfJoiner(output_pdf, template_pdf) as joiner:
+        handoff = queue.Queue(PIPELINE_QUEUE_SEGMENTS)
+        failures = []
+        writer = threading.Thread(target=save_segments, args=(handoff, joiner, failures),
+                                  name="1099-writer", daemon=True)
+        writer.start()
+        
+        try:
+            for segment in group_shards(threaded_stage(pages, PIPELINE_QUEUE_PAGES), PIPELINE_SEGMENT_PAGES):
+                buffer = io.BytesIO()
+                c = new_canvas(buffer, profile)
+                define_background_form(c, background_image_path)
+                recipients, segment_pages = render_pages(c, segment, progress)
+                total_recipients += recipients
+                total_pages += segment_pages
+                
+                handoff.put((c, buffer))  # Waits while the writer is PIPELINE_QUEUE_SEGMENTS canvases behind
+                if failures:
+                    break
+        finally:
+            handoff.put(None)
+            writer.join()
+        if failures:
+            raise failures[0]
+    
+    return total_recipients, total_pages
+
+# ============================================================================
+# CHUNKED OUTPUT FUNCTIONS
+# ============================================================================
+
+def chunk_pdf_path(output_pdf, chunk_num):
+    """1-based chunk number -> <output>_part001.pdf"""
+    stem, ext = os.path.splitext(output_pdf)
+    return f"{stem}_part{chunk_num:03d}{ext or '.pdf'}"
+
+def chunk_manifest_path(output_pdf):
+    """Manifest listing every chunk of a split output"""
+    return os.path.splitext(output_pdf)[0] + ".chunks.json"
+
+def save_chunk_manifest(output_pdf, csv_file, limits, chunks):
+    """Write the chunk manifest (replaced atomically so it always matches the finished chunks)"""
+    path = chunk_manifest_path(output_pdf)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump({
+            'version': MANIFEST_VERSION,
+            'source_csv': os.path.basename(csv_file),
+            'limits': limits,
+            'chunks': chunks
+        }, f, indent=1)
+    os.replace(temp_path, path)
+    return path
+
+def chunk_fixed_bytes(background_image_path=None, template_pdf=None):
+    """Estimated bytes every chunk carries regardless of its page count"""
+    fixed = CHUNK_FIXED_BYTES_ESTIMATE
+    if USE_BACKGROUND_IMAGE and background_image_path and os.path.exists(background_image_path):
+        fixed += os.path.getsize(background_image_path)
+    if template_pdf:
+        fixed += os.path.getsize(template_pdf)
+    return fixed
+
+def finalize_chunk(c, chunk_pdf, template_pdf=None, profile=OUTPUT_PROFILES['standard']):
+    """
+    Save a finished chunk canvas (opened on <chunk>.data.tmp), stamp and repack
+    it as the profile asks, then move it into place. Returns its size in bytes.
+    """
+    data_pdf = chunk_pdf + ".data.tmp"
+    temp_pdf = chunk_pdf + ".tmp"
+    save_canvas(c)
+    
+    if template_pdf:
+        join_pdfs([data_pdf], temp_pdf, template_pdf)
+        os.remove(data_pdf)
+    else:
+        os.replace(data_pdf, temp_pdf)
+    if profile.object_streams:
+        repack_object_streams(temp_pdf)
+    
+    os.replace(temp_pdf, chunk_pdf)
+    return os.path.getsize(chunk_pdf)
+
+def render_chunked(pages, output_pdf, csv_file, background_image_path=None, template_pdf=None,
+                   chunk_pages=CHUNK_PAGES, chunk_mb=CHUNK_MB, chunk_by_payer=CHUNK_BY_PAYER,
+                   progress=None, profile=OUTPUT_PROFILES['standard']):
+    """
+    Render pages into a series of PDFs (<output>_part001.pdf, ...), rolling over
+    every chunk_pages pages, before a chunk would pass chunk_mb megabytes, and/or
+    when the payer changes. Each chunk is finalized as soon as it is full and the
+    manifest (<output>.chunks.json) is rewritten after every chunk.
+    The megabyte limit is a hard cap: a chunk whose finished file is over it is
+    re-rendered with fewer pages (the rest start the next chunk); a single page
+    over it raises ValueError. A failed run removes its chunks and manifest, so a
+    manifest on disk always describes a complete split.
+    Returns (recipients, pages, chunk manifest entries)
+    """
+    max_bytes = chunk_mb * 1024 * 1024 if chunk_mb else None
+    target_bytes = max_bytes * (1 - CHUNK_SIZE_MARGIN) if max_bytes else None
+    fixed_bytes = chunk_fixed_bytes(background_image_path, template_pdf)
+    bytes_per_page = CHUNK_BYTES_PER_PAGE_ESTIMATE
+    limits = {'pages': chunk_pages, 'mb': chunk_mb, 'by_payer': chunk_by_payer}
+    
+    chunks = []
+    total_recipients = 0
+    total_pages = 0
+    c = None
+    
+    def open_chunk(carried_pages):
+        """New chunk canvas with the pages carried over from a re-split chunk already drawn"""
+        c = new_canvas(chunk_pdf_path(output_pdf, len(chunks) + 1) + ".data.tmp", profile)
+        define_background_form(c, background_image_path)
+        for page_recipients in carried_pages:
+            draw_page(c, page_recipients)
+            finish_page(c)
+        return c
+    
+    def close_chunk(c, chunk_page_list):
+        """Finalize the chunk (re-split to fit max_bytes); returns the pages left for the next chunk"""
+        nonlocal bytes_per_page
+        chunk_pdf = chunk_pdf_path(output_pdf, len(chunks) + 1)
+        chunk_bytes = finalize_chunk(c, chunk_pdf, template_pdf, profile)
+        
+        leftover = []
+        while max_bytes and chunk_bytes > max_bytes and len(chunk_page_list) > 1:
+            # The estimate came up short: keep what fits at this chunk's own bytes per page
+            page_bytes = max(1, chunk_bytes - fixed_bytes) / len(chunk_page_list)
+            keep = max(1, min(len(chunk_page_list) - 1, int((target_bytes - fixed_bytes) / page_bytes)))
+            if progress is not None:
+                progress.note(f"Chunk {len(chunks) + 1} came out at {chunk_bytes:,} bytes - "
+                              f"re-rendering {keep} of its {len(chunk_page_list)} pages")
+            leftover = chunk_page_list[keep:] + leftover
+            chunk_page_list = chunk_page_list[:keep]
+            chunk_bytes = finalize_chunk(open_chunk(chunk_page_list), chunk_pdf, template_pdf, profile)
+        if max_bytes and chunk_bytes > max_bytes:
+            os.remove(chunk_pdf)
+            raise ValueError(f"{os.path.basename(chunk_pdf)}: one page makes a {chunk_bytes:,}-byte file, "
+                             f"over the {chunk_mb} MB chunk limit")
+        
+        chunk_rows = [values[ROW_NUMBER_SLOT] for page in chunk_page_list for values in page]
+        first_page = chunks[-1]['last_page'] + 1 if chunks else 1
+        chunks.append({
+            'file': os.path.basename(chunk_pdf),
+            'first_page': first_page,
+            'last_page': first_page + len(chunk_page_list) - 1,
+            'pages': len(chunk_page_list),
+            'recipients': len(chunk_rows),
+            'bytes': chunk_bytes,
+            'payer_tins': sorted({values[SLOT_PAYER_TIN] for page in chunk_page_list for values in page}),
+            'rows': format_row_spec(sorted(chunk_rows)),
+        })
+        save_chunk_manifest(output_pdf, csv_file, limits, chunks)
+        
+        # Calibrate the size estimate on everything written so far
+        written_bytes = sum(chunk['bytes'] for chunk in chunks) - fixed_bytes * len(chunks)
+        bytes_per_page = max(1, written_bytes / chunks[-1]['last_page'])
+        if progress is not None:
+            progress.note(f"✓ Chunk {len(chunks)}: {os.path.basename(chunk_pdf)} "
+                          f"({len(chunk_page_list)} pages, {chunk_bytes:,} bytes)")
+        return leftover
+    
+    try:
+        for page_recipients in pages:
+            payer = page_recipients[0][SLOT_PAYER_TIN]
+            while c is not None and (
+                (chunk_pages and len(chunk_page_list) >= chunk_pages) or
+                (max_bytes and fixed_bytes + (len(chunk_page_list) + 1) * bytes_per_page > target_bytes) or
+                (chunk_by_payer and payer not in chunk_payers)
+            ):
+                chunk_page_list = close_chunk(c, chunk_page_list)
+                c = open_chunk(chunk_page_list) if chunk_page_list else None
+                chunk_payers = {values[SLOT_PAYER_TIN] for page in chunk_page_list for values in page}
+            
+            if c is None:
+                c = open_chunk([])
+                chunk_page_list = []
+                chunk_payers = set()
+            
+            draw_page(c, page_recipients)
+            finish_page(c)
+            
+            chunk_page_list.append(page_recipients)
+            chunk_payers.update(values[SLOT_PAYER_TIN] for values in page_recipients)
+            total_recipients += len(page_recipients)
+            total_pages += 1
+            if progress is not None:
+                progress.update(len(page_recipients), 1)
+        
+        while c is not None:
+            chunk_page_list = close_chunk(c, chunk_page_list)
+            c = open_chunk(chunk_page_list) if chunk_page_list else None
+    except BaseException:
+        # Leave no partial split behind: finished chunks, the one in progress and the manifest
+        leftovers = [chunk_pdf_path(output_pdf, chunk_num) for chunk_num in range(1, len(chunks) + 2)]
+        leftovers += [leftovers[-1] + ".data.tmp", leftovers[-1] + ".tmp", chunk_manifest_path(output_pdf)]
+        for path in leftovers:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    
+    return total_recipients, total_pages, chunks
+
+# ============================================================================
+# INCREMENTAL RE-RUN FUNCTIONS
+# ============================================================================
+
+def manifest_path(output_pdf):
+    """Manifest file saved next to the output PDF"""
+    return output_pdf + ".manifest.json"
+
+def file_digest(path):
+    """SHA-256 of a file's contents ('' when there is no file)"""
+    if not path or not os.path.exists(path):
+        return ''
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def run_config_digest(background_image_path=None, template_pdf=None):
+    """Digest of everything other than the rows that changes how a page looks"""
+    h = hashlib.sha256()
+    h.update(repr((
+        MANIFEST_VERSION,
+        LAYOUT_PLAN,  # Layout JSON + section offsets + fonts, already compiled
+        USE_BACKGROUND_IMAGE,
+        BACKGROUND_IMAGE_X_OFFSET, BACKGROUND_IMAGE_Y_OFFSET,
+        BACKGROUND_IMAGE_WIDTH_STRETCH, BACKGROUND_IMAGE_HEIGHT_STRETCH,
+        OVERLAY_TEMPLATE_PAGE,
+    )).encode())
+    h.update(file_digest(background_image_path if USE_BACKGROUND_IMAGE else None).encode())
+    h.update(file_digest(template_pdf).encode())
+    return h.hexdigest()
+
+def page_digest(config_digest, page_recipients):
+    """Digest of one page: its recipients' printed values plus the run config"""
+    h = hashlib.sha256(config_digest.encode())
+    for values in page_recipients:
+        h.update(repr(values[:ROW_NUMBER_SLOT]).encode())
+    return h.hexdigest()
+
+def track_page_digests(pages, config_digest, page_digests):
+    """Pass pages through unchanged, recording each page's digest"""
+    for page_recipients in pages:
+        page_digests.append(page_digest(config_digest, page_recipients))
+        yield page_recipients
+
+def load_manifest(output_pdf):
+    """Load the manifest of a previous run (None if missing, unreadable or the PDF is gone)"""
+    path = manifest_path(output_pdf)
+    if not os.path.exists(output_pdf) or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+def save_manifest(output_pdf, config_digest, page_digests):
+    """Save the page digests next to the output PDF"""
+    with open(manifest_path(output_pdf), 'w') as f:
+        json.dump({
+            'version': MANIFEST_VERSION,
+            'pdf': os.path.basename(output_pdf),
+            'config': config_digest,
+            'pages': page_digests
+        }, f, indent=1)
+
+def splice_pages(existing_pdf, changes_pdf, changed, output_pdf, template_pdf=None):
+    """
+    Rebuild the output: unchanged pages come from existing_pdf, changed pages
+    (in order) from changes_pdf. changed holds one True/False per output page.
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import DecodedStreamObject
+    
+    existing = PdfReader(existing_pdf)
+    changes = iter(PdfReader(changes_pdf).pages) if any(changed) else iter(())
+    
+    writer = PdfWriter()
+    new_pages = []
+    template_ref = prefix_ref = None
+    for page_num, is_changed in enumerate(changed):
+        if is_changed:
+            new_pages.append(writer.add_page(next(changes)))
+        else:
+            page = writer.add_page(existing.pages[page_num])
+            if template_pdf and template_ref is None:
+                # Reuse the blank form already in the file instead of adding a second copy
+                xobjects = page['/Resources'].get('/XObject', {})
+                if TEMPLATE_FORM_NAME in xobjects:
+                    template_ref = xobjects.raw_get(TEMPLATE_FORM_NAME)
+                    prefix_ref = page['/Contents'][0].indirect_reference
+    
+    if template_pdf and new_pages:
+        if template_ref is None:
+            template_ref = add_template_form(writer, PdfReader(template_pdf).pages[OVERLAY_TEMPLATE_PAGE])
+            prefix = DecodedStreamObject()
+            prefix.set_data(f"q {TEMPLATE_FORM_NAME} Do Q\n".encode())
+            prefix_ref = writer._add_object(prefix)
+        for page in new_pages:
+            stamp_page(page, template_ref, prefix_ref)
+    
+    temp_pdf = output_pdf + ".splice.tmp"
+    with open(temp_pdf, 'wb') as f:
+        writer.write(f)
+    os.replace(temp_pdf, output_pdf)
+
+def rerender_changed_pages(pages, output_pdf, manifest, config_digest,
+                           background_image_path=None, template_pdf=None, progress=None,
+                           profile=OUTPUT_PROFILES['standard']):
+    """
+    Re-render only the pages whose digest differs from the previous run's manifest
+    and splice them into the existing output PDF
+    Returns (recipients, pages, pages re-rendered)
+    """
+    old_digests = manifest['pages']
+    page_digests = []
+    changed = []
+    total_recipients = 0
+    
+    changes_pdf = output_pdf + ".changes.tmp"
+    c = new_canvas(changes_pdf, profile)
+    define_background_form(c, background_image_path)
+    
+    for page_num, page_recipients in enumerate(pages):
+        digest = page_digest(config_digest, page_recipients)
+        is_changed = page_num >= len(old_digests) or old_digests[page_num] != digest
+        page_digests.append(digest)
+        changed.append(is_changed)
+        total_recipients += len(page_recipients)
+        
+        if is_changed:
+            draw_page(c, page_recipients)
+            finish_page(c)
+        if progress is not None:
+            progress.update(len(page_recipients), 1)
+    
+    rerendered = sum(changed)
+    if rerendered or len(changed) != len(old_digests):
+        if rerendered:
+            save_canvas(c)
+        started = perf_counter()
+        splice_pages(output_pdf, changes_pdf, changed, output_pdf, template_pdf)
+        if STAGE_SAMPLES is not None:
+            add_stage_sample('merge', perf_counter() - started)
+        if rerendered:
+            os.remove(changes_pdf)
+    
+    save_manifest(output_pdf, config_digest, page_digests)
+    return total_recipients, len(changed), rerendered
+
+# ============================================================================
+# CHECKPOINT / RESUME FUNCTIONS
+# ============================================================================
+
+def checkpoint_path(output_pdf):
+    """Checkpoint file saved next to the output PDF while a run is in progress"""
+    return output_pdf + ".checkpoint.json"
+
+def checkpoint_segment_path(output_pdf, segment_num):
+    """1-based segment number -> <output>.seg0001.pdf"""
+    return f"{output_pdf}.seg{segment_num:04d}.pdf"
+
+def fsync_replace(temp_path, path):
+    """Flush a finished temp file to disk, move it into place and flush the directory entry"""
+    with open(temp_path, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    if hasattr(os, 'O_DIRECTORY'):  # Directories can't be opened for fsync on Windows
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def run_fingerprint(csv_file, row_indices, config_digest, output_profile, checkpoint_pages):
+    """Digest of every input of a run; a checkpoint is only resumed when it matches"""
+    h = hashlib.sha256()
+    h.update(repr((
+        MANIFEST_VERSION,
+        file_digest(csv_file),
+        row_indices,
+        config_digest,
+        output_profile,
+        checkpoint_pages,
+    )).encode())
+    return h.hexdigest()
+
+def load_checkpoint(output_pdf, fingerprint):
+    """
+    The checkpoint of an interrupted run with the same inputs, or a fresh one
+    (any other checkpoint is discarded along with its segments)
+    """
+    path = checkpoint_path(output_pdf)
+    fresh = {'version': MANIFEST_VERSION, 'fingerprint': fingerprint, 'segments': []}
+    if not os.path.exists(path):
+        return fresh
+    try:
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return fresh
+    
+    output_dir = os.path.dirname(output_pdf)
+    segments = checkpoint.get('segments', [])
+    if (checkpoint.get('version') == MANIFEST_VERSION and checkpoint.get('fingerprint') == fingerprint and
+            all(os.path.exists(os.path.join(output_dir, segment['file'])) for segment in segments)):
+        return checkpoint
+    
+    clear_checkpoint(output_pdf, checkpoint)
+    return fresh
+
+def save_checkpoint(output_pdf, checkpoint):
+    """Durably record the committed segments"""
+    path = checkpoint_path(output_pdf)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(checkpoint, f, indent=1)
+    fsync_replace(path + ".tmp", path)
+
+def clear_checkpoint(output_pdf, checkpoint):
+    """Remove a checkpoint and its segment PDFs (after the final output is written)"""
+    output_dir = os.path.dirname(output_pdf)
+    for segment in checkpoint.get('segments', []):
+        segment_pdf = os.path.join(output_dir, segment['file'])
+        if os.path.exists(segment_pdf):
+            os.remove(segment_pdf)
+    if os.path.exists(checkpoint_path(output_pdf)):
+        os.remove(checkpoint_path(output_pdf))
+
+def skip_committed_rows(rows, checkpoint):
+    """Drop the rows the checkpoint's segments already hold (up to its last committed row)"""
+    segments = checkpoint['segments']
+    if not segments:
+        return rows
+    last_row = segments[-1]['last_row']  # 1-based, so 0-based indices below it are done
+    return dropwhile(lambda row: row[0] < last_row, rows)
+
+def render_checkpointed(pages, output_pdf, checkpoint, background_image_path=None, template_pdf=None,
+                        checkpoint_pages=CHECKPOINT_PAGES, progress=None,
+                        profile=OUTPUT_PROFILES['standard'], page_digests=None):
+    """
+    Render pages in segments of checkpoint_pages pages. Each finished segment is
+    saved and flushed to its own PDF and recorded in the checkpoint before the
+    next one starts; the segments are joined into output_pdf at the end.
+    pages must already skip the rows the checkpoint has committed. Segments are
+    written with invariant=1, so a resumed run produces the same bytes as an
+    uninterrupted one.
+    Returns (recipients, pages), counting the committed segments too
+    """
+    segment_profile = profile._replace(invariant=1)
+    segments = checkpoint['segments']
+    total_recipients = sum(segment['recipients'] for segment in segments)
+    total_pages = sum(segment['pages'] for segment in segments)
+    
+    for segment_pages in group_shards(pages, checkpoint_pages):
+        segment_pdf = checkpoint_segment_path(output_pdf, len(segments) + 1)
+        c = new_canvas(segment_pdf + ".tmp", segment_profile)
+        define_background_form(c, background_image_path)
+        recipients, rendered = render_pages(c, segment_pages, progress)
+        save_canvas(c)
+        fsync_replace(segment_pdf + ".tmp", segment_pdf)
+        
+        total_recipients += recipients
+        total_pages += rendered
+        segments.append({
+            'file': os.path.basename(segment_pdf),
+            'pages': rendered,
+            'recipients': recipients,
+            'last_row': segment_pages[-1][-1][ROW_NUMBER_SLOT] + 1,
+            'page_digests': page_digests[total_pages - rendered:total_pages] if page_digests is not None else [],
+        })
+        save_checkpoint(output_pdf, checkpoint)
+        if progress is not None:
+            progress.note(f"✓ Checkpoint: {total_pages} pages committed (through row {segments[-1]['last_row']})")
+    
+    output_dir = os.path.dirname(output_pdf)
+    merge_started = perf_counter()
+    join_pdfs([os.path.join(output_dir, segment['file']) for segment in segments],
+              output_pdf + ".tmp", template_pdf)
+    if STAGE_SAMPLES is not None:
+        add_stage_sample('merge', perf_counter() - merge_started)
+    fsync_replace(output_pdf + ".tmp", output_pdf)
+    
+    return total_recipients, total_pages
+
+# ============================================================================
+# PROGRESS REPORTING
+# ============================================================================
+
+def format_duration(seconds):
+    """h:mm:ss or m:ss"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class ProgressReporter:
+    """
+    Throttled run progress: rows, pages, rows/sec, percent and ETA
+    Only counts are reported - never recipient names or other row data.
+    quiet: prints nothing
+    bar:   status lines on stdout plus a single updating progress line on stderr
+    json:  one JSON object per line on stdout (start, progress, note and done events)
+    """
+    
+    def __init__(self, mode=PROGRESS_MODE, total_rows=None, interval=PROGRESS_INTERVAL):
+        if mode not in PROGRESS_MODES:
+            raise ValueError(f"Unknown progress mode '{mode}' (choose from {', '.join(PROGRESS_MODES)})")
+        self.mode = mode
+        self.total_rows = total_rows
+        self.interval = interval
+        self.rows = 0
+        self.pages = 0
+        self.started = perf_counter()
+        self.last_update = self.started
+        self.bar_open = False  # A progress line is on stderr without its newline yet
+    
+    def emit(self, event, **fields):
+        print(json.dumps({'event': event, **fields}), flush=True)
+    
+    def stats(self):
+        elapsed = perf_counter() - self.started
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        stats = {
+            'rows': self.rows,
+            'pages': self.pages,
+            'elapsed_seconds': round(elapsed, 2),
+            'rows_per_sec': round(rate, 1),
+        }
+        if self.total_rows:
+            stats['total_rows'] = self.total_rows
+            stats['percent'] = round(min(100.0, 100.0 * self.rows / self.total_rows), 1)
+            stats['eta_seconds'] = round(max(0, self.total_rows - self.rows) / rate, 1) if rate else None
+        return stats
+    
+    def draw_bar(self, stats):
+        line = f"{stats['rows']:,} rows  {stats['pages']:,} pages  {stats['rows_per_sec']:,.0f} rows/s"
+        if 'percent' in stats:
+            filled = int(stats['percent'] / 100 * PROGRESS_BAR_WIDTH)
+            eta = format_duration(stats['eta_seconds']) if stats['eta_seconds'] is not None else '?'
+            line = (f"[{'#' * filled}{'-' * (PROGRESS_BAR_WIDTH - filled)}] {stats['percent']:5.1f}%  "
+                    f"{line}  ETA {eta}")
+        sys.stderr.write("\r" + line)
+        sys.stderr.flush()
+        self.bar_open = True
+    
+    def close_bar(self):
+        if self.bar_open:
+            sys.stderr.write("\n")
+            self.bar_open = False
+    
+    def start(self, **fields):
+        """Announce the run (fields are printed as 'Key: value' lines in bar mode)"""
+        if self.mode == 'json':
+            self.emit('start', total_rows=self.total_rows, **fields)
+        elif self.mode == 'bar':
+            print(f"\n{'='*80}")
+            for key, value in fields.items():
+                print(f"{key.replace('_', ' ').capitalize()}: {value}")
+            print(f"{'='*80}\n")
+    
+    def update(self, rows, pages):
+        """Count finished rows/pages; prints at most once per interval"""
+        self.rows += rows
+        self.pages += pages
+        now = perf_counter()
+        if now - self.last_update < self.interval:
+            return
+        self.last_update = now
+        if self.mode == 'json':
+            self.emit('progress', **self.stats())
+        elif self.mode == 'bar':
+            self.draw_bar(self.stats())
+    
+    def note(self, message):
+        """A status message (not throttled)"""
+        if self.mode == 'json':
+            self.emit('note', message=message)
+        elif self.mode == 'bar':
+            self.close_bar()
+            print(message)
+    
+    def finish(self, **fields):
+        """Final counts (fields are printed as 'Key: value' lines in bar mode)"""
+        stats = self.stats()
+        if self.mode == 'json':
+            self.emit('done', **stats, **fields)
+        elif self.mode == 'bar':
+            self.draw_bar(stats)
+            self.close_bar()
+            for key, value in fields.items():
+                print(f"✓ {key.replace('_', ' ').capitalize()}: {value}")
+            print(f"{'='*80}\n")
+
+# ============================================================================
+# STAGE PROFILING FUNCTIONS
+# ============================================================================
+
+# Stage name -> list of durations in seconds while profiling (None = profiling off)
+STAGE_SAMPLES = None
+
+def start_profiling(with_cprofile=False):
+    """
+    Start collecting stage timings in this process
+    Returns a running cProfile.Profile when with_cprofile is set, else None
+    """
+    global STAGE_SAMPLES
+    STAGE_SAMPLES = {}
+    if not with_cprofile:
+        return None
+    
+    import cProfile
+    cprofiler = cProfile.Profile()
+    cprofiler.enable()
+    return cprofiler
+
+def stop_profiling(cprofiler=None):
+    """Stop collecting and return the stage samples"""
+    global STAGE_SAMPLES
+    if cprofiler is not None:
+        cprofiler.disable()
+    samples, STAGE_SAMPLES = STAGE_SAMPLES, None
+    return samples
+
+def add_stage_sample(stage, seconds):
+    STAGE_SAMPLES.setdefault(stage, []).append(seconds)
+
+def take_stage_samples():
+    """Return the samples collected so far (None if off) and start over"""
+    global STAGE_SAMPLES
+    samples = STAGE_SAMPLES
+    if samples is not None:
+        STAGE_SAMPLES = {}
+    return samples
+
+def merge_stage_samples(samples):
+    """Fold in samples collected by a worker process"""
+    for stage, durations in (samples or {}).items():
+        STAGE_SAMPLES.setdefault(stage, []).extend(durations)
+
+def percentile(sorted_durations, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = int(round(pct / 100 * (len(sorted_durations) - 1)))
+    return sorted_durations[index]
+
+def stage_report(samples, wall_seconds, total_recipients, total_pages):
+    """Totals and percentiles per stage, in milliseconds"""
+    stages = {}
+    for stage in PROFILE_STAGES:
+        durations = sorted(samples.get(stage, ()))
+        if not durations:
+            continue
+        total = sum(durations)
+        stages[stage] = {
+            'count': len(durations),
+            'total_ms': round(total * 1000, 3),
+            'share_of_wall': round(total / wall_seconds, 4) if wall_seconds else None,
+            'mean_ms': round(total / len(durations) * 1000, 4),
+            'p50_ms': round(percentile(durations, 50) * 1000, 4),
+            'p90_ms': round(percentile(durations, 90) * 1000, 4),
+            'p99_ms': round(percentile(durations, 99) * 1000, 4),
+            'max_ms': round(durations[-1] * 1000, 4),
+        }
+    return {
+        'wall_ms': round(wall_seconds * 1000, 3),
+        'recipients': total_recipients,
+        'pages': total_pages,
+        'stages': stages,
+    }
+
+def save_stage_report(report_json, report):
+    """Write the stage report as JSON"""
+    with open(report_json, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def stage_summary(report):
+    """One line per stage for the console"""
+    lines = [f"Stage timings (wall {report['wall_ms'] / 1000:.2f}s):"]
+    for stage, stats in report['stages'].items():
+        lines.append(f"  {stage:<10} {stats['total_ms'] / 1000:8.3f}s  "
+                     f"p50 {stats['p50_ms']:.3f}ms  p99 {stats['p99_ms']:.3f}ms  ({stats['count']} samples)")
+    return lines
+
+# ============================================================================
+# MAIN FORM FILLING FUNCTION
+# ============================================================================
+
+def fill_1099_nec_form(csv_file, output_pdf, background_image_path=None, row_indices=None,
+                       workers=RENDER_WORKERS, template_pdf=OVERLAY_TEMPLATE_PDF,
+                       incremental=INCREMENTAL_RERUN, profile_json=PROFILE_REPORT,
+                       profile_cprofile=PROFILE_CPROFILE, progress_mode=PROGRESS_MODE,
+                       output_profile=OUTPUT_PROFILE, chunk_pages=CHUNK_PAGES, chunk_mb=CHUNK_MB,
+                       chunk_by_payer=CHUNK_BY_PAYER, checkpoint_pages=CHECKPOINT_PAGES,
+                       pipelined=PIPELINED, sort_recipients=False):
+    """
+    Fill 1099-NEC forms from CSV data
+    Rows stream from the CSV straight to the canvas one page (3 recipients) at a time.
+    csv_file: one CSV path, or a list of paths rendered into one combined output
+        (recipients merged in payer, then recipient order)
+    row_indices: optional sorted list of 0-based rows to process (None = all rows, one CSV only)
+    workers: number of render processes (1 = render on a single canvas)
+    template_pdf: blank IRS PDF to stamp every page onto (None = data only)
+    incremental: re-render only pages that changed since the last run of this output
+    profile_json: write per-stage timings to this JSON file (None = no profiling)
+    profile_cprofile: also run cProfile and save its stats as <profile_json>.prof
+    progress_mode: 'quiet', 'bar' or 'json' (see ProgressReporter)
+    output_profile: 'standard', 'compact' or 'archive' (see OUTPUT_PROFILES)
+    chunk_pages / chunk_mb / chunk_by_payer: split the output into <output>_partNNN.pdf
+        files listed in <output>.chunks.json (see render_chunked)
+    checkpoint_pages: commit every N pages and resume an interrupted run with the
+        same inputs from its checkpoint (see render_checkpointed)
+    pipelined: parse, draw and save on separate threads (see render_pages_pipelined)
+    sort_recipients: print in payer, then recipient order instead of CSV order
+        (checkpoints and incremental re-runs need CSV order and are skipped)
+    Returns (recipients processed, total pages, mode), or None if the CSV has no data
+    """
+    started = perf_counter()
+    profile = OUTPUT_PROFILES[output_profile]
+    cprofiler = start_profiling(profile_cprofile) if profile_json else None
+    
+    csv_files = [csv_file] if isinstance(csv_file, str) else list(csv_file)
+    sorting = sort_recipients or len(csv_files) > 1
+    chunking = bool(chunk_pages or chunk_mb or chunk_by_payer)
+    if chunking and len(csv_files) > 1:
+        raise ValueError("Chunked output lists row numbers of one CSV - render each file on its own")
+    
+    # Swap in the cached background proof here, once, so every renderer and worker embeds it
+    if (USE_BACKGROUND_IMAGE and BACKGROUND_PROOF_DPI and background_image_path and
+            os.path.exists(background_image_path)):
+        background_image_path = background_proof(background_image_path)
+    config_digest = run_config_digest(background_image_path, template_pdf)
+    
+    # Resume an interrupted run with the same inputs (chunks are finalized as they go instead)
+    checkpoint = None
+    if checkpoint_pages and not (chunking or sorting):
+        fingerprint = run_fingerprint(csv_file, row_indices, config_digest, output_profile, checkpoint_pages)
+        checkpoint = load_checkpoint(output_pdf, fingerprint)
+    committed = checkpoint['segments'] if checkpoint else []
+    committed_rows = sum(segment['recipients'] for segment in committed)
+    
+    # Read CSV data -> select rows -> normalize columns (-> sort) -> group 3 per page
+    if sorting:
+        recipients = (sorted_recipients(csv_files[0], row_indices) if len(csv_files) == 1
+                      else merge_sorted_recipients(csv_files))
+    else:
+        rows = select_rows(read_recipients(csv_file), row_indices)
+        if checkpoint:
+            rows = skip_committed_rows(rows, checkpoint)
+        recipients = normalize_records(rows)
+    pages = group_pages(recipients, break_slot=SLOT_PAYER_TIN if chunk_by_payer else None)
+    
+    first_page = next(pages, None)
+    if first_page is None and not committed:
+        print("No data found in CSV!")
+        if profile_json:
+            stop_profiling(cprofiler)
+        return None
+    if first_page is not None:
+        pages = chain([first_page], pages)
+    
+    # Show mode
+    mode = "DEVELOPMENT (with background)" if USE_BACKGROUND_IMAGE else "PRODUCTION (data only)"
+    if template_pdf:
+        mode = f"STAMPED ON BLANK FORM ({os.path.basename(template_pdf)})"
+    
+    # Progress (the row count gives percent and ETA)
+    total_rows = None
+    if progress_mode != 'quiet':
+        total_rows = (len(row_indices) if row_indices is not None
+                      else sum(count_csv_rows(path) for path in csv_files))
+        total_rows -= committed_rows  # Percent and ETA cover what is left to render
+    progress = ProgressReporter(progress_mode, total_rows)
+    run_info = {'processing_recipients_from': ', '.join(os.path.basename(path) for path in csv_files),
+                'mode': mode, 'output_profile': output_profile}
+    if sorting:
+        run_info['order'] = "payer, then recipient"
+    if workers > 1 and not chunking:
+        run_info['render_workers'] = f"{workers} ({SHARD_PAGES} pages per shard)"
+    elif pipelined and not (chunking or checkpoint):
+        run_info['pipeline'] = f"parse, draw and save threads ({PIPELINE_SEGMENT_PAGES} pages per segment)"
+    if chunking:
+        run_info['chunks'] = ', '.join(limit for limit in (
+            f"every {chunk_pages} pages" if chunk_pages else None,
+            f"up to {chunk_mb} MB" if chunk_mb else None,
+            "one payer per chunk" if chunk_by_payer else None) if limit)
+    progress.start(**run_info)
+    if chunking and (workers > 1 or incremental):
+        progress.note("Chunked output is rendered in one process without incremental re-runs")
+    if checkpoint and (workers > 1 or incremental):
+        progress.note("Checkpointed runs render every page in one process")
+    if committed:
+        progress.note(f"✓ Resuming after row {committed[-1]['last_row']} "
+                      f"({committed_rows} recipients already committed)")
+    
+    # Page digests for the manifest (and for incremental re-runs)
+    manifest = load_manifest(output_pdf) if incremental and not (chunking or checkpoint or sorting) else None
+    if manifest is not None and manifest.get('config') != config_digest:
+        progress.note("Layout or settings changed since the last run - re-rendering every page")
+        manifest = None
+    
+    created = output_pdf
+    if chunking:
+        total_recipients, total_pages, chunks = render_chunked(
+            pages, output_pdf, csv_files[0], background_image_path, template_pdf,
+            chunk_pages, chunk_mb, chunk_by_payer, progress, profile
+        )
+        created = chunk_manifest_path(output_pdf)
+        output_bytes = sum(chunk['bytes'] for chunk in chunks)
+    elif manifest is not None:
+        total_recipients, total_pages, rerendered = rerender_changed_pages(
+            pages, output_pdf, manifest, config_digest, background_image_path, template_pdf, progress,
+            profile
+        )
+        progress.note(f"✓ Re-rendered {rerendered} of {total_pages} pages")
+    else:
+        page_digests = [digest for segment in committed for digest in segment['page_digests']]
+        pages = track_page_digests(pages, config_digest, page_digests)
+        
+        if checkpoint:
+            total_recipients, total_pages = render_checkpointed(
+                pages, output_pdf, checkpoint, background_image_path, template_pdf, checkpoint_pages,
+                progress, profile, page_digests
+            )
+        elif workers > 1:
+            total_recipients, total_pages = render_pages_parallel(
+                pages, output_pdf, background_image_path, workers, SHARD_PAGES, template_pdf, progress,
+                profile
+            )
+        elif pipelined:
+            total_recipients, total_pages = render_pages_pipelined(
+                pages, output_pdf, background_image_path, template_pdf, progress, profile
+            )
+        else:
+            # Data pages go straight to the output, or to a temp PDF that is then stamped
+            data_pdf = output_pdf + ".data.tmp" if template_pdf else output_pdf
+            
+            # Create PDF
+            c = new_canvas(data_pdf, profile)
+            define_background_form(c, background_image_path)
+            
+            # Process each recipient (3 per page)
+            total_recipients, total_pages = render_pages(c, pages, progress)
+            
+            # Save PDF
+            save_canvas(c)
+            
+            if template_pdf:
+                merge_started = perf_counter()
+                join_pdfs([data_pdf], output_pdf, template_pdf)
+                if STAGE_SAMPLES is not None:
+                    add_stage_sample('merge', perf_counter() - merge_started)
+                os.remove(data_pdf)
+        
+        save_manifest(output_pdf, config_digest, page_digests)
+    
+    if not chunking:
+        if profile.object_streams and not repack_object_streams(output_pdf):
+            progress.note("PyMuPDF is not installed - object streams skipped")
+        output_bytes = os.path.getsize(output_pdf)
+    if checkpoint:
+        clear_checkpoint(output_pdf, checkpoint)
+    
+    progress.finish(created=created, total_pages=total_pages, output_bytes=output_bytes,
+                    bytes_per_form=round(output_bytes / total_recipients))
+    
+    if profile_json:
+        samples = stop_profiling(cprofiler)
+        report = stage_report(samples, perf_counter() - started, total_recipients, total_pages)
+        if cprofiler is not None:
+            report['cprofile_stats'] = os.path.splitext(profile_json)[0] + ".prof"
+            cprofiler.dump_stats(report['cprofile_stats'])
+        save_stage_report(profile_json, report)
+        for line in stage_summary(report):
+            progress.note(line)
+        progress.note(f"✓ Profile report: {profile_json}")
+    
+    return total_recipients, total_pages, mode
+
+def show_success(output_pdf, total_recipients, total_pages, mode):
+    """Show the completion message"""
+    from tkinter import messagebox
+    
+    messagebox.showinfo(
+        "Success!",
+        f"✅ PDF CREATED SUCCESSFULLY!\n\n"
+        f"File: {os.path.basename(output_pdf)}\n"
+        f"Location: {os.path.dirname(output_pdf)}\n\n"
+        f"Recipients processed: {total_recipients}\n"
+        f"Total pages:  {total_pages}\n\n"
+        f"Mode: {mode}"
+    )
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def run_interactive():
+    """Walk the user through the dialogs, then fill the forms"""
+    global MASTER_FIELDS, LAYOUT_PLAN
+    
+    # Welcome message
+    show_large_message(
+        "1099-NEC Form Filler",
+        "📋 WELCOME TO 1099-NEC FORM FILLER\n\n"
+        f"Mode: {'DEVELOPMENT (with background)' if USE_BACKGROUND_IMAGE else 'PRODUCTION (data only)'}\n\n"
+        "You will be prompted to select:\n"
+        "  1. CSV data file (recipient information)\n"
+        "  2. Which rows to process (all or specific)\n"
+        "  3. JSON field positions file (coordinates)\n"
+        f"  {'4. Background image file (for alignment)' if USE_BACKGROUND_IMAGE else ''}\n"
+        f"  {'5' if USE_BACKGROUND_IMAGE else '4'}. Output PDF location\n\n"
+        "Click OK to begin..."
+    )
+    
+    # Step 1: Select CSV file
+    CSV_FILE = select_csv_file()
+    print(f"✓ CSV file selected: {CSV_FILE}")
+    
+    # Count CSV rows (the rows themselves are streamed later)
+    total_rows = count_csv_rows(CSV_FILE)
+    print(f"✓ CSV loaded: {total_rows} total rows")
+    
+    # Step 2: Ask if user wants all or some rows
+    process_all = select_all_or_some()
+    
+    selected_indices = None
+    if not process_all:
+        # User wants specific rows
+        while True:
+            row_input = get_row_numbers(total_rows)
+            
+            if row_input is None: 
+                # User cancelled
+                from tkinter import messagebox
+                messagebox.showwarning("Cancelled", "Operation cancelled by user.")
+                exit()
+            
+            selected_indices = parse_row_numbers(row_input, total_rows)
+            
+            if selected_indices is not None:
+                break  # Valid input received
+            # If invalid, loop will repeat with error message shown
+    
+    # Confirm the selection (rows are filtered while streaming)
+    if selected_indices: 
+        confirm_selected_rows(selected_indices)
+        print(f"✓ Selected {len(selected_indices)} specific rows")
+    else:
+        selected_indices = None
+        print(f"✓ Processing all {total_rows} rows")
+    
+    # Step 3: Select JSON file
+    JSON_FILE = select_json_file()
+    print(f"✓ JSON file selected: {JSON_FILE}")
+    
+    # Load JSON field positions (5a, 6a, 7a are derived from 5, 6, 7) and
+    # compile the layout plan once for the whole run
+    MASTER_FIELDS, LAYOUT_PLAN = load_layout_plan(JSON_FILE)
+    
+    # Step 4: Select background image (only in dev mode)
+    BACKGROUND_IMAGE_PATH = None
+    if USE_BACKGROUND_IMAGE: 
+        BACKGROUND_IMAGE_PATH = select_background_image()
+        if BACKGROUND_IMAGE_PATH: 
+            print(f"✓ Background image selected: {BACKGROUND_IMAGE_PATH}")
+    
+    # Step 5: Select output location
+    mode_name = "DEV" if USE_BACKGROUND_IMAGE else "PROD"
+    OUTPUT_PDF = select_output_location(mode_name)
+    print(f"✓ Output location selected: {OUTPUT_PDF}")
+    
+    # Stream selected rows straight from the CSV to the PDF
+    try:
+        result = fill_1099_nec_form(CSV_FILE, OUTPUT_PDF, BACKGROUND_IMAGE_PATH, selected_indices,
+                                    workers=RENDER_WORKERS, incremental=INCREMENTAL_RERUN)
+    except ValueError as e:
+        from tkinter import messagebox
+        messagebox.showerror("Error", f"❌ THE PDF WAS NOT CREATED\n\n{e}")
+        return
+    if result:
+        show_success(OUTPUT_PDF, *result)
+
+def run_job(csv_files, output, job_output='per-entity', **options):
+    """
+    Render several CSVs in this one process (imports, layout and font metrics are
+    set up once for all of them), in payer, then recipient order
+    per-entity: output is a directory; each CSV becomes <output>/<CSV name>.pdf
+    combined:   output is one PDF holding every file's recipients
+    options are passed on to fill_1099_nec_form
+    Returns one fill_1099_nec_form result per output PDF
+    """
+    if job_output == 'combined':
+        return [fill_1099_nec_form(csv_files, output, **options)]
+    
+    os.makedirs(output, exist_ok=True)
+    profile_json = options.pop('profile_json', None)
+    results = []
+    for csv_file in csv_files:
+        entity = os.path.splitext(os.path.basename(csv_file))[0]
+        if profile_json:
+            options['profile_json'] = f"{os.path.splitext(profile_json)[0]}_{entity}.json"
+        results.append(fill_1099_nec_form(csv_file, os.path.join(output, entity + ".pdf"),
+                                          sort_recipients=True, **options))
+    return results
+
+def parse_args(argv=None):
+    """Command line for headless runs"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Fill 1099-NEC forms from an IRS Publication 1220 CSV without any dialogs."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', help="Publication 1220 CSV data file")
+    source.add_argument('--job', metavar='DIR_OR_GLOB',
+                        help="Render every Publication 1220 CSV in a directory (or matching a glob) "
+                             "in one run, in payer, then recipient order")
+    parser.add_argument('--layout', required=True,
+                        help=f"JSON field positions file (or the fillable PDF, or a compiled {COMPILED_LAYOUT_SUFFIX} file)")
+    parser.add_argument('--compile-layout', metavar='OUT' + COMPILED_LAYOUT_SUFFIX,
+                        help="Also save the compiled layout here (binary records; pass it to --layout next time)")
+    parser.add_argument('--rows', default='all',
+                        help='Rows to process: "all" (default) or 1-based numbers/ranges like "1,3,5-10"')
+    parser.add_argument('--mode', choices=('production', 'dev', 'stamped'), default='production',
+                        help="production = data only, dev = data on the background image, "
+                             "stamped = data on the blank IRS PDF")
+    parser.add_argument('--background', help="Background image (dev mode)")
+    parser.add_argument('--template', default=OVERLAY_TEMPLATE_PDF, help="Blank IRS PDF (stamped mode)")
+    parser.add_argument('--output', help="Output PDF path, or directory for --job-output per-entity "
+                                         "(required unless --check)")
+    parser.add_argument('--job-output', choices=('per-entity', 'combined'), default='per-entity',
+                        help="With --job: one PDF per CSV in the --output directory, or one combined PDF")
+    parser.add_argument('--workers', type=int, default=RENDER_WORKERS, help="Render processes")
+    parser.add_argument('--incremental', action='store_true', default=INCREMENTAL_RERUN,
+                        help="Re-render only pages that changed since the last run")
+    parser.add_argument('--profile', metavar='REPORT_JSON', default=PROFILE_REPORT,
+                        help="Write per-stage timings (totals and percentiles) to this JSON file")
+    parser.add_argument('--cprofile', action='store_true', default=PROFILE_CPROFILE,
+                        help="With --profile, also save cProfile stats next to the report (.prof)")
+    parser.add_argument('--progress', choices=PROGRESS_MODES, default=PROGRESS_MODE,
+                        help="quiet, bar (stderr progress line) or json (JSON lines on stdout)")
+    parser.add_argument('--output-profile', choices=tuple(OUTPUT_PROFILES), default=OUTPUT_PROFILE,
+                        help="standard (reportlab defaults), compact (compressed, one font setup) "
+                             "or archive (compact + reproducible bytes + object streams)")
+    parser.add_argument('--chunk-pages', type=int, default=CHUNK_PAGES,
+                        help="Split the output: start a new file every N pages")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_MB,
+                        help="Split the output: keep each file under about N MB")
+    parser.add_argument('--chunk-by-payer', action='store_true', default=CHUNK_BY_PAYER,
+                        help="Split the output: start a new file (and page) when the payer TIN changes")
+    parser.add_argument('--pipeline', action='store_true', default=PIPELINED,
+                        help="Parse, draw and save on separate threads so slow input/output overlaps drawing")
+    parser.add_argument('--checkpoint-pages', type=int, default=CHECKPOINT_PAGES,
+                        help="Commit every N pages so an interrupted run resumes where it stopped "
+                             "(re-run with the same arguments)")
+    parser.add_argument('--proof-dpi', type=int, default=BACKGROUND_PROOF_DPI,
+                        help="Embed the dev background as a cached grayscale proof at this DPI "
+                             "(0 = the full-resolution image)")
+    parser.add_argument('--check', action='store_true',
+                        help="Validate the arguments, layout and row selection, then exit without rendering")
+    return parser, parser.parse_args(argv)
+
+def run_headless(argv=None):
+    """Fill the forms from command line arguments (never imports tkinter)"""
+    global USE_BACKGROUND_IMAGE, MASTER_FIELDS, LAYOUT_PLAN, BACKGROUND_PROOF_DPI
+    
+    parser, args = parse_args(argv)
+    
+    for path in filter(None, (args.csv, args.layout)):
+        if not os.path.exists(path):
+            parser.error(f"File not found: {path}")
+    csv_files = [args.csv]
+    if args.job:
+        csv_files = job_csv_files(args.job)
+        if not csv_files:
+            parser.error(f"--job: no CSV files found in {args.job}")
+        if (args.rows.strip().lower() != 'all' or args.incremental or args.checkpoint_pages or
+                args.chunk_pages or args.chunk_mb or args.chunk_by_payer):
+            parser.error("--job renders whole files in sorted order; --rows, --incremental, "
+                         "--checkpoint-pages and --chunk-* apply to --csv runs")
+    if not (args.output or args.check):
+        parser.error("the following arguments are required: --output")
+    if args.mode == 'dev' and not args.background:
+        parser.error("--mode dev needs --background")
+    if args.mode == 'stamped' and not args.template:
+        parser.error("--mode stamped needs --template")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if (args.chunk_pages is not None and args.chunk_pages < 1) or (args.chunk_mb is not None and args.chunk_mb <= 0):
+        parser.error("--chunk-pages and --chunk-mb must be positive")
+    if args.checkpoint_pages is not None and args.checkpoint_pages < 1:
+        parser.error("--checkpoint-pages must be at least 1")
+    if args.proof_dpi < 0:
+        parser.error("--proof-dpi must be 0 or more")
+    if args.compile_layout and args.layout.lower().endswith(COMPILED_LAYOUT_SUFFIX):
+        parser.error("--compile-layout needs a JSON or PDF --layout")
+    
+    row_indices = None
+    if args.rows.strip().lower() != 'all':
+        try:
+            row_indices = parse_row_spec(args.rows, count_csv_rows(args.csv))
+        except ValueError as e:
+            parser.error(f"--rows: {e}")
+    
+    USE_BACKGROUND_IMAGE = args.mode == 'dev'
+    BACKGROUND_PROOF_DPI = args.proof_dpi
+    MASTER_FIELDS, LAYOUT_PLAN = load_layout_plan(args.layout)
+    if args.compile_layout:
+        write_compiled_layout(args.compile_layout, LAYOUT_PLAN, MASTER_FIELDS)
+        print(f"✓ Compiled layout saved to: {args.compile_layout}")
+    
+    if args.check:
+        placed = sum(len(section_plan) for section_plan in LAYOUT_PLAN)
+        empty = [str(section_num + 1) for section_num, section_plan in enumerate(LAYOUT_PLAN)
+                 if not section_plan]
+        if not placed or empty:
+            print(f"✗ Layout error: no field positions in section(s) {', '.join(empty) or '-'} - "
+                  f"the layout's field names don't match the form ({args.layout})", file=sys.stderr)
+            return 1
+        rows = (len(row_indices) if row_indices is not None
+                else sum(count_csv_rows(csv_file) for csv_file in csv_files))
+        print(f"✓ Layout OK: {placed} field positions in {len(LAYOUT_PLAN)} sections")
+        if args.job:
+            print(f"✓ Job OK: {len(csv_files)} CSV file(s)")
+        print(f"✓ Rows OK: {rows} recipient(s) selected")
+        return 0
+    
+    # Input that only turns out bad while rendering (e.g. a page over --chunk-mb) ends the run with one line
+    try:
+        if args.job:
+            results = run_job(
+                csv_files, args.output, args.job_output,
+                background_image_path=args.background if args.mode == 'dev' else None,
+                workers=args.workers,
+                template_pdf=args.template if args.mode == 'stamped' else None,
+                profile_json=args.profile,
+                profile_cprofile=args.cprofile,
+                progress_mode=args.progress,
+                output_profile=args.output_profile,
+                pipelined=args.pipeline
+            )
+            return 0 if all(results) else 1
+        
+        result = fill_1099_nec_form(
+            args.csv, args.output,
+            background_image_path=args.background if args.mode == 'dev' else None,
+            row_indices=row_indices,
+            workers=args.workers,
+            template_pdf=args.template if args.mode == 'stamped' else None,
+            incremental=args.incremental,
+            profile_json=args.profile,
+            profile_cprofile=args.cprofile,
+            progress_mode=args.progress,
+            output_profile=args.output_profile,
+            chunk_pages=args.chunk_pages,
+            chunk_mb=args.chunk_mb,
+            chunk_by_payer=args.chunk_by_payer,
+            checkpoint_pages=args.checkpoint_pages,
+            pipelined=args.pipeline
+        )
+    except ValueError as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+    return 0 if result else 1